@@ -134,10 +134,11 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-__all__ = ['Test', 'AbstractTestCase', 'AbsractDataProvider', 'main', 'settings']
+__all__ = ['Test', 'AbstractTestCase', 'AbsractDataProvider', 'LazyDatasets', 'main', 'settings']
 
 from .main import main
 from .conf import settings
 from .core.test_wrapper import Test
 from .core.abstract_testcase import AbstractTestCase
 from .core.abstract_data_provider import AbsractDataProvider
+from .core.lazy_datasets import LazyDatasets
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+import io
+import os
+import gc
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import importlib
+import tracemalloc
+from unittest.runner import _WritelnDecorator
+
+from .conf import settings
+from .hook import wrapper
+from .hook import RunStage
+from .hook import RunPolicy
+from .core.depends import DependsManager
+from .core.seven_suite import SevenTestSuite
+from .core.seven_loader import SevenTestLoader
+from .core.seven_result import SevenTestResult
+from .core.result_formatter import TestResultFormatter
+from .report.htmltemplate import HtmlReportTemplate
+from .report.jenkins_junit_xml_template import JenkinsJunitXMLReportTemplate
+
+# 基准测试的各个阶段，按执行顺序排列
+STAGES = ('collect', 'depends', 'run', 'format', 'html', 'junit')
+
+MODULE_HEADER = '''from stest import AbstractTestCase, Test
+
+
+def _datasets(testclass, testmethod, *args, **kwargs):
+    return [[i] for i in range({params})]
+
+'''
+
+
+def generate_module(dirpath, name, tests, params=1, depends=0.0, methods_per_class=100, seed=0):
+    """生成包含指定个数空用例的测试模块文件，返回模块文件路径
+
+    Args:
+        dirpath: 模块文件存放目录
+        name: 模块名
+        tests: 用例总数（参数化用例按每组数据一个用例计算）
+        params: 每个测试方法的参数化数据个数，大于1时使用数据提供者
+        depends: 依赖密度（0-1），每个测试方法依赖同一测试类中前面某个测试方法的概率
+        methods_per_class: 每个测试类的测试方法个数
+        seed: 随机数种子，相同参数生成相同的模块
+    """
+
+    rng = random.Random(seed)
+    methods = max(1, -(-tests // params))
+    lines = [MODULE_HEADER.format(params=params)]
+    for start in range(0, methods, methods_per_class):
+        lines.append('\nclass BenchTest{}(AbstractTestCase):\n'.format(start // methods_per_class))
+        for index in range(min(methods_per_class, methods - start)):
+            options = ['priority={}'.format(index)]
+            if index > 0 and rng.random() < depends:
+                options.append("depends=['m_{}']".format(rng.randrange(index)))
+            if params > 1:
+                options.append('data_provider=_datasets')
+                signature = 'self, value'
+            else:
+                signature = 'self'
+            lines.append('\n    @Test({})\n    def m_{}({}):\n        pass\n'.format(', '.join(options), index, signature))
+    filepath = os.path.join(dirpath, name + '.py')
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(''.join(lines))
+    return filepath
+
+
+def register_hooks(count):
+    """注册count个空钩子，均匀分布在startTest、stopTest、addSuccess阶段的前后，用于测量钩子分派的开销"""
+
+    stages = (RunStage.startTest, RunStage.stopTest, RunStage.addSuccess)
+    policies = (RunPolicy.BEFORE, RunPolicy.AFTER)
+    for index in range(count):
+        stage = stages[index % len(stages)]
+        policy = policies[(index // len(stages)) % len(policies)]
+        wrapper(stage, runpolicy=policy, priority=index, name='bench_hook_{}'.format(index))(_noop_hook)
+
+
+def _noop_hook(conf, result, test):
+    pass
+
+
+class StageTimer(object):
+    """记录各阶段的耗时和内存峰值"""
+
+    def __init__(self, trace_memory=False):
+
+        self.trace_memory = trace_memory
+        self.stages = {}
+
+    def measure(self, stage, func, *args, **kwargs):
+
+        gc.collect()
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            peak = None
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            self.stages[stage] = dict(seconds=seconds, peak_bytes=peak)
+
+
+def run_benchmark(tests, params=1, depends=0.0, trace_memory=False, workdir=None, seed=0):
+    """生成指定规模的用例并依次执行各阶段，返回各阶段的耗时和内存峰值
+
+    Returns: 返回字典，tests - 用例数，stages - 阶段名称到 {seconds, peak_bytes} 的映射
+    """
+
+    workdir = tempfile.mkdtemp(prefix='stest_bench_', dir=workdir)
+    name = 'stest_bench_{}_{}'.format(tests, os.getpid())
+    try:
+        generate_module(workdir, name, tests, params=params, depends=depends, seed=seed)
+        sys.path.insert(0, workdir)
+        try:
+            module = importlib.import_module(name)
+        finally:
+            sys.path.remove(workdir)
+
+        timer = StageTimer(trace_memory)
+        loader = SevenTestLoader()
+        loader.args_namespace = argparse.Namespace(groups=None, settings_file=workdir)
+        suite = timer.measure('collect', loader.loadTestsFromModule, module)
+        testlist = [test for case_suite in suite for test in case_suite]
+
+        depend_manager = DependsManager()
+
+        def setup_depends():
+            depend_manager.tests = testlist
+            return depend_manager.sorted_tests(suiteclass=SevenTestSuite)
+
+        sorted_suite = timer.measure('depends', setup_depends)
+
+        result = SevenTestResult(_WritelnDecorator(io.StringIO()), False, 0)
+        result.depend_manager = depend_manager
+        depend_manager.results = result
+
+        def run():
+            result.startTestRun()
+            try:
+                sorted_suite(result)
+            finally:
+                result.stopTestRun()
+
+        timer.measure('run', run)
+        model = timer.measure('format', lambda: TestResultFormatter(result, settings).to_py_json())
+        testpoints = model['testpoints']
+        timer.measure('html', lambda: HtmlReportTemplate(testpoints, settings=settings, title=name).save_as_file(
+            os.path.join(workdir, name + '.html')))
+        timer.measure('junit', lambda: JenkinsJunitXMLReportTemplate(testpoints).save_as_file(
+            os.path.join(workdir, name + '.xml')))
+        if not result.wasSuccessful():
+            raise RuntimeError('benchmark tests failed: {}'.format((result.failures + result.errors)[:1]))
+        sys.modules.pop(name, None)
+        return dict(tests=result.testsRun, stages=timer.stages)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def format_table(results):
+    """把基准测试结果格式化为文本表格"""
+
+    lines = ['{:>8}  {:<8}  {:>10}  {:>10}  {:>12}'.format('tests', 'stage', 'seconds', 'us/test', 'peak(KiB)')]
+    for one in results:
+        total = 0.0
+        for stage in STAGES:
+            info = one['stages'][stage]
+            total += info['seconds']
+            peak = '-' if info['peak_bytes'] is None else '{:.1f}'.format(info['peak_bytes'] / 1024)
+            lines.append('{:>8}  {:<8}  {:>10.4f}  {:>10.2f}  {:>12}'.format(
+                one['tests'], stage, info['seconds'], info['seconds'] / one['tests'] * 1e6, peak))
+        lines.append('{:>8}  {:<8}  {:>10.4f}  {:>10.2f}  {:>12}'.format(
+            one['tests'], 'total', total, total / one['tests'] * 1e6, ''))
+    return '\n'.join(lines)
+
+
+def parse_args(argv=None):
+
+    parser = argparse.ArgumentParser(
+        prog='python -m stest.bench',
+        description="measure the overhead stest adds per test: collection, dependency setup, "
+                    "hook dispatch and result bookkeeping while running, result formatting and report building")
+    parser.add_argument('-sizes', '--sizes', dest='sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="numbers of synthetic trivial tests to benchmark, default 1000 10000 100000")
+    parser.add_argument('-params', '--params', dest='params', type=int, default=1,
+                        help="parametrized datasets per test method, default 1 (no data provider)")
+    parser.add_argument('-depends', '--depends', dest='depends', type=float, default=0.0,
+                        help="dependency density 0-1, the probability that a test method depends on an earlier one in its class")
+    parser.add_argument('-hooks', '--hooks', dest='hooks', type=int, default=0,
+                        help="number of no-op hooks registered on startTest/stopTest/addSuccess")
+    parser.add_argument('-memory', '--memory', dest='memory', action='store_true',
+                        help="trace peak memory of each stage with tracemalloc (slows every stage down)")
+    parser.add_argument('-json', '--json', dest='json', help="also write the results to this json file")
+    parser.add_argument('-seed', '--seed', dest='seed', type=int, default=0, help="random seed of the generated suites")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+
+    args = parse_args(argv)
+    register_hooks(args.hooks)
+    print('stest overhead benchmark: params={} depends={} hooks={} memory={}'.format(
+        args.params, args.depends, args.hooks, args.memory))
+    results = []
+    for size in args.sizes:
+        one = run_benchmark(size, params=args.params, depends=args.depends, trace_memory=args.memory, seed=args.seed)
+        results.append(one)
+        print(format_table([one]))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(dict(options=vars(args), results=results), f, ensure_ascii=False, indent=2)
+    return results
+
+
+if __name__ == '__main__':
+    main()
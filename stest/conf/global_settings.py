@@ -10,11 +10,66 @@
 # 内置参数化数据提供者会从该目录路径查找用例测试数据文件。
 SEVEN_DATA_PROVIDER_DATA_FILE_DIR = None
 
+# 内置参数化数据提供者(SevenDataProvider)是否使用编译缓存，启用后解析过的数据文件会以二进制(pickle)形式缓存，
+# 数据文件未修改时直接读取缓存，不再解析excel文件。缓存文件会被直接反序列化加载，只应存放在可信的目录中，
+# 使用默认的 __stestcache__ 目录时需把它加入 .gitignore
+SEVEN_DATA_PROVIDER_DATA_CACHE = False
+
+# 编译缓存文件存放目录，不设置则存放在数据文件所在目录下的 __stestcache__ 目录
+SEVEN_DATA_PROVIDER_DATA_CACHE_DIR = None
+
 # 控制测试失败是否自动截图
 SCREENSHOT = False
 
-# 截图文件存放目录，保存为文件时才会用到
-# SCREENSHOT_SAVE_DIR = None
+# 截图文件存放目录，保存为文件时才会用到，不设置则使用系统临时目录下的 stest_screenshots 目录
+SCREENSHOT_SAVE_DIR = None
 
 # 控制截图后是否附加到测试报告中，如果附加到报告中，则截图转base64数据附加到报告中，否则保存为文件
 ATTACH_SCREENSHOT_TO_REPORT = True
+
+# 测试失败自动截图是否异步处理，启用后截图的编码和保存在后台线程中进行，不阻塞用例的执行，测试运行结束时等待全部处理完成
+SCREENSHOT_ASYNC = True
+
+# 截图格式，可选 png、jpeg、webp，不设置则使用原始png截图不重新编码，设置为png会启用压缩优化。重新编码需要安装Pillow
+SCREENSHOT_FORMAT = None
+
+# jpeg和webp格式截图的图片质量（1-100）
+SCREENSHOT_QUALITY = 80
+
+# 截图缩略图的最大宽高 (宽, 高)，例如 (480, 270)，按比例缩放，设置后报告中显示缩略图，点击后加载原图，不设置则不生成缩略图。需要安装Pillow
+SCREENSHOT_THUMBNAIL_SIZE = None
+
+# 附加到报告中的截图是否以独立文件的形式保存，而不是以base64数据内嵌到报告中。启用后截图按内容摘要命名保存到截图文件存放目录，
+# 内容相同的截图只保存一份，生成html报告时复制到报告同目录下的 <报告名>_assets 目录，报告中延迟加载
+SCREENSHOT_REPORT_ASSETS = False
+
+# 驱动管理器是否使用线程本地驱动缓存，开启后每个线程有各自独立的当前驱动和别名映射，多个线程可以通过同一个驱动管理器同时操作各自的浏览器
+DRIVER_CACHE_THREAD_LOCAL = False
+
+# Playwright是否使用浏览器上下文池，开启后同一类型和启动参数的浏览器在整个测试运行期间只启动一次，
+# 每个驱动（页面）在共用的浏览器中创建全新的上下文，测试运行结束时统一关闭浏览器
+PLAYWRIGHT_CONTEXT_POOL = False
+
+# 浏览器上下文池保存登录状态快照（storage_state）的目录，不设置则使用系统临时目录下的 stest_storage_states 目录
+PLAYWRIGHT_STORAGE_STATE_DIR = None
+
+# 浏览器会话池每种浏览器预先启动的会话个数，0 表示不开启。开启后驱动管理器打开浏览器时从池中取出会话，
+# 关闭驱动时清理会话（cookie、本地存储、多余的窗口）并放回池中，而不是退出浏览器，池中的会话在程序退出时统一退出
+BROWSER_POOL_SIZE = 0
+
+# 性能分析（命令行参数 --profile）时，测试报告中热点汇总显示的条数
+PROFILE_TOP_N = 20
+
+# 是否记录用例耗时历史。启用后每次执行的用例耗时保存到SQLite数据库（默认为报告目录下的 stest_durations.sqlite3），
+# html报告中显示最慢用例及其历史耗时趋势。不启用时，命令行参数 --longest-first 也会在本次执行中启用，
+# 并行执行时按历史耗时从长到短调度用例
+DURATION_HISTORY = False
+
+# 用例耗时历史数据库文件路径，未设置则使用报告目录下的 stest_durations.sqlite3
+DURATION_HISTORY_FILE = None
+
+# 每个用例保留的最近耗时记录条数
+DURATION_HISTORY_KEEP = 20
+
+# html报告中最慢用例汇总显示的条数
+SLOWEST_TESTS_TOP_N = 10
@@ -4,7 +4,10 @@
 @Author: 思文伟
 @Date: 2025/06/3028 15:18:00
 '''
+import base64
 from . import settings
+from ..utils.screenshot_store import ScreenshotAssetStore
+from ..utils.screenshot_encoder import ScreenshotEncoder
 
 
 def show2html(master, *, base64data="", filepath="", name="", **other_info):
@@ -23,10 +26,17 @@ def show2html(master, *, base64data="", filepath="", name="", **other_info):
         base64data = ""
     elif base64data == "" and filepath == "":
         return False
+    screenshot = dict(base64data=base64data, filepath=filepath, asset="", name=name, other_info=other_info)
+    if base64data:
+        encoder = ScreenshotEncoder.from_settings(settings)
+        as_asset = ScreenshotAssetStore.is_enabled(settings)
+        if encoder.need_pillow or as_asset:
+            # 按配置重新编码并生成缩略图，截图保存为文件时内存中只保留资源名称
+            store = ScreenshotAssetStore.from_settings(settings) if as_asset else None
+            screenshot.update(encoder.to_report_info(base64.b64decode(base64data), store))
     user_screenshots = getattr(settings, "USER_SCREENSHOTS", {})
     screenshots = user_screenshots.get(master, [])
-    screenshots.append(
-        dict(base64data=base64data, filepath=filepath, name=name, other_info=other_info))
+    screenshots.append(screenshot)
     user_screenshots[master] = screenshots
     settings.USER_SCREENSHOTS = user_screenshots
     return True
@@ -12,6 +12,9 @@ class AbsractDataProvider(AttributeManager):
         super(AbsractDataProvider, self).__init__()
 
     def get_testdatas(self, test_class_name, test_method_name, *args, **kwargs):
-        """当测试方法只有一个参数化时，应返回一维列表，多个参数化时返回二维列表"""
+        """当测试方法只有一个参数化时，应返回一维列表，多个参数化时返回二维列表
+
+        数据量很大时也可以返回迭代器、生成器或者LazyDatasets，测试数据在用例执行时才逐条读取，此时必须提供长度提示，否则搜集用例时会读取全部数据
+        """
 
         raise NotImplementedError
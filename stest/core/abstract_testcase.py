@@ -14,6 +14,10 @@ from ..conf import SettingsFileFinder
 from ..conf import image_show
 from ..utils.sutils import strclass
 from .test_wrapper import Test
+from .phase_timing import TestPhase
+from .phase_timing import phase_timer
+from .phase_timing import record_phase
+from . import phase_calls
 
 
 class AbstractTestCase(unittest.TestCase):
@@ -89,61 +93,57 @@ class AbstractTestCase(unittest.TestCase):
         return "<%s testMethod=%s>" % \
                (strclass(self.__class__), self._test_method_name)
 
+    # 计时和异步方法的执行放在标记为unittest内部的模块中，用例失败的堆栈中不显示这些栈帧
+    _callSetUp = phase_calls.call_set_up
+    _callTestMethod = phase_calls.call_test_method
+    _callTearDown = phase_calls.call_tear_down
+
     def run(self, result=None):
 
         if result is not None:
             dm = getattr(result, 'depend_manager', None)
             # 如果有设置依赖管理器，则运行依赖管理器
             if dm is not None:
-
-                addFailure = getattr(result, 'mark_test_failure', None)
-
-                # 检查是否有无法解析的依赖
-                missing = dm.get_missing(self)
-                miss_msg = '{} depends on {}, which was not found'.format(
-                    self.id(), ", ".join(missing))
-                if missing:
+                with phase_timer(self, TestPhase.DEPENDS_CHECK):
+                    depends_error = self._check_depends(dm)
+                if depends_error:
+                    addFailure = getattr(result, 'mark_test_failure', None)
                     try:
-                        raise self.failureException(miss_msg)
+                        raise self.failureException(depends_error)
                     except self.failureException:
                         exc_info = sys.exc_info()
                         if addFailure:
                             addFailure(self, exc_info)
                     return result
+        return super().run(result=result)
 
-                # 检查是否存在循环依赖
-                clinks = dm.get_cyclic_links(self)
-                printables = []
-                for clink in clinks:
-                    printable = '------>'.join(clink)
-                    printables.append(printable)
-                if clinks:
-                    try:
-                        raise self.failureException(
-                            '{} circular dependency: {}'.format(self.id(), ", ".join(printables)))
-                    except self.failureException:
-                        exc_info = sys.exc_info()
-                        if addFailure:
-                            addFailure(self, exc_info)
-                    return result
+    def _check_depends(self, dm):
+        """检查用例的依赖，依赖不满足时返回失败信息，满足则返回None
+
+        Args:
+            dm: 依赖管理器
+        """
 
-                # alway_run 为True，则不管该用例所依赖的其他用例是否成功都会执行该用例
-                alway_run = self.test_method_settings.get(Test.ALWAY_RUN, False)
-                if alway_run:
-                    return super().run(result=result)
+        # 检查是否有无法解析的依赖
+        missing = dm.get_missing(self)
+        if missing:
+            return '{} depends on {}, which was not found'.format(self.id(), ", ".join(missing))
 
-                # 检查用例所依赖的其他测试用例是否测试通过，如果不通过则不执行该用例并标记结果为失败
-                tresult, msglist = dm.dependent_test_is_pass(self)
-                if not tresult:
-                    try:
-                        raise self.failureException(
-                            '{} depends on: {}'.format(self.id(), '\n'.join(msglist)))
-                    except self.failureException:
-                        exc_info = sys.exc_info()
-                        if addFailure:
-                            addFailure(self, exc_info)
-                    return result
-        return super().run(result=result)
+        # 检查是否存在循环依赖
+        clinks = dm.get_cyclic_links(self)
+        if clinks:
+            printables = ['------>'.join(clink) for clink in clinks]
+            return '{} circular dependency: {}'.format(self.id(), ", ".join(printables))
+
+        # alway_run 为True，则不管该用例所依赖的其他用例是否成功都会执行该用例
+        if self.test_method_settings.get(Test.ALWAY_RUN, False):
+            return None
+
+        # 检查用例所依赖的其他测试用例是否测试通过，如果不通过则不执行该用例并标记结果为失败
+        tresult, msglist = dm.dependent_test_is_pass(self)
+        if not tresult:
+            return '{} depends on: {}'.format(self.id(), '\n'.join(msglist))
+        return None
 
     def show2html(self, *, base64data="", filepath="", name="", **other_info):
         """显示截图到html测试报告中
@@ -219,16 +219,19 @@ class AbstractTestCase(unittest.TestCase):
                     print(tips)
 
             # 6. 逻辑优化：提取数据集获取逻辑，简化条件判断
+            start = time.perf_counter()
             test_func.collect_test_datasets(cls, test_func)
+            collect_seconds = time.perf_counter() - start
             datasets = test_func.test_settings.get(Test.TEST_DATASETS, [])
 
             if datasets:
                 # 7. 性能优化：使用列表推导式替代循环中的 append
-                testcases.extend(
-                    cls(test_func.__name__, i + 1) for i in range(len(datasets))
-                )
+                method_testcases = [cls(test_func.__name__, i + 1) for i in range(len(datasets))]
             else:
-                testcases.append(cls(test_func.__name__))
+                method_testcases = [cls(test_func.__name__)]
+            # 同一测试方法的参数化用例共用一次参数化数据收集，耗时只记录在第一个用例上，避免报告中重复累计
+            record_phase(method_testcases[0], TestPhase.DATA_PROVIDER, collect_seconds)
+            testcases.extend(method_testcases)
 
         return testcases
 
@@ -4,8 +4,10 @@
 @Author: 思文伟
 @Date: 2021/09/23
 '''
+import heapq
 import inspect
 import collections
+import collections.abc
 from ..utils.attrs_manager import AttributeManager
 from ..utils.attrs_marker import Const
 
@@ -197,28 +199,43 @@ class TestResultFinder(AttributeManager):
     FAIL_CODE = Const(2, "失败", alias="失败")
     ERROR_CODE = Const(3, "异常", alias="异常")
 
+    # 结果对象中的结果列表名称与结果代码的对应关系，按查找优先顺序排列
+    OUTCOME_KIND_CODES = (
+        ('successes', PASS_CODE.value),
+        ('expectedFailures', PASS_CODE.value),
+        ('failures', FAIL_CODE.value),
+        ('unexpectedSuccesses', FAIL_CODE.value),
+        ('errors', ERROR_CODE.value),
+    )
+
     @classmethod
     def find_test_result(cls, test, results):
 
-        # find pass test case
-        for ptest, message in results.successes:
-            if test.id() == ptest.id():
-                return (cls.PASS_CODE, cls.get_result_name(cls.PASS_CODE), message)
-        for ptest, message in results.expectedFailures:
-            if test.id() == ptest.id():
-                return (cls.PASS_CODE, cls.get_result_name(cls.PASS_CODE), message)
-
-        # find fail test case
-        for ftest, message in results.failures:
-            if test.id() == ftest.id():
-                return (cls.FAIL_CODE, cls.get_result_name(cls.FAIL_CODE), message)
-        for ftest in results.unexpectedSuccesses:
-            if test.id() == ftest.id():
-                return (cls.FAIL_CODE, cls.get_result_name(cls.FAIL_CODE), '')
-
-        for etest, message in results.errors:
-            if test.id() == etest.id():
-                return (cls.ERROR_CODE, cls.get_result_name(cls.ERROR_CODE), message)
+        return cls.find_test_result_by_id(test.id(), results)
+
+    @classmethod
+    def find_test_result_by_id(cls, testid, results):
+        """按用例id查找用例结果，结果对象有结果索引（outcome_index）时直接查索引，否则遍历结果对象中的各结果列表
+
+        Returns: (结果代码, 结果名称, 结果信息)
+        """
+
+        index = getattr(results, 'outcome_index', None)
+        if index is not None:
+            found = index.get(testid, {})
+            for kind, code in cls.OUTCOME_KIND_CODES:
+                if kind in found:
+                    return (code, cls.get_result_name(code), found[kind])
+            return (cls.UNRUN_CODE, cls.get_result_name(cls.UNRUN_CODE), '')
+
+        for kind, code in cls.OUTCOME_KIND_CODES:
+            for entry in getattr(results, kind):
+                if isinstance(entry, tuple):
+                    test, message = entry
+                else:
+                    test, message = entry, ''
+                if testid == test.id():
+                    return (code, cls.get_result_name(code), message)
         return (cls.UNRUN_CODE, cls.get_result_name(cls.UNRUN_CODE), '')
 
     @classmethod
@@ -275,13 +292,20 @@ class TestDepends(object):
 
 
 class DependsManager(object):
-    def __init__(self):
+    def __init__(self, max_links=None):
+        """
+        Parameters
+        ----------
+            max_links : 每个用例最多生成的完整依赖链数量（see :py:attr:`links`），None表示不限制
+        """
 
+        self.max_links = max_links
         self._tests = None
         self._results = None
         self._name_to_testids = None
         self._testid_to_test = None
         self._testid_to_test_wrapper = None
+        self._graph = None
         self._weights = {}
         self._links = {}
         self._cyclic_links = {}
@@ -325,288 +349,19 @@ class DependsManager(object):
                 tdset.add(td)
                 self._newid_to_test_depends[tc.new_id] = tdset
 
+        # 整个测试套件的依赖图只构建一次，权重、拓扑顺序和循环依赖都由它得出
+        nodes = []
+        successors = {}
         for tc in tc_wrappers:
-            weight, links, cyclic_links, cycle_chain_list = self.calc_weight_and_link_perf(tc.id())
-            self._weights[tc.id()] = weight
-            self._links[tc.id()] = links
-            self._cyclic_links[tc.id()] = cycle_chain_list
-
-    def calc_weight_and_link(self, testcase_id):
-        """
-        计算用例的依赖权重、完整依赖链和循环依赖链。
-
-        Parameters
-        ----------
-            testcase_id : 用例对象id。
-
-        Returns
-        -------
-            - weight (int) : 主用例的权重（直接和间接依赖的用例总数，去重）。
-            - all_chains (list of list) : 所有完整依赖链的列表，每条链是从主用例到叶子节点的节点序列。
-            - cycle_chains (list of list) : 所有循环依赖链的列表，每条循环链表示检测到的循环路径。
-            - cycle_chain_list (list of list) : 所有循环依赖链的列表，每条循环链表示从主用例开始到出现循环依赖结束的链路。
-
-        Usage
-        -----
-            ```python
-            def demo4():
-                \"""示例3：多依赖与循环
-
-                a->
-                |->b->d->a
-                |->c->e->f->g->e
-                \"""
-                # 构造用例
-                a = TestCase('A')
-                b = TestCase('B')
-                c = TestCase('C')
-                d = TestCase('D')
-                e = TestCase('E')
-                f = TestCase('F')
-                g = TestCase('G')
-                a.depends = {b, c}
-                b.depends = {d}
-                c.depends = {e}
-                d.depends = {a}
-                e.depends = {f}
-                f.depends = {g}
-                g.depends = {e}
-
-                # 计算依赖
-                weight, all_chains, cycle_chains,cycle_chain_list = calc_weight_and_link(a)
-                print("权重:", weight)
-                print("完整依赖链:", all_chains)
-                for cycle_chain in cycle_chains:
-                    print("循环依赖链:", "->".join([one.name for one in cycle_chain]))
-
-                for cycle_chain in cycle_chain_list:
-                    print("从主用例开始到出现循环依赖的链路:", "->".join([one.name for one in cycle_chain]))
-            demo4()
-            >>> 权重: 6
-            >>> 完整依赖链: []
-            >>> 循环依赖链: A->B->D->A
-            >>> 循环依赖链: E->F->G->E
-            >>> 从主用例开始到出现循环依赖的链路: A->B->D->A
-            >>> 从主用例开始到出现循环依赖的链路: A->C->E->F->G->E
-            ```
-        """
-        count = 0
-        dependency_nodes = set()  # 存储所有依赖节点（直接和间接，去重）
-        all_chains = []			 # 存储完整依赖链（非循环路径）
-        cycle_chains = []		 # 存储循环依赖链 （只存储循环部分）
-        seen_cycle_sets = set()	 # 用于去重循环链的集合（存储节点集合的冻结集）
-        cycle_chain_list = []    # 存储从主用例开始到出现循环依赖结束的链路
-        main_case: TestDepends = self.depends.get(testcase_id, None)
-
-        def dfs(node, path):
-            """深度优先搜索遍历依赖图，记录路径并检测循环。"""
-            nonlocal count
-            count += len(node.unresolved)
-            # 遍历当前节点的所有依赖
-            for newid in node.depends_without_serial_number:
-                dep_set = self.newid_to_test_depends.get(newid, set())
-                dep = list(dep_set)[0]
-                if dep.newid in path:
-                    # 发现循环：当前依赖已在路径中出现
-                    idx = path.index(dep.newid)
-                    cycle_chain_list.append(path + [dep.newid])
-                    cycle_chain = path[idx:] + [dep.newid]  # 构建循环链：从首次出现位置到当前节点，再加当前依赖
-                    cycle_set = frozenset(cycle_chain)  # 使用节点集合标识循环
-                    if cycle_set not in seen_cycle_sets:
-                        seen_cycle_sets.add(cycle_set)
-                        cycle_chains.append(cycle_chain)
-                    continue  # 跳过循环依赖，避免无限递归
-
-                # 非循环依赖：将依赖节点加入集合，继续递归
-                dependency_nodes.add(dep.newid)
-                new_path = path + [dep.newid]	 # 扩展路径
-                ntc = self.newid_to_test_depends.get(dep.newid, set())
-                if ntc:
-                    dfs(list(ntc)[0], new_path)		 # 递归处理依赖
-
-            # 当前节点无依赖时，记录完整依赖链（叶子节点）
-            if not node.depends:
-                all_chains.append(path)
-        if main_case is not None:
-            count += len(main_case.unresolved)
-            # 从主用例开始处理
-            start_path = [main_case.newid]
-            if not main_case.depends_without_serial_number:
-                # 主用例无依赖：自身即为完整链
-                all_chains.append(start_path)
-            else:
-                for newid in main_case.depends_without_serial_number:
-                    if newid in start_path:
-                        # 主用例直接依赖自身（循环）
-                        idx = start_path.index(newid)
-                        cycle_chain_list.append(start_path + [newid])
-                        cycle_chain = start_path[idx:] + [newid]
-                        cycle_set = frozenset(cycle_chain)
-                        if cycle_set not in seen_cycle_sets:
-                            seen_cycle_sets.add(cycle_set)
-                            cycle_chains.append(cycle_chain)
-                        continue
-
-                    # 处理非循环依赖
-                    dependency_nodes.add(newid)
-                    new_path = start_path + [newid]
-                    tc = self.newid_to_test_depends.get(newid, set())
-                    if tc:
-                        dfs(list(tc)[0], new_path)
-
-        weight = len(dependency_nodes)  # 权重为依赖节点总数（去重）
-        return weight, all_chains, cycle_chains, cycle_chain_list
-
-    def calc_weight_and_link_perf(self, testcase_id):
-        """
-        高性能版本：计算用例的依赖权重、完整依赖链和循环依赖链
-
-        优化点：
-        1. 使用迭代DFS替代递归DFS，避免栈溢出
-        2. 使用路径集合快速检测循环依赖 (O(1)查找)
-        3. 节点状态跟踪避免重复计算
-        4. 环检测使用节点集合去重
-
-        Parameters
-        ----------
-            testcase_id : 用例对象id。
-
-        Returns
-        -------
-        - weight (int) : 主用例的权重（直接和间接依赖的用例总数，去重）。
-        - all_chains (list of list) : 截止到发行循环链时当前所获取到的完整依赖链的列表，每条链是从主用例到叶子节点的节点序列。
-        - cycle_chains (list of list) : 截止到发行循环链时当前所获取到的循环依赖链的列表，每条循环链表示检测到的循环路径。
-        - cycle_chain_list (list of list) : 截止到发行循环链时当前所获取到的循环依赖链的列表，每条循环链表示从主用例开始到出现循环依赖结束的链路。
-
-        Usage
-        -----
-            ```python
-            def demo4():
-                \"""示例3：多依赖与循环
-
-                a->
-                |->b->d->a
-                |->c->e->f->g->e
-                \"""
-                # 构造用例
-                a = TestCase('A')
-                b = TestCase('B')
-                c = TestCase('C')
-                d = TestCase('D')
-                e = TestCase('E')
-                f = TestCase('F')
-                g = TestCase('G')
-                a.depends = {b, c}
-                b.depends = {d}
-                c.depends = {e}
-                d.depends = {a}
-                e.depends = {f}
-                f.depends = {g}
-                g.depends = {e}
-
-                # 计算依赖
-                weight, all_chains, cycle_chains,cycle_chain_list = calc_weight_and_link(a)
-                print("权重:", weight)
-                print("完整依赖链:", all_chains)
-                for cycle_chain in cycle_chains:
-                    print("循环依赖链:", "->".join([one.name for one in cycle_chain]))
-
-                for cycle_chain in cycle_chain_list:
-                    print("从主用例开始到出现循环依赖的链路:", "->".join([one.name for one in cycle_chain]))
-            demo4()
-            >>> 权重: 6
-            >>> 完整依赖链: []
-            >>> 循环依赖链: A->B->D->A
-            >>> 循环依赖链: E->F->G->E
-            >>> 从主用例开始到出现循环依赖的链路: A->B->D->A
-            >>> 从主用例开始到出现循环依赖的链路: A->C->E->F->G->E
-            ```
-        """
-        # 初始化数据结构
-        visited_global = set()       # 全局访问节点（用于权重计算）
-        all_chains = []             # 完整依赖链
-        cycle_chains = []           # 循环依赖链
-        seen_cycles = set()         # 环标识集合（用于去重）
-        stack = []                  # DFS栈: (当前节点, 路径列表, 路径集合)
-        cycle_chain_list = []    # 存储从主用例开始到出现循环依赖结束的链路
-        # 主用例对象，每个用例对象应具有属性'depends'，该属性是一个集合，包含其直接依赖的用例用例id。
-        main_case: TestDepends = self.depends.get(testcase_id, None)
-        # 主用例特殊处理
-        if not main_case.depends_without_serial_number:
-            # 无依赖：自身即为完整链
-            all_chains.append([main_case.newid])
-            return 0, all_chains, cycle_chains, cycle_chain_list
-
-        # 初始化栈：主用例的直接依赖
-        for newid in main_case.depends_without_serial_number:
-            dep_set: set = self.newid_to_test_depends.get(newid, set())
-            dep: TestDepends = list(dep_set)[0]
-            # 处理自循环 (主用例依赖自身)
-            if dep.newid is main_case.newid:
-                cycle = (main_case.newid,)
-                if cycle not in seen_cycles:
-                    seen_cycles.add(cycle)
-                    cycle_chains.append([main_case.newid, main_case.newid])
-                    cycle_chain_list.append([main_case.newid, main_case.newid])
-                continue
-
-            # 初始化路径
-            path = [main_case.newid, dep.newid]
-            path_set = {main_case.newid, dep.newid}
-
-            # 添加到全局节点
-            if dep.newid not in visited_global:
-                visited_global.add(dep.newid)
-
-            # 入栈处理
-            stack.append((dep.newid, path, path_set))
-
-        # 迭代DFS处理
-        while stack:
-            current_id, path, path_set = stack.pop()
-            current_set: set = self.newid_to_test_depends.get(current_id, set())
-            current: TestDepends = list(current_set)[0]
-            has_dependencies = False
-
-            # 处理当前节点的依赖
-            for dep_id in current.depends_without_serial_number:
-                dep_set: set = self.newid_to_test_depends.get(dep_id, set())
-                dep: TestDepends = list(dep_set)[0]
-                # 检测循环依赖
-                if dep.newid in path_set:
-                    # 获取环路径 (从首次出现位置开始)
-                    idx = path.index(dep.newid)
-                    cycle_path = tuple(path[idx:])  # 使用元组作为环标识
-                    cycle_chain_list.append(path + [dep.newid])
-                    # 环去重处理
-                    if cycle_path not in seen_cycles:
-                        seen_cycles.add(cycle_path)
-                        # 构建完整环链 (首尾闭合)
-                        cycle_chain = path[idx:] + [dep.newid]
-                        cycle_chains.append(cycle_chain)
-                    continue
-
-                # 标记有依赖关系
-                has_dependencies = True
-
-                # 更新全局节点
-                if dep.newid not in visited_global:
-                    visited_global.add(dep.newid)
-
-                # 创建新路径
-                new_path = path + [dep.newid]
-                new_path_set = path_set | {dep.newid}  # 创建新集合避免修改原集合
-
-                # 压栈继续处理
-                stack.append((dep.newid, new_path, new_path_set))
-
-            # 记录完整依赖链 (叶子节点)
-            if not has_dependencies:
-                all_chains.append(path)
-
-        # 计算权重 (全局节点数)
-        weight = len(visited_global)
-        return weight, all_chains, cycle_chains, cycle_chain_list
+            if tc.new_id not in successors:
+                nodes.append(tc.new_id)
+                successors[tc.new_id] = set()
+            successors[tc.new_id].update(self._depends[tc.id()].depends_without_serial_number)
+        self._graph = DependsGraph(nodes, successors)
+        testids = [tc.id() for tc in tc_wrappers]
+        self._weights = {tc.id(): self._graph.weight(tc.new_id) for tc in tc_wrappers}
+        self._links = LazyMapping(testids, lambda testid: self.get_links(self._testid_to_test[testid]))
+        self._cyclic_links = LazyMapping(testids, lambda testid: self._graph.cyclic_links(self._depends[testid].newid))
 
     @property
     def name_to_testids(self):
@@ -629,13 +384,8 @@ class DependsManager(object):
     def sorted_tests(self, suiteclass=None):
         """ Get a sorted list of tests where all tests are sorted after their dependencies. """
 
-        ztests = [test for test in self.tests if self.weights[test.id()] == 0]
-        dtests = [test for test in self.tests if self.weights[test.id()] > 0]
-        dtests.sort(key=lambda test: self.weights[test.id()])
-
-        tests = []
-        tests.extend(ztests)
-        tests.extend(dtests)
+        # 按依赖图的拓扑顺序排序，同一节点（参数化用例）的多个用例保持原有顺序
+        tests = sorted(self.tests, key=lambda test: self.graph.rank(self.depends[test.id()].newid))
         if suiteclass is not None:
             tests = suiteclass(tests)
         return tests
@@ -691,13 +441,26 @@ class DependsManager(object):
         assert self.tests is not None
         return self._weights
 
+    @property
+    def graph(self):
+        """ the depend graph of the tests, see :py:class:`DependsGraph`"""
+
+        assert self.tests is not None
+        return self._graph
+
     @property
     def links(self):
-        """ the depend chains of the tests"""
+        """ the depend chains of the tests, computed lazily on first access of each test and capped by max_links"""
 
         assert self.tests is not None
         return self._links
 
+    def get_links(self, test, limit=None):
+        """ 获取用例的完整依赖链列表，limit省略则使用max_links，see :py:meth:`DependsGraph.links`"""
+
+        limit = self.max_links if limit is None else limit
+        return self.graph.links(self.depends[test.id()].newid, limit)
+
     @property
     def depends(self):
         """ The dependencies of the tests. """
@@ -715,6 +478,37 @@ class DependsManager(object):
 
         return self.depends[test.id()].unresolved
 
+    def view(self, tests, results=None):
+        """返回指定用例的依赖信息快照（DependsView），所依赖的不在tests中的用例的结果从results中查找
+
+        Parameters
+        ----------
+            tests : 用例列表
+            results : 测试结果，省略则使用self.results
+        """
+
+        results = results or self.results
+        finder = TestResultFinder()
+        testids = set(test.id() for test in tests)
+        missing = {}
+        cyclic_links = {}
+        depends = {}
+        outcomes = {}
+        for test in tests:
+            testid = test.id()
+            missing[testid] = set(self.get_missing(test))
+            cyclic_links[testid] = [list(link) for link in self.get_cyclic_links(test)]
+            depends[testid] = sorted(self.depends[testid].depends)
+            for dtestid in depends[testid]:
+                if dtestid not in testids and dtestid not in outcomes:
+                    outcomes[dtestid] = finder.find_test_result_by_id(dtestid, results)
+        return DependsView(missing, cyclic_links, depends, outcomes)
+
+    def scheduler(self, tests=None, group_key=None, weight=None):
+        """返回用例依赖调度器，see :py:class:`DependsScheduler`"""
+
+        return DependsScheduler(self, tests=tests, group_key=group_key, weight=weight)
+
     @property
     def cyclic_links(self):
 
@@ -724,3 +518,503 @@ class DependsManager(object):
     def get_cyclic_links(self, test):
 
         return self.cyclic_links[test.id()]
+
+
+def strongly_connected_components(nodes, successors):
+    """使用Tarjan算法（迭代实现）计算有向图的强连通分量
+
+    Parameters
+    ----------
+        nodes : 图中所有节点，可迭代对象
+        successors : 节点到其后继节点集合的映射（或以节点编号为下标的序列），需包含所有节点，如果边表示“依赖于”，则后继节点就是被依赖的节点
+
+    Returns
+    -------
+        强连通分量列表，每个分量是一个节点列表。每个分量都排在其所能到达的分量之后，即被依赖的分量排在前面
+    """
+
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors[root]))]
+        while work:
+            node, children = work[-1]
+            descended = False
+            for child in children:
+                if child not in index:
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors[child])))
+                    descended = True
+                    break
+                elif child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            if descended:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+class LazyMapping(collections.abc.Mapping):
+    """只读映射，键在创建时确定，值在首次访问时才通过factory计算并缓存"""
+
+    def __init__(self, keys, factory):
+        """
+        Parameters
+        ----------
+            keys : 映射的所有键
+            factory : 计算值的函数，接收键返回对应的值
+        """
+
+        self._keys = list(keys)
+        self._keyset = set(self._keys)
+        self._factory = factory
+        self._cache = {}
+
+    def __getitem__(self, key):
+
+        if key not in self._cache:
+            if key not in self._keyset:
+                raise KeyError(key)
+            self._cache[key] = self._factory(key)
+        return self._cache[key]
+
+    def __iter__(self):
+
+        return iter(self._keys)
+
+    def __len__(self):
+
+        return len(self._keys)
+
+
+class DependsGraph(object):
+    """用例依赖图
+
+    以去掉序列号的用例id(newid)为节点，“依赖于”为边，通过一次Tarjan强连通分量计算和一次分量拓扑排序，
+    在线性时间内得到整个测试套件的：拓扑顺序、每个节点的权重（直接和间接依赖的节点总数，去重）、
+    每个节点是否存在（或依赖了存在）循环依赖。依赖链和循环依赖链只在需要时为单个节点生成。
+
+    图内部使用紧凑的邻接表存储：节点按位置编号为整数，每个节点的后继是一个整数元组，
+    节点能到达的节点集合以整数位图表示。
+
+    Usage
+    -----
+        ```python
+        # a->b->c->b
+        graph = DependsGraph(['a', 'b', 'c'], {'a': {'b'}, 'b': {'c'}, 'c': {'b'}})
+        graph.weight('a')        # >>> 2
+        graph.order              # >>> ['b', 'c', 'a']
+        graph.cyclic_links('a')  # >>> [['a', 'b', 'c', 'b']]
+        ```
+    """
+
+    def __init__(self, nodes, successors):
+        """
+        Parameters
+        ----------
+            nodes : 所有节点，按优先顺序排列，拓扑排序时无依赖关系的节点保持该顺序
+            successors : 节点到其所依赖的节点集合的映射，不在nodes中的节点会被忽略
+        """
+
+        self._nodes = list(nodes)
+        self._index = {node: i for i, node in enumerate(self._nodes)}
+        self._adjacency = []
+        for node in self._nodes:
+            succs = set(self._index[succ] for succ in successors.get(node, ()) if succ in self._index)
+            self._adjacency.append(tuple(sorted(succs)))
+
+        # 强连通分量按被依赖的分量在前的顺序排列，可以直接按该顺序递推每个分量能到达的节点
+        components = strongly_connected_components(range(len(self._nodes)), self._adjacency)
+        self._component_of = [0] * len(self._nodes)
+        for cindex, component in enumerate(components):
+            for i in component:
+                self._component_of[i] = cindex
+
+        count = len(components)
+        self._cyclic = [False] * count
+        self._reaches_cycle = [False] * count
+        self._reach = [0] * count  # 分量内节点经过至少一条边能到达的节点集合（位图）
+        prerequisites = [set() for _ in range(count)]
+        for cindex, component in enumerate(components):
+            reach = 0
+            cyclic = len(component) > 1
+            for i in component:
+                for succ in self._adjacency[i]:
+                    sindex = self._component_of[succ]
+                    if sindex == cindex:
+                        cyclic = True
+                        continue
+                    prerequisites[cindex].add(sindex)
+                    reach |= self._reach[sindex] | (1 << succ)
+                    if self._reaches_cycle[sindex]:
+                        self._reaches_cycle[cindex] = True
+            if cyclic:
+                for i in component:
+                    reach |= 1 << i
+                self._cyclic[cindex] = True
+                self._reaches_cycle[cindex] = True
+            self._reach[cindex] = reach
+
+        # 拓扑排序（Kahn算法），多个分量同时就绪时优先取分量内位置最靠前的
+        dependents = [[] for _ in range(count)]
+        for cindex, pres in enumerate(prerequisites):
+            for pindex in pres:
+                dependents[pindex].append(cindex)
+        waiting = [len(pres) for pres in prerequisites]
+        ready = [(min(components[cindex]), cindex) for cindex in range(count) if waiting[cindex] == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, cindex = heapq.heappop(ready)
+            order.extend(sorted(components[cindex]))
+            for dindex in dependents[cindex]:
+                waiting[dindex] -= 1
+                if waiting[dindex] == 0:
+                    heapq.heappush(ready, (min(components[dindex]), dindex))
+        self._order = order
+        self._rank = [0] * len(order)
+        for position, i in enumerate(order):
+            self._rank[i] = position
+
+    @property
+    def nodes(self):
+
+        return self._nodes
+
+    @property
+    def order(self):
+        """拓扑顺序的节点列表，被依赖的节点排在前面，同一循环依赖中的节点相邻排列"""
+
+        return [self._nodes[i] for i in self._order]
+
+    def rank(self, node):
+        """节点在拓扑顺序中的位置"""
+
+        return self._rank[self._index[node]]
+
+    def weight(self, node):
+        """节点的权重：直接和间接依赖的节点总数（去重，不包括节点自身）"""
+
+        i = self._index[node]
+        return bin(self._reach[self._component_of[i]] & ~(1 << i)).count('1')
+
+    def is_cyclic(self, node):
+        """节点自身或其直接、间接依赖的节点是否存在循环依赖"""
+
+        return self._reaches_cycle[self._component_of[self._index[node]]]
+
+    def _cycle_from(self, entry):
+        """返回分量内从entry出发回到entry的一条最短环路（节点编号列表）"""
+
+        cindex = self._component_of[entry]
+        parents = {}
+        queue = collections.deque([entry])
+        while queue:
+            i = queue.popleft()
+            for succ in self._adjacency[i]:
+                if succ == entry:
+                    cycle = [entry]
+                    while i != entry:
+                        cycle.append(i)
+                        i = parents[i]
+                    cycle.append(entry)
+                    cycle.reverse()
+                    return cycle
+                if succ not in parents and self._component_of[succ] == cindex:
+                    parents[succ] = i
+                    queue.append(succ)
+        return [entry, entry]
+
+    def cyclic_links(self, node):
+        """返回从节点出发到出现循环依赖结束的链路列表，每个能到达的循环依赖（强连通分量）返回一条最短链路
+
+        链路以再次出现的节点结束，例如 a->b->c->b 表示为 ['a', 'b', 'c', 'b']
+        """
+
+        if not self.is_cyclic(node):
+            return []
+        start = self._index[node]
+        links = []
+        seen = set()
+        parents = {start: None}
+        queue = collections.deque([start])
+        while queue:
+            i = queue.popleft()
+            cindex = self._component_of[i]
+            if self._cyclic[cindex] and cindex not in seen:
+                seen.add(cindex)
+                path = []
+                step = i
+                while step is not None:
+                    path.append(step)
+                    step = parents[step]
+                path.reverse()
+                links.append([self._nodes[j] for j in path + self._cycle_from(i)[1:]])
+            for succ in self._adjacency[i]:
+                if succ not in parents and self._reaches_cycle[self._component_of[succ]]:
+                    parents[succ] = i
+                    queue.append(succ)
+        return links
+
+    def links(self, node, limit=None):
+        """返回从节点出发的完整依赖链列表，每条链是从节点到叶子节点（没有非循环依赖的节点）的节点序列
+
+        链路按深度优先的顺序逐条生成，遇到循环依赖时链路在重复的节点之前结束，
+        依赖链的数量可能随依赖图的规模呈指数增长，可以通过limit限制返回的链路数量
+
+        Parameters
+        ----------
+            node : 节点
+            limit : 最多返回的链路数量，None表示不限制
+        """
+
+        start = self._index[node]
+        if not self._adjacency[start]:
+            return [[node]]
+        links = []
+        path = [start]
+        on_path = {start}
+        stack = [iter(self._adjacency[start])]
+        extended = [True]
+        while stack:
+            if limit is not None and len(links) >= limit:
+                break
+            for succ in stack[-1]:
+                if succ not in on_path:
+                    extended[-1] = True
+                    path.append(succ)
+                    on_path.add(succ)
+                    stack.append(iter(self._adjacency[succ]))
+                    extended.append(False)
+                    break
+            else:
+                stack.pop()
+                if not extended.pop():
+                    links.append([self._nodes[j] for j in path])
+                on_path.discard(path.pop())
+        return links
+
+
+class DependsView(object):
+    """依赖管理器中部分用例的依赖信息快照，只包含基本类型数据，可以在进程间传递
+
+    提供与DependsManager一致的get_missing、get_cyclic_links、dependent_test_is_pass接口，
+    供在子进程中执行的用例检查依赖。不在本快照中执行的被依赖用例的结果由outcomes提供。
+    """
+
+    def __init__(self, missing, cyclic_links, depends, outcomes=None):
+        """
+        Parameters
+        ----------
+            missing : 用例id到无法解析的依赖集合的映射
+            cyclic_links : 用例id到循环依赖链列表的映射
+            depends : 用例id到其所依赖的用例id列表的映射
+            outcomes : 已在别处执行的被依赖用例的结果，用例id到 (结果代码, 结果名称, 信息) 的映射
+        """
+
+        self._missing = missing
+        self._cyclic_links = cyclic_links
+        self._depends = depends
+        self._outcomes = dict(outcomes or {})
+        self._results = None
+
+    @property
+    def results(self):
+
+        if self._results is None:
+            raise AttributeError('The results attribute has not been set yet')
+        return self._results
+
+    @results.setter
+    def results(self, value):
+
+        self._results = value
+
+    def get_missing(self, test):
+
+        return self._missing[test.id()]
+
+    def get_cyclic_links(self, test):
+
+        return self._cyclic_links[test.id()]
+
+    def dependent_test_is_pass(self, test, results=None):
+        """ 检查测试用例所依赖的其他测试用例是否测试通过，只要有一个不通过则返回False，否则为True，同时返回失败的详情信息列表"""
+
+        is_pass = True
+        sep = '------->'
+        fail_details = []
+        results = results or self.results
+        finder = TestResultFinder()
+        for dtestid in self._depends[test.id()]:
+            if dtestid in self._outcomes:
+                codevalue, codename, message = self._outcomes[dtestid]
+            else:
+                codevalue, codename, message = finder.find_test_result_by_id(dtestid, results)
+            if not finder.is_pass(codevalue):
+                is_pass = False
+                msg = '{} {} {}({})'.format(dtestid, sep, codename, codevalue)
+                fail_details.append(msg)
+        return (is_pass, fail_details)
+
+    def __getstate__(self):
+
+        state = self.__dict__.copy()
+        state['_results'] = None
+        return state
+
+
+class DependsScheduler(object):
+    """用例依赖调度器
+
+    将TestDepends描述的用例依赖关系构建为有向无环图，被依赖的用例全部执行完成后立即释放依赖它的用例，
+    从而让相互独立的依赖链可以并发执行。
+
+    用例先按group_key分组（例如按测试类分组，保证同一测试类的用例在一起执行），组之间的依赖由组内用例的依赖推导得出。
+    组之间存在循环依赖时，参与循环的组会合并为一个组，组内用例保持原有顺序（已按依赖排序）串行执行。
+    无法解析的依赖会被忽略，由用例执行时自行检查并标记失败。
+
+    提供weight（调度单元的预估耗时）时，同时释放的多个单元按关键路径长度（单元自身及其后续依赖链的最长预估耗时）从长到短取出，
+    耗时长的依赖链尽早开始执行，从而缩短并行执行的总耗时；否则按单元内用例的排序位置取出。
+    """
+
+    def __init__(self, depend_manager, tests=None, group_key=None, weight=None):
+        """
+        Parameters
+        ----------
+            depend_manager : 已设置好用例的依赖管理器
+            tests : 要调度的用例列表，应已按依赖排好序，省略则取depend_manager.sorted_tests()
+            group_key : 分组函数，接收用例返回分组键，省略则每个用例单独为一组
+            weight : 预估耗时函数，接收调度单元的用例列表返回预估耗时(秒)，省略则不按耗时调度
+        """
+
+        self.depend_manager = depend_manager
+        tests = list(depend_manager.sorted_tests() if tests is None else tests)
+        if group_key is None:
+            group_key = self._identity_key
+
+        key_to_group = {}
+        group_tests = []
+        test_to_group = {}
+        for test in tests:
+            key = group_key(test)
+            if key not in key_to_group:
+                key_to_group[key] = len(group_tests)
+                group_tests.append([])
+            gindex = key_to_group[key]
+            group_tests[gindex].append(test)
+            test_to_group[test.id()] = gindex
+
+        successors = collections.defaultdict(set)
+        for test in tests:
+            gindex = test_to_group[test.id()]
+            for dtestid in depend_manager.depends[test.id()].depends:
+                dgindex = test_to_group.get(dtestid, None)
+                if dgindex is not None and dgindex != gindex:
+                    successors[gindex].add(dgindex)
+
+        # 合并存在循环依赖的组，合并后的组按被依赖的组在前的顺序排列
+        merged = strongly_connected_components(range(len(group_tests)), successors)
+        position = {t.id(): i for i, t in enumerate(tests)}
+        group_to_unit = {}
+        self._units = []
+        for component in merged:
+            unit_tests = []
+            for gindex in component:
+                group_to_unit[gindex] = len(self._units)
+                unit_tests.extend(group_tests[gindex])
+            unit_tests.sort(key=lambda t: position[t.id()])
+            self._units.append(unit_tests)
+
+        self._prerequisites = [set() for _ in self._units]
+        self._dependents = [set() for _ in self._units]
+        for gindex, dgindexes in successors.items():
+            uindex = group_to_unit[gindex]
+            for dgindex in dgindexes:
+                duindex = group_to_unit[dgindex]
+                if duindex != uindex:
+                    self._prerequisites[uindex].add(duindex)
+                    self._dependents[duindex].add(uindex)
+
+        # 单元释放的优先顺序：单元内排在最前的用例的位置
+        self._rank = [position[unit[0].id()] for unit in self._units]
+        if weight is not None:
+            # 单元按被依赖的单元在前的顺序排列，倒序即可由后续单元的关键路径长度推导出当前单元的关键路径长度
+            critical = [0.0] * len(self._units)
+            for uindex in reversed(range(len(self._units))):
+                tail = max((critical[dependent] for dependent in self._dependents[uindex]), default=0.0)
+                critical[uindex] = weight(self._units[uindex]) + tail
+            self._rank = [(-critical[i], rank) for i, rank in enumerate(self._rank)]
+        self._waiting = [len(p) for p in self._prerequisites]
+        self._ready = [(self._rank[i], i) for i, count in enumerate(self._waiting) if count == 0]
+        heapq.heapify(self._ready)
+        self._running = set()
+        self._finished = set()
+
+    @staticmethod
+    def _identity_key(test):
+
+        return test.id()
+
+    @property
+    def units(self):
+        """调度单元列表，每个单元是一个用例列表"""
+
+        return self._units
+
+    def get_prerequisites(self, unit_index):
+        """返回调度单元所依赖的其它调度单元的索引集合"""
+
+        return set(self._prerequisites[unit_index])
+
+    def get_ready(self):
+        """取出所有已释放（所依赖的单元都已执行完成）的调度单元，返回 [(单元索引, 用例列表), ...]"""
+
+        ready = []
+        while self._ready:
+            rank, uindex = heapq.heappop(self._ready)
+            self._running.add(uindex)
+            ready.append((uindex, self._units[uindex]))
+        return ready
+
+    def done(self, unit_index):
+        """标记调度单元执行完成，并释放所有依赖都已完成的单元"""
+
+        if unit_index in self._finished:
+            return
+        self._running.discard(unit_index)
+        self._finished.add(unit_index)
+        for dependent in self._dependents[unit_index]:
+            self._waiting[dependent] -= 1
+            if self._waiting[dependent] == 0:
+                heapq.heappush(self._ready, (self._rank[dependent], dependent))
+
+    def is_active(self):
+        """是否还有未执行完成的调度单元"""
+
+        return len(self._finished) < len(self._units)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+import os
+import sqlite3
+import datetime
+import statistics
+import contextlib
+from ..utils.sutils import mkdirs
+
+
+class DurationHistory(object):
+    """用例耗时历史记录
+
+    每次执行后把每个用例的耗时保存到本地SQLite数据库（默认在报告目录下），每个用例只保留最近的若干条记录。
+    历史耗时的中位数用于并行执行时按耗时从长到短调度用例（see :py:class:`DependsScheduler`），
+    同时用于生成报告中的「最慢用例」汇总（see :py:meth:`slowest_summary`）。
+    """
+
+    DEFAULT_FILE_NAME = 'stest_durations.sqlite3'
+    DEFAULT_KEEP = 20
+    # 报告中每个用例显示的最近耗时记录条数
+    TREND_SIZE = 5
+
+    def __init__(self, path, keep=DEFAULT_KEEP):
+        """
+        Args:
+            path: 数据库文件路径
+            keep: 每个用例保留的最近耗时记录条数
+        """
+
+        self.path = os.path.abspath(path)
+        self.keep = keep
+
+    @classmethod
+    def from_settings(cls, gsettings, report_dir=None, enabled=None):
+        """使用配置创建耗时历史记录，未启用或者无法确定数据库文件路径时返回None
+
+        数据库文件路径优先取配置 DURATION_HISTORY_FILE，其次是报告目录下的 stest_durations.sqlite3
+
+        Args:
+            gsettings: 全局配置
+            report_dir: 报告目录
+            enabled: 是否启用，省略则取配置 DURATION_HISTORY
+        """
+
+        if enabled is None:
+            enabled = getattr(gsettings, "DURATION_HISTORY", False)
+        if not enabled:
+            return None
+        path = getattr(gsettings, "DURATION_HISTORY_FILE", None)
+        if not path:
+            if not report_dir:
+                return None
+            path = os.path.join(report_dir, cls.DEFAULT_FILE_NAME)
+        return cls(path, getattr(gsettings, "DURATION_HISTORY_KEEP", cls.DEFAULT_KEEP))
+
+    @contextlib.contextmanager
+    def connect(self):
+        """打开数据库连接，with语句块正常结束时提交事务，表不存在时自动创建"""
+
+        mkdirs(os.path.dirname(self.path))
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS durations ("
+                             "id INTEGER PRIMARY KEY AUTOINCREMENT, test_id TEXT NOT NULL, "
+                             "duration REAL NOT NULL, result_code INTEGER, run_time TEXT)")
+                conn.execute("CREATE INDEX IF NOT EXISTS durations_test_id ON durations (test_id, id)")
+                yield conn
+        finally:
+            conn.close()
+
+    def record(self, durations, run_time=None):
+        """保存一次执行的用例耗时，并删除每个用例超出保留条数的旧记录
+
+        Args:
+            durations: 列表，每个元素是 (用例id, 耗时(秒), 结果代码)
+            run_time: 执行时间，省略则取当前时间
+        """
+
+        if not durations:
+            return
+        run_time = (run_time or datetime.datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+        with self.connect() as conn:
+            conn.executemany("INSERT INTO durations (test_id, duration, result_code, run_time) VALUES (?, ?, ?, ?)",
+                             [(test_id, duration, result_code, run_time) for test_id, duration, result_code in durations])
+            conn.executemany("DELETE FROM durations WHERE test_id = ? AND id NOT IN "
+                             "(SELECT id FROM durations WHERE test_id = ? ORDER BY id DESC LIMIT ?)",
+                             [(test_id, test_id, self.keep) for test_id in {one[0] for one in durations}])
+
+    def history(self):
+        """返回所有用例的耗时记录，用例id -> 耗时列表（从旧到新）"""
+
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+        with self.connect() as conn:
+            for test_id, duration in conn.execute("SELECT test_id, duration FROM durations ORDER BY id"):
+                records.setdefault(test_id, []).append(duration)
+        return records
+
+    def medians(self):
+        """返回所有用例的历史耗时中位数，用例id -> 耗时中位数(秒)"""
+
+        return {test_id: statistics.median(durations) for test_id, durations in self.history().items()}
+
+    def slowest_summary(self, durations, top=10, history=None):
+        """返回本次执行最慢用例的汇总，一个字典：title - 标题，columns - 列名列表，rows - 前top条数据行列表
+
+        Args:
+            durations: 本次执行的用例耗时列表，每个元素是 (用例id, 耗时(秒))
+            top: 汇总的用例条数
+            history: 本次执行之前的耗时记录（see :py:meth:`history`），省略则从数据库读取
+        """
+
+        if history is None:
+            history = self.history()
+        rows = []
+        for test_id, duration in sorted(durations, key=lambda one: one[1], reverse=True)[:top]:
+            previous = history.get(test_id, [])
+            if previous:
+                median = statistics.median(previous)
+                change = '{:+.1f}%'.format((duration - median) / median * 100) if median > 0 else '-'
+                median = '{:f}'.format(median)
+            else:
+                median = change = '-'
+            trend = ' → '.join('{:.4g}'.format(one) for one in previous[-self.TREND_SIZE:] + [duration])
+            rows.append([test_id, '{:f}'.format(duration), median, change, trend])
+        return dict(title='最慢用例（共{}个用例，与历史耗时中位数对比）'.format(len(durations)),
+                    columns=['用例', '本次耗时(秒)', '历史中位数(秒)', '变化', '耗时趋势(秒，从旧到新)'], rows=rows)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+import atexit
+import asyncio
+import threading
+
+_local = threading.local()
+_loops = []
+_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """返回当前线程专用的事件循环，没有或者已关闭则创建
+
+    同一线程中所有异步用例（及其异步的setUp、tearDown）共用一个事件循环，因此在用例之间可以共用异步的playwright、浏览器等对象，
+    每个线程（并行执行时的每个工作线程）各自使用自己的事件循环，程序退出时统一关闭。
+    """
+
+    loop = getattr(_local, 'loop', None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        _local.loop = loop
+        with _lock:
+            _loops.append(loop)
+    return loop
+
+
+def run_coroutine(coro):
+    """在当前线程的事件循环中执行协程直到完成，返回协程的返回值"""
+
+    return get_event_loop().run_until_complete(coro)
+
+
+def close_event_loop():
+    """取消当前线程事件循环中未完成的任务并关闭事件循环"""
+
+    loop = getattr(_local, 'loop', None)
+    _local.loop = None
+    if loop is not None:
+        _close(loop)
+
+
+def _close(loop):
+
+    with _lock:
+        if loop in _loops:
+            _loops.remove(loop)
+    if loop.is_closed() or loop.is_running():
+        return
+    try:
+        tasks = [task for task in asyncio.all_tasks(loop) if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    finally:
+        loop.close()
+
+
+@atexit.register
+def _close_all():
+
+    with _lock:
+        loops = list(_loops)
+    for loop in loops:
+        try:
+            _close(loop)
+        except Exception:
+            pass
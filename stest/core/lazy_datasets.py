@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+import operator
+import threading
+import collections.abc
+
+
+class LazyDatasets(collections.abc.Sequence):
+    """惰性参数化数据集
+
+    包装数据提供者返回的迭代器或生成器，测试数据在用例执行时按序号逐条从迭代器中取出，而不是在搜集用例时一次性全部生成。
+    用例按序号顺序执行，每条数据取出后即从缓存中删除（只保留最近取出的一条以便重复获取），为跳过的序号预读的数据缓存到被取出为止，
+    因此内存中只保留尚未执行的少量数据，已取出的数据不能再按序号获取。
+
+    数据集的长度就是为测试方法创建的用例个数：提供了长度提示（length_hint参数或迭代器的__length_hint__）时直接使用该值，
+    不会提前读取任何数据。**没有长度提示时，搜集用例获取长度会读取并缓存全部数据，与直接返回列表的内存占用相同**，
+    因此数据量大时必须提供长度提示。长度提示大于实际的数据条数时，多出的用例执行时会因找不到测试数据而报错，
+    小于实际的数据条数时，多出的数据被忽略。
+
+    Usage
+    -----
+        ```python
+        class DataProvider(object):
+            def get_testdatas(self, testclass, testmethod, *args, **kwargs):
+
+                rows = ({'加数1': i, '加数2': i, '预期': i * 2} for i in range(100000))
+                return LazyDatasets(rows, length_hint=100000)
+        ```
+    """
+
+    def __init__(self, iterable, length_hint=None):
+        """
+        Args:
+            iterable: 可迭代对象、迭代器或生成器，每个元素是测试方法一次运行的测试数据
+            length_hint: 数据条数提示，省略则尝试从iterable获取，都没有则获取长度时读取全部数据
+        """
+
+        if length_hint is None:
+            hint = operator.length_hint(iterable, -1)
+            length_hint = hint if hint >= 0 else None
+        self._length_hint = length_hint
+        self._iterator = iter(iterable)
+        # 已读取但尚未取出的数据，序号(从0开始) -> 数据
+        self._items = {}
+        # 下一条从迭代器读取的数据的序号
+        self._next_index = 0
+        # 最近取出的数据 (序号, 数据)
+        self._last = None
+        self._exhausted = False
+        self._lock = threading.Lock()
+
+    @property
+    def length_hint(self):
+        """数据条数提示，没有则为None"""
+
+        return self._length_hint
+
+    def _fill(self, count=None):
+        """从迭代器中读取数据直到已读取count条或迭代器耗尽，count为None则读取全部数据，调用者需持有锁"""
+
+        while not self._exhausted and (count is None or self._next_index < count):
+            try:
+                self._items[self._next_index] = next(self._iterator)
+                self._next_index += 1
+            except StopIteration:
+                self._exhausted = True
+                self._iterator = None
+
+    def load_all(self):
+        """读取剩余的全部数据，返回尚未取出的数据列表（按序号排列）"""
+
+        with self._lock:
+            self._fill()
+            return [self._items[index] for index in sorted(self._items)]
+
+    def __getitem__(self, index):
+        """按序号（从0开始）取出数据，取出后数据从缓存中删除，只支持非负整数序号"""
+
+        if not isinstance(index, int) or index < 0:
+            raise TypeError('{} only supports non-negative integer indices'.format(self.__class__.__name__))
+        with self._lock:
+            if self._last is not None and self._last[0] == index:
+                return self._last[1]
+            self._fill(index + 1)
+            if index not in self._items:
+                if index < self._next_index:
+                    raise IndexError('data at index {} has already been taken'.format(index))
+                raise IndexError('index {} out of range'.format(index))
+            item = self._items.pop(index)
+            self._last = (index, item)
+            return item
+
+    def __len__(self):
+
+        if self._length_hint is not None:
+            return self._length_hint
+        with self._lock:
+            self._fill()
+            return self._next_index
+
+    def __bool__(self):
+
+        if self._length_hint is not None:
+            return self._length_hint > 0
+        with self._lock:
+            self._fill(1)
+            return self._next_index > 0
+
+    def __iter__(self):
+        """按序号依次取出尚未取出的数据"""
+
+        index = 0
+        while True:
+            with self._lock:
+                self._fill(index + 1)
+                if index >= self._next_index:
+                    return
+                pending = index in self._items
+            if pending:
+                yield self[index]
+            index += 1
+
+    def __repr__(self):
+
+        return '<{} pending={} taken_up_to={} length_hint={}>'.format(
+            self.__class__.__name__, len(self._items), self._next_index, self._length_hint)
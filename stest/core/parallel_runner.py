@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+import io
+import sys
+import pickle
+import statistics
+import argparse
+import datetime
+import importlib
+import traceback
+import multiprocessing
+import concurrent.futures
+from unittest.suite import TestSuite
+from unittest.runner import _WritelnDecorator
+
+from ..conf import settings
+from ..fixed_field import FixedField
+from .seven_loader import SevenTestLoader
+from .test_wrapper import Test
+from .seven_result import SevenTestResult
+from .seven_suite import SevenTestSuite
+from .phase_timing import get_phase_timings
+from .profiling import TestProfiler
+from .lazy_datasets import LazyDatasets
+
+# 主进程中待执行的用例(id -> 用例)，fork方式创建的子进程会直接继承，无需重新搜集用例
+_TESTS_REGISTRY = {}
+
+# 子进程中已搜集的测试类用例缓存，(模块名, 类名) -> {id: 用例}
+_COLLECTED_TESTS = {}
+
+# 参数化数据中用例自身的占位标记
+_SELF_MARKER = ('self', None)
+
+
+def _portable(value):
+    """返回可以在进程间传递的值，无法序列化的值转为其repr字符串"""
+
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return repr(value)
+    return value
+
+
+def _test_address(test):
+    """返回在子进程中定位用例所需的信息: (模块名, 类名, 用例id)"""
+
+    cls = test.__class__
+    return (cls.__module__, cls.__qualname__, test.id())
+
+
+def _load_testclass(module_name, qualname):
+
+    module = sys.modules.get(module_name, None)
+    if module is None:
+        module = importlib.import_module(module_name)
+    obj = module
+    for part in qualname.split('.'):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _flatten(suite):
+
+    tests = []
+    for one in suite:
+        if isinstance(one, TestSuite):
+            tests.extend(_flatten(one))
+        else:
+            tests.append(one)
+    return tests
+
+
+def _resolve_tests(addresses):
+    """根据用例地址找到子进程中对应的用例对象，优先使用从主进程继承的用例"""
+
+    tests = []
+    for module_name, qualname, testid in addresses:
+        test = _TESTS_REGISTRY.get(testid, None)
+        if test is None:
+            key = (module_name, qualname)
+            if key not in _COLLECTED_TESTS:
+                loader = SevenTestLoader()
+                loader.args_namespace = argparse.Namespace(groups=None, settings_file=None)
+                testclass = _load_testclass(module_name, qualname)
+                collected = _flatten(loader.loadTestsFromTestCase(testclass))
+                _COLLECTED_TESTS[key] = {t.id(): t for t in collected}
+            test = _COLLECTED_TESTS[key][testid]
+        tests.append(test)
+    return tests
+
+
+def _dump_runtime_datas(test):
+
+    getter = getattr(test, 'get_testcase_runtime_datas', None)
+    if getter is None:
+        return None
+    runtime_datas = getter()
+    args = [_SELF_MARKER if arg is test else ('value', _portable(arg)) for arg in runtime_datas['args']]
+    kwargs = {k: _portable(v) for k, v in runtime_datas['kwargs'].items()}
+    return (args, kwargs)
+
+
+def _dump_test_state(test, result):
+    """收集子进程中用例执行后的状态，用于同步回主进程中对应的用例"""
+
+    user_screenshots = getattr(settings, "USER_SCREENSHOTS", {}).get(test, [])
+    return dict(
+        start_time=getattr(test, FixedField.STEST_TESTCASE_START_TIME, None),
+        start_perf_counter=getattr(test, FixedField.STEST_START_PERF_COUNTER, None),
+        finish_perf_counter=getattr(test, FixedField.STEST_FINISH_PERF_COUNTER, None),
+        runtime_datas=_dump_runtime_datas(test),
+        phase_timings=dict(get_phase_timings(test)),
+        screenshot=result.screenshots.get(test, None),
+        user_screenshots=[{k: _portable(v) for k, v in one.items()} for one in user_screenshots],
+    )
+
+
+def _dump_outcomes(result, tests):
+    """按用例执行顺序返回结果列表，每个元素是 (结果类型, 用例id, 结果信息)"""
+
+    order = {t.id(): i for i, t in enumerate(tests)}
+    outcomes = []
+    for kind in SevenTestResult.OUTCOME_KINDS:
+        for entry in getattr(result, kind):
+            if isinstance(entry, tuple):
+                test, message = entry
+            else:
+                test, message = entry, ''
+            # 子测试(subTest)归属于其所在的用例
+            test = getattr(test, 'test_case', test)
+            outcomes.append((kind, test.id(), message))
+    outcomes.sort(key=lambda outcome: order.get(outcome[1], len(order)))
+    return outcomes
+
+
+def _load_lazy_datasets(tests):
+    """读取用例的惰性数据集中剩余的全部数据，避免fork出的多个子进程各自从同一个迭代器（例如共享的文件句柄）中读取数据"""
+
+    loaded = set()
+    for test in tests:
+        test_settings = getattr(test, 'test_method_settings', None) or {}
+        datasets = test_settings.get(Test.TEST_DATASETS, None)
+        if isinstance(datasets, LazyDatasets) and id(datasets) not in loaded:
+            loaded.add(id(datasets))
+            datasets.load_all()
+
+
+def run_unit(addresses, depends_view, options):
+    """在子进程中顺序执行一个调度单元内的所有用例
+
+    Args:
+        addresses: 用例地址列表，每个元素是 (模块名, 类名, 用例id)，已按依赖排好序
+        depends_view: 单元内用例的依赖信息快照（DependsView），包含单元外被依赖用例的执行结果
+        options: 执行选项字典，verbosity、failfast、buffer、tb_locals、settings_file、profile（性能分析器参数）
+    Returns: 返回一个字典，testsRun - 执行的用例数，class_phase_timings - 测试类各阶段耗时，profile - 性能分析汇总数据，outcomes - 结果列表，states - 用例id到用例状态的映射
+    """
+
+    settings_file = options.get('settings_file', None)
+    if settings_file and not settings.is_loaded:
+        settings.load_configure_from_file(settings_file)
+
+    tests = _resolve_tests(addresses)
+    stream = _WritelnDecorator(io.StringIO())
+    result = SevenTestResult(stream, True, options.get('verbosity', 1))
+    result.failfast = options.get('failfast', False)
+    result.buffer = options.get('buffer', False)
+    result.tb_locals = options.get('tb_locals', False)
+
+    depends_view.results = result
+    result.depend_manager = depends_view
+    profile_options = options.get('profile', None)
+    if profile_options:
+        result.profiler = TestProfiler(**profile_options)
+
+    result.startTestRun()
+    try:
+        SevenTestSuite(tests)(result)
+    finally:
+        result.stopTestRun()
+        if result.profiler is not None:
+            result.profiler.close()
+    return dict(testsRun=result.testsRun,
+                class_phase_timings=result.class_phase_timings,
+                profile=result.profiler.export() if result.profiler is not None else None,
+                outcomes=_dump_outcomes(result, tests),
+                states={t.id(): _dump_test_state(t, result) for t in tests})
+
+
+class ParallelSuite(object):
+    """使用进程池并行执行的测试套件
+
+    同一个测试类的用例划分到同一个调度单元（测试类之间存在循环依赖时合并为一个单元），每个调度单元在一个子进程中按依赖顺序串行执行，
+    保证setUpClass/tearDownClass只执行一次。调度单元所依赖的单元全部执行完成后立即释放（see :py:class:`DependsScheduler`），
+    相互独立的依赖链可以在不同的子进程中并发执行。各子进程的执行结果最终合并到主进程的SevenTestResult中，因此测试报告的生成不受影响。
+
+    提供用例的历史耗时时，同时释放的调度单元按关键路径的预估耗时从长到短提交（see :py:class:`DependsScheduler`），没有历史耗时的用例按已知耗时的中位数估算。
+
+    注意：钩子函数在执行用例的子进程中运行，每个调度单元执行前后都会调用一次startTestRun/stopTestRun阶段的钩子。
+    """
+
+    def __init__(self, tests, depend_manager, workers, options=None, durations=None):
+        """
+        Args:
+            tests: 已按依赖排好序的用例列表
+            depend_manager: 已设置好用例的依赖管理器
+            workers: 进程池进程数
+            options: 子进程执行选项
+            durations: 用例的历史耗时，用例id -> 耗时(秒)，提供则按耗时从长到短调度
+        """
+
+        self.tests = list(tests)
+        self.depend_manager = depend_manager
+        self.workers = workers
+        self.options = dict(options or {})
+        self.durations = durations
+        self._default_duration = 0.0
+
+    def __iter__(self):
+        return iter(self.tests)
+
+    def countTestCases(self):
+        return len(self.tests)
+
+    @staticmethod
+    def _class_key(test):
+
+        return test.__class__
+
+    def _unit_weight(self, unit):
+
+        return sum(self.durations.get(t.id(), self._default_duration) for t in unit)
+
+    def scheduler(self):
+        """返回按测试类划分调度单元的依赖调度器"""
+
+        weight = None
+        if self.durations:
+            self._default_duration = statistics.median(self.durations.values())
+            weight = self._unit_weight
+        return self.depend_manager.scheduler(self.tests, group_key=self._class_key, weight=weight)
+
+    def _mp_context(self):
+
+        if 'fork' in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context('fork')
+        return multiprocessing.get_context()
+
+    def _merge(self, result, unit, payload):
+
+        tests = {t.id(): t for t in unit}
+        for testid, state in payload['states'].items():
+            test = tests[testid]
+            if state['start_time'] is not None:
+                setattr(test, FixedField.STEST_TESTCASE_START_TIME, state['start_time'])
+            if state['start_perf_counter'] is not None:
+                setattr(test, FixedField.STEST_START_PERF_COUNTER, state['start_perf_counter'])
+            if state['finish_perf_counter'] is not None:
+                setattr(test, FixedField.STEST_FINISH_PERF_COUNTER, state['finish_perf_counter'])
+            if state['runtime_datas'] is not None:
+                args, kwargs = state['runtime_datas']
+                test.set_testcase_runtime_datas([test if arg == _SELF_MARKER else arg[1] for arg in args], kwargs)
+            if state['phase_timings']:
+                setattr(test, FixedField.STEST_PHASE_TIMINGS, state['phase_timings'])
+            if state['screenshot'] is not None:
+                result.screenshots[test] = state['screenshot']
+            if state['user_screenshots']:
+                user_screenshots = getattr(settings, "USER_SCREENSHOTS", {})
+                user_screenshots[test] = state['user_screenshots']
+                settings.USER_SCREENSHOTS = user_screenshots
+        if payload['profile'] and result.profiler is not None:
+            result.profiler.merge(payload['profile'])
+        for classname, timings in payload['class_phase_timings'].items():
+            result.class_phase_timings.setdefault(classname, {}).update(timings)
+        result.testsRun += payload['testsRun']
+        for kind, testid, message in payload['outcomes']:
+            result.merge_outcome(tests[testid], kind, message)
+
+    def _merge_crash(self, result, unit):
+
+        message = traceback.format_exc()
+        finish_time = datetime.datetime.now()
+        for test in unit:
+            setattr(test, FixedField.STEST_TESTCASE_START_TIME, finish_time)
+            result.testsRun += 1
+            result.merge_outcome(test, 'errors', message)
+
+    def __call__(self, result):
+
+        scheduler = self.scheduler()
+        if not scheduler.units:
+            return result
+        _TESTS_REGISTRY.clear()
+        _TESTS_REGISTRY.update({t.id(): t for t in self.tests})
+        mp_context = self._mp_context()
+        if mp_context.get_start_method() == 'fork':
+            _load_lazy_datasets(self.tests)
+        self.options.setdefault('settings_file', getattr(settings, 'SETTINGS_MODULE_FILE_PATH', None))
+        max_workers = max(1, min(self.workers, len(scheduler.units)))
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+                futures = {}
+                while scheduler.is_active() and not result.shouldStop:
+                    for uindex, unit in scheduler.get_ready():
+                        addresses = [_test_address(t) for t in unit]
+                        depends_view = self.depend_manager.view(unit, result)
+                        futures[executor.submit(run_unit, addresses, depends_view, self.options)] = uindex
+                    if not futures:
+                        break
+                    finished, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in finished:
+                        uindex = futures.pop(future)
+                        unit = scheduler.units[uindex]
+                        try:
+                            payload = future.result()
+                        except Exception:
+                            self._merge_crash(result, unit)
+                        else:
+                            self._merge(result, unit, payload)
+                        scheduler.done(uindex)
+                for future in futures:
+                    future.cancel()
+        finally:
+            _TESTS_REGISTRY.clear()
+        return result
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+import inspect
+import unittest
+from .phase_timing import TestPhase
+from .phase_timing import phase_timer
+from .event_loop import run_coroutine
+
+# unittest按模块全局变量__unittest识别框架自身的栈帧，用例失败时的堆栈从用户代码开始显示，
+# 本模块的函数直接作为AbstractTestCase的_callSetUp、_callTestMethod、_callTearDown，
+# 计时和执行异步方法的栈帧不会出现在失败堆栈中，也不会截断用户的断言语句所在行
+__unittest = True
+
+
+def call_set_up(testcase):
+    """记录setUp阶段的耗时，setUp是协程函数（async def）时在当前线程的事件循环中执行完成"""
+
+    with phase_timer(testcase, TestPhase.SET_UP):
+        if inspect.iscoroutinefunction(testcase.setUp):
+            return run_coroutine(testcase.setUp())
+        return unittest.TestCase._callSetUp(testcase)
+
+
+def call_test_method(testcase, method):
+    """记录测试方法的耗时，异步测试方法（async def）在当前线程的事件循环中执行完成"""
+
+    with phase_timer(testcase, TestPhase.TEST):
+        if inspect.iscoroutinefunction(inspect.unwrap(method)):
+            return run_coroutine(method())
+        return unittest.TestCase._callTestMethod(testcase, method)
+
+
+def call_tear_down(testcase):
+    """记录tearDown阶段的耗时，tearDown是协程函数（async def）时在当前线程的事件循环中执行完成"""
+
+    with phase_timer(testcase, TestPhase.TEAR_DOWN):
+        if inspect.iscoroutinefunction(testcase.tearDown):
+            return run_coroutine(testcase.tearDown())
+        return unittest.TestCase._callTearDown(testcase)
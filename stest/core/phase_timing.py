@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+import time
+import contextlib
+from ..fixed_field import FixedField
+from ..utils.attrs_marker import Const
+from ..utils.attrs_manager import AttributeManager
+
+
+class TestPhase(AttributeManager):
+    """用例执行阶段，值是阶段名称，描述是报告中显示的名称"""
+
+    DATA_PROVIDER = Const('dataProvider', '参数化数据收集')
+    DEPENDS_CHECK = Const('dependsCheck', '依赖检查')
+    SET_UP_CLASS = Const('setUpClass', '测试类前置(setUpClass)')
+    SET_UP = Const('setUp', '用例前置(setUp)')
+    TEST = Const('test', '测试方法')
+    TEAR_DOWN = Const('tearDown', '用例后置(tearDown)')
+    TEAR_DOWN_CLASS = Const('tearDownClass', '测试类后置(tearDownClass)')
+
+    @classmethod
+    def phases(cls):
+        """按执行顺序返回所有阶段名称"""
+
+        return [marker.value for marker in cls.const_attrs.values()]
+
+    @classmethod
+    def label(cls, phase):
+        """返回阶段在报告中显示的名称"""
+
+        for marker in cls.const_attrs.values():
+            if marker.value == phase:
+                return marker.description
+        return phase
+
+
+def get_phase_timings(obj):
+    """返回对象（用例）上记录的各阶段耗时字典，阶段名称 -> 耗时(秒)"""
+
+    return getattr(obj, FixedField.STEST_PHASE_TIMINGS, None) or {}
+
+
+def record_phase(obj, phase, seconds):
+    """累加对象（用例）某个阶段的耗时
+
+    Args:
+        obj: 用例
+        phase: 阶段名称，see :py:class:`TestPhase`
+        seconds: 耗时(秒)
+    """
+
+    timings = getattr(obj, FixedField.STEST_PHASE_TIMINGS, None)
+    if timings is None:
+        timings = {}
+        setattr(obj, FixedField.STEST_PHASE_TIMINGS, timings)
+    timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+@contextlib.contextmanager
+def phase_timer(obj, phase):
+    """记录with语句块的耗时到对象（用例）的某个阶段，语句块抛出异常也会记录"""
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(obj, phase, time.perf_counter() - start)
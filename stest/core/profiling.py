@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+import os
+import re
+import pstats
+import cProfile
+import tracemalloc
+from ..utils.attrs_marker import Const
+from ..utils.attrs_manager import AttributeManager
+
+
+class TestProfiler(AttributeManager):
+    """用例性能分析器
+
+    每个用例从startTest到stopTest（包括setUp、测试方法和tearDown）期间进行性能分析，每个用例的分析结果单独保存为文件，
+    同时汇总所有用例的分析结果，生成报告中的热点汇总（see :py:meth:`summary`）。
+
+    - cpu模式：使用cProfile，每个用例保存一个 .prof 文件，可以用 pstats 或 snakeviz 等工具查看，汇总按累计耗时排序的热点函数
+    - memory模式：使用tracemalloc，每个用例保存用例结束时的内存分配快照 .snapshot 文件（tracemalloc.Snapshot.load 载入），
+      汇总用例执行期间内存分配增长最多的代码行
+    """
+
+    CPU = Const('cpu', 'cProfile 函数耗时分析')
+    MEMORY = Const('memory', 'tracemalloc 内存分配分析')
+
+    DEFAULT_OUTPUT_DIR_NAME = 'stest_profile'
+    DEFAULT_TOP = 20
+
+    def __init__(self, mode='cpu', output_dir=None, top=DEFAULT_TOP):
+        """
+        Args:
+            mode: 分析模式，cpu 或 memory
+            output_dir: 每个用例分析结果文件的存放目录，省略则使用当前工作目录下的 stest_profile 目录
+            top: 报告中热点汇总的条数
+        """
+
+        if mode not in (self.CPU, self.MEMORY):
+            raise ValueError('unsupported profile mode: {}, expected {} or {}'.format(mode, self.CPU, self.MEMORY))
+        self.mode = mode
+        self.output_dir = os.path.abspath(output_dir or os.path.join(os.getcwd(), self.DEFAULT_OUTPUT_DIR_NAME))
+        self.top = top
+        self._active = {}
+        self._files = []
+        self._cpu_stats = None
+        self._memory_stats = {}
+        self._tracemalloc_started = False
+
+    def options(self):
+        """返回创建同样配置的分析器所需的参数，用于在并行执行的子进程中创建分析器"""
+
+        return dict(mode=self.mode, output_dir=self.output_dir, top=self.top)
+
+    @property
+    def files(self):
+        """已保存的用例分析结果文件列表"""
+
+        return list(self._files)
+
+    def _file_path(self, test, ext):
+
+        name = re.sub(r'[^\w.-]+', '_', test.id())
+        return os.path.join(self.output_dir, name + ext)
+
+    def start(self, test):
+        """开始分析用例"""
+
+        if self.mode == self.CPU:
+            profile = cProfile.Profile()
+            self._active[test] = profile
+            profile.enable()
+        else:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracemalloc_started = True
+            self._active[test] = tracemalloc.take_snapshot()
+
+    def stop(self, test):
+        """结束分析用例，保存用例的分析结果文件并汇总"""
+
+        started = self._active.pop(test, None)
+        if started is None:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.mode == self.CPU:
+            started.disable()
+            file_path = self._file_path(test, '.prof')
+            started.dump_stats(file_path)
+            self._add_cpu_stats(started)
+        else:
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            ))
+            file_path = self._file_path(test, '.snapshot')
+            snapshot.dump(file_path)
+            for stat in snapshot.compare_to(started, 'lineno'):
+                if stat.size_diff > 0:
+                    self._add_memory_stat(str(stat.traceback[0]), stat.size_diff, stat.count_diff)
+        self._files.append(file_path)
+
+    def close(self):
+        """停止由分析器开启的内存跟踪"""
+
+        if self._tracemalloc_started:
+            tracemalloc.stop()
+            self._tracemalloc_started = False
+
+    def _add_cpu_stats(self, source):
+
+        if self._cpu_stats is None:
+            self._cpu_stats = pstats.Stats(source)
+        else:
+            self._cpu_stats.add(source)
+
+    def _add_memory_stat(self, location, size_diff, count_diff):
+
+        stat = self._memory_stats.setdefault(location, [0, 0])
+        stat[0] += size_diff
+        stat[1] += count_diff
+
+    def export(self):
+        """导出汇总数据，用于合并并行执行的子进程中的分析结果，see :py:meth:`merge`"""
+
+        if self.mode == self.CPU:
+            return dict(files=self.files)
+        return dict(files=self.files, memory_stats=self._memory_stats)
+
+    def merge(self, exported):
+        """合并 :py:meth:`export` 导出的汇总数据"""
+
+        files = exported.get('files', [])
+        self._files.extend(files)
+        if self.mode == self.CPU:
+            for file_path in files:
+                if os.path.exists(file_path):
+                    self._add_cpu_stats(file_path)
+        else:
+            for location, (size_diff, count_diff) in exported.get('memory_stats', {}).items():
+                self._add_memory_stat(location, size_diff, count_diff)
+
+    def summary(self):
+        """返回热点汇总，一个字典：title - 标题，columns - 列名列表，rows - 前top条数据行列表"""
+
+        if self.mode == self.CPU:
+            rows = []
+            if self._cpu_stats is not None:
+                items = sorted(self._cpu_stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+                for (filename, lineno, funcname), (cc, nc, tt, ct, callers) in items[:self.top]:
+                    rows.append(['{}:{}({})'.format(filename, lineno, funcname), str(nc),
+                                 '{:f}'.format(tt), '{:f}'.format(ct)])
+            return dict(title='性能分析 - 累计耗时最多的函数（共{}个用例）'.format(len(self._files)),
+                        columns=['函数', '调用次数', '自身耗时(秒)', '累计耗时(秒)'], rows=rows)
+        items = sorted(self._memory_stats.items(), key=lambda item: item[1][0], reverse=True)
+        rows = [[location, '{:.1f}'.format(size_diff / 1024), str(count_diff)]
+                for location, (size_diff, count_diff) in items[:self.top]]
+        return dict(title='性能分析 - 内存分配增长最多的代码行（共{}个用例）'.format(len(self._files)),
+                    columns=['代码行', '增长(KiB)', '增长对象数'], rows=rows)
@@ -7,16 +7,56 @@
 
 import os
 from ..utils.sutils import mkdirs
+from ..utils.screenshot_store import ScreenshotAssetStore
+from .result_formatter import TestCaseWrapper
 from .result_formatter import TestResultFormatter
 from ..report.htmltemplate import HtmlReportTemplate
 from ..report.jenkins_junit_xml_template import JenkinsJunitXMLReportTemplate
 
 
 class ReportBuilder(object):
-    def __init__(self, result, gsettings=None):
+
+    ASSETS_DIR_SUFFIX = "_assets"
+    # 不记录耗时的结果（跳过、阻塞的用例没有真正执行）
+    UNTIMED_RESULT_CODES = (TestCaseWrapper.SKIPED, TestCaseWrapper.BLOCKED)
+
+    def __init__(self, result, gsettings=None, duration_history=None):
+        """
+        Args:
+            result: 测试结果
+            gsettings: 全局配置
+            duration_history: 用例耗时历史记录（see :py:class:`DurationHistory`），提供则html报告中显示最慢用例汇总
+        """
 
         self.result = result
         self.settings = gsettings
+        self.duration_history = duration_history
+        self.formatter = TestResultFormatter(self.result, self.settings)
+        self._result_model = None
+
+    @property
+    def result_model(self):
+        """格式化后的测试结果（see :py:meth:`TestResultFormatter.to_py_json`），只在第一次访问时计算，所有格式的报告共用"""
+
+        if self._result_model is None:
+            self._result_model = self.formatter.to_py_json()
+        return self._result_model
+
+    @property
+    def testpoints(self):
+
+        return self.result_model.get("testpoints")
+
+    def build_report(self, template, filename):
+        """使用报告模板生成报告文件，模板需要提供save_as_file(filename)方法
+
+        Args:
+            template: 报告模板对象，通常以testpoints初始化
+            filename: 报告文件名（完整文件路径名）
+        """
+
+        mkdirs(os.path.dirname(filename))
+        template.save_as_file(filename)
 
     def build_html_report(self, filename, **summary_info):
         """
@@ -34,17 +74,53 @@ class ReportBuilder(object):
                 task_description: 测试任务描述信息
         """
 
-        json_result = TestResultFormatter(self.result, self.settings).to_py_json()
-        testpoints = json_result.get("testpoints")
-        template = HtmlReportTemplate(testpoints, settings=self.settings, **summary_info)
-        mkdirs(os.path.dirname(filename))
-        template.save_as_file(filename)
+        assets = self.screenshot_assets()
+        if assets:
+            # 以独立文件保存的截图复制到报告资源目录（与报告同目录的 <报告名>_assets 目录），报告中以相对路径引用
+            assets_url = os.path.splitext(os.path.basename(filename))[0] + self.ASSETS_DIR_SUFFIX
+            ScreenshotAssetStore.from_settings(self.settings).export_to(
+                os.path.join(os.path.dirname(filename), assets_url), assets)
+            summary_info.setdefault('assets_url', assets_url)
+        profiler = getattr(self.result, 'profiler', None)
+        if profiler is not None:
+            summary_info.setdefault('profile_summary', profiler.summary())
+        if self.duration_history is not None:
+            durations = [(test_id, duration) for test_id, duration, result_code in self.test_durations()]
+            summary_info.setdefault('duration_summary', self.duration_history.slowest_summary(
+                durations, top=getattr(self.settings, "SLOWEST_TESTS_TOP_N", 10)))
+        template = HtmlReportTemplate(self.testpoints, settings=self.settings, **summary_info)
+        self.build_report(template, filename)
+
+    def screenshot_assets(self):
+        """返回报告中以独立文件保存的截图资源名称集合（see :py:class:`ScreenshotAssetStore`）"""
+
+        assets = set()
+        for testpoint in self.testpoints:
+            for testcase in testpoint['testcases']:
+                for one in [testcase['screenshot_info']] + list(testcase['user_screenshots']):
+                    for key in ('asset', 'thumbnail_asset'):
+                        if one.get(key, ''):
+                            assets.add(one[key])
+        return assets
+
+    def test_durations(self):
+        """返回本次执行的用例耗时列表，每个元素是 (用例id, 耗时(秒), 结果代码)，不包括跳过和阻塞的用例"""
+
+        durations = []
+        for tc in self.formatter.testcases:
+            if tc.result_code in self.UNTIMED_RESULT_CODES or not tc.duration:
+                continue
+            durations.append((tc.test.id(), float(tc.duration), tc.result_code))
+        return durations
+
+    def record_durations(self):
+        """把本次执行的用例耗时保存到耗时历史记录"""
+
+        if self.duration_history is not None:
+            self.duration_history.record(self.test_durations())
 
     def build_jenkins_junit_xml_report(self, filename, **summary_info):
 
-        json_result = TestResultFormatter(self.result, self.settings).to_py_json()
-        testpoints = json_result.get("testpoints")
         template = JenkinsJunitXMLReportTemplate(
-            testpoints, test_suite_name=summary_info.get('project_name', 'stest'))
-        mkdirs(os.path.dirname(filename))
-        template.save_as_file(filename)
+            self.testpoints, test_suite_name=summary_info.get('project_name', 'stest'))
+        self.build_report(template, filename)
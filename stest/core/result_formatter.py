@@ -89,6 +89,13 @@ class TestCaseWrapper(AttributeManager):
         k = 'screenshot_info'
         return self._kwargs.get(k, {})
 
+    @property
+    def phase_timings(self):
+        """用例各阶段耗时字典，阶段名称 -> 耗时(秒)，see :py:class:`TestPhase`"""
+
+        k = 'phase_timings'
+        return self._kwargs.get(k, {})
+
     @property
     def user_screenshots(self):
 
@@ -161,6 +168,13 @@ class TestCaseWrapper(AttributeManager):
 
     @property
     def testdatas(self):
+
+        args_mapinfo, kwargs_mapinfo = self._testdatas()
+        return (args_mapinfo, copy.deepcopy(kwargs_mapinfo))
+
+    def _testdatas(self):
+        """返回用例运行时的位置参数和关键字参数信息，关键字参数不做拷贝"""
+
         args_mapinfo = {}
         kwargs_mapinfo = {}
         if self.is_abstract_testcase:
@@ -178,7 +192,7 @@ class TestCaseWrapper(AttributeManager):
                 else:
                     args_mapinfo[index] = (arg_name, arg_value)
 
-            kwargs_mapinfo = copy.deepcopy(kwargs)
+            kwargs_mapinfo = kwargs
 
         return (args_mapinfo, kwargs_mapinfo)
 
@@ -193,7 +207,8 @@ class TestCaseWrapper(AttributeManager):
     @property
     def printable_testdatas(self):
 
-        args_mapinfo, kwargs_mapinfo = self.testdatas
+        # 参数值只用于转为字符串，无需深拷贝
+        args_mapinfo, kwargs_mapinfo = self._testdatas()
         printable_args = {}
         printable_kwargs = {}
         for k, v in args_mapinfo.items():
@@ -228,10 +243,34 @@ class TestCaseWrapper(AttributeManager):
 
 
 class TestResultFormatter(object):
+
+    # 测试结果中各类结果列表的属性名及对应的结果代码，按此顺序编号
+    OUTCOME_RESULT_CODES = (
+        ('errors', TestCaseWrapper.ERROR),
+        ('skipped', TestCaseWrapper.SKIPED),
+        ('failures', TestCaseWrapper.FAILURE),
+        ('successes', TestCaseWrapper.SUCCESS),
+        ('expectedFailures', TestCaseWrapper.XFAILURE),
+        ('unexpectedSuccesses', TestCaseWrapper.XSUCCESS),
+    )
+
+    # 测试点统计字段名及对应的结果代码
+    COUNT_FIELDS = (
+        ('pass_count', TestCaseWrapper.SUCCESS),
+        ('fail_count', TestCaseWrapper.FAILURE),
+        ('error_count', TestCaseWrapper.ERROR),
+        ('block_count', TestCaseWrapper.BLOCKED),
+        ('skip_count', TestCaseWrapper.SKIPED),
+        ('xfail_count', TestCaseWrapper.XFAILURE),
+        ('xpass_count', TestCaseWrapper.XSUCCESS),
+    )
+
     def __init__(self, test_result, settings=None):
 
         self.__test_result = test_result
         self.__settings = settings
+        self.__testcases = None
+        self.__groups = None
 
     @property
     def result(self):
@@ -246,12 +285,16 @@ class TestResultFormatter(object):
         testpoints = []
         for pointname, group_testcases in self._group_by_belong_testpoint():
             results = []
+            counts = dict.fromkeys(TestCaseWrapper.result_codes(), 0)
             for tc in group_testcases:
+                result_code = tc.result_code
+                counts[result_code] += 1
                 result = dict(
-                    result=dict(code=tc.result_code, name=tc.result_name, css_class=tc.css_class),
+                    result=dict(code=result_code, name=tc.result_name, css_class=tc.css_class),
                     id=tc.id,
                     name=tc.name,
                     duration=tc.duration,
+                    phase_timings=tc.phase_timings,
                     method_name=tc.method_name,
                     testdatas=tc.printable_testdatas,
                     number=tc.number,
@@ -263,16 +306,10 @@ class TestResultFormatter(object):
                     user_screenshots=tc.user_screenshots,
                 )
                 results.append(result)
-            testpoint = dict(name=pointname,
-                             count=len(group_testcases),
-                             pass_count=self.counts(group_testcases, TestCaseWrapper.SUCCESS),
-                             fail_count=self.counts(group_testcases, TestCaseWrapper.FAILURE),
-                             error_count=self.counts(group_testcases, TestCaseWrapper.ERROR),
-                             block_count=self.counts(group_testcases, TestCaseWrapper.BLOCKED),
-                             skip_count=self.counts(group_testcases, TestCaseWrapper.SKIPED),
-                             xfail_count=self.counts(group_testcases, TestCaseWrapper.XFAILURE),
-                             xpass_count=self.counts(group_testcases, TestCaseWrapper.XSUCCESS),
-                             testcases=results)
+            testpoint = dict(name=pointname, count=len(group_testcases))
+            for field, result_code in self.COUNT_FIELDS:
+                testpoint[field] = counts[result_code]
+            testpoint['testcases'] = results
             testpoints.append(testpoint)
         root = dict(project=self._get_belong_project(), testpoints=testpoints)
         return root
@@ -283,60 +320,51 @@ class TestResultFormatter(object):
 
     @property
     def testcases(self):
+        """按执行顺序排列的用例包装对象列表，只在第一次访问时构建"""
 
+        if self.__testcases is not None:
+            return self.__testcases
         testcaselist = []
         id = 1
-        for test, message in self.result.errors:
-            testcaselist.append(TestCaseWrapper(test, id, TestCaseWrapper.ERROR,
-                                message=message, screenshot_info=self.result.screenshots.get(test, {}), user_screenshots=getattr(self.__settings, "USER_SCREENSHOTS", {}).get(test, [])))
-            id = id + 1
-        for test, message in self.result.skipped:
-            testcaselist.append(TestCaseWrapper(test, id, TestCaseWrapper.SKIPED,
-                                message=message, screenshot_info=self.result.screenshots.get(test, {}), user_screenshots=getattr(self.__settings, "USER_SCREENSHOTS", {}).get(test, [])))
-            id = id + 1
-
-        for test, message in self.result.failures:
-            testcaselist.append(TestCaseWrapper(test, id, TestCaseWrapper.FAILURE,
-                                message=message, screenshot_info=self.result.screenshots.get(test, {}), user_screenshots=getattr(self.__settings, "USER_SCREENSHOTS", {}).get(test, [])))
-            id = id + 1
-
-        for test, message in self.result.successes:
-            testcaselist.append(TestCaseWrapper(test, id, TestCaseWrapper.SUCCESS, message=(
-                message,), screenshot_info=self.result.screenshots.get(test, {}), user_screenshots=getattr(self.__settings, "USER_SCREENSHOTS", {}).get(test, [])))
-            id = id + 1
-
-        for test, message in self.result.expectedFailures:
-            testcaselist.append(TestCaseWrapper(test, id, TestCaseWrapper.XFAILURE,
-                                message=message, screenshot_info=self.result.screenshots.get(test, {}), user_screenshots=getattr(self.__settings, "USER_SCREENSHOTS", {}).get(test, [])))
-            id = id + 1
-
-        for test in self.result.unexpectedSuccesses:
-            testcaselist.append(TestCaseWrapper(test, id, TestCaseWrapper.XSUCCESS,
-                                screenshot_info=self.result.screenshots.get(test, {}), user_screenshots=getattr(self.__settings, "USER_SCREENSHOTS", {}).get(test, [])))
-            id = id + 1
+        screenshots = self.result.screenshots
+        user_screenshots = getattr(self.__settings, "USER_SCREENSHOTS", {})
+        get_phase_timings = getattr(self.result, 'get_phase_timings', lambda test: {})
+        for outcome, result_code in self.OUTCOME_RESULT_CODES:
+            for entry in getattr(self.result, outcome):
+                if outcome == 'unexpectedSuccesses':
+                    test, kwargs = entry, {}
+                elif outcome == 'successes':
+                    test, message = entry
+                    kwargs = dict(message=(message,))
+                else:
+                    test, message = entry
+                    kwargs = dict(message=message)
+                testcaselist.append(TestCaseWrapper(test, id, result_code, screenshot_info=screenshots.get(
+                    test, {}), user_screenshots=user_screenshots.get(test, []), phase_timings=get_phase_timings(test), **kwargs))
+                id = id + 1
         testcaselist.sort(key=lambda one: one.exec_number)
+        self.__testcases = testcaselist
         return testcaselist
 
     def _get_testpoints(self):
 
-        testpoints = []
-        for testcase in self.testcases:
-            testpoint = testcase.testpoint
-            clsname = testpoint[0]
-            if clsname not in [tp[0] for tp in testpoints]:
-                testpoints.append(testpoint)
-        return testpoints
+        return [testpoint for testpoint, group_testcases in self._group_by_belong_testpoint()]
 
     def _group_by_belong_testpoint(self):
-
-        groups = []
-        for testpoint in self._get_testpoints():
-            group_testcases = []
-            for test in self.testcases:
-                if testpoint[0] == test.testpoint[0]:
-                    group_testcases.append(test)
-            groups.append((testpoint, group_testcases))
-        return groups
+        """按用例所属的测试点（测试类）分组，一次遍历完成，测试点按其第一个用例的执行顺序排列"""
+
+        if self.__groups is not None:
+            return self.__groups
+        groups = {}
+        for test in self.testcases:
+            testpoint = test.testpoint
+            group = groups.get(testpoint[0], None)
+            if group is None:
+                groups[testpoint[0]] = (testpoint, [test])
+            else:
+                group[1].append(test)
+        self.__groups = list(groups.values())
+        return self.__groups
 
     @classmethod
     def counts(cls, testcases, result_code):
@@ -5,10 +5,14 @@
 '''
 
 import os
+import pickle
+import hashlib
+import tempfile
+import threading
+from ..conf import settings
 from ..utils import sutils
 from ..utils.attrs_marker import Const
 from .abstract_data_provider import AbsractDataProvider
-from ..utils.excel_file_reader import TestCaseExcelFileReader as ExcelReader
 
 
 class SevenDataProvider(AbsractDataProvider):
@@ -24,6 +28,18 @@ class SevenDataProvider(AbsractDataProvider):
     KWARGS_NAMES = Const((PARAM_DATA_FILE_NAME, PARAM_DATA_FILE_DIR_PATH,
                          PARAM_SHEET_NAME_OR_INDEX), "接收的参数名")
 
+    # 进程内的工作簿解析缓存，同一个数据文件只解析一次，供所有测试方法使用，文件修改后自动重新解析
+    # (文件绝对路径, 工作表索引或名称, 用例分隔标记) -> (文件修改时间, {用例名称: 测试数据列表})
+    _workbook_cache = {}
+    _workbook_cache_lock = threading.Lock()
+
+    DATA_CACHE_DIR_NAME = Const("__stestcache__", "未配置缓存目录时，数据文件所在目录下存放编译缓存文件的目录名")
+    DATA_CACHE_FILE_EXT = Const(".pickle", "编译缓存文件拓展名")
+    DATA_CACHE_FORMAT_VERSION = Const(1, "编译缓存文件格式版本，格式变化时递增使旧的缓存失效")
+
+    # 为True时忽略已有的编译缓存文件，每个数据文件在本进程内重新解析一次并重写缓存，see SevenTestProgram 的 --rebuild-data-cache 参数
+    rebuild_data_cache = False
+
     def _get_data_file_name(self, kwargs, default_value=None):
 
         param = self.PARAM_DATA_FILE_NAME
@@ -75,25 +91,121 @@ class SevenDataProvider(AbsractDataProvider):
                 sheet_index_or_name Excel工作表索引(从0开始)或名称,不提供则默认取索引0的工作表
         """
 
-        datasets = []
-
         filename = self._get_data_file_name(kwargs, test_class_name)
         dirpath = self._get_data_file_dir_path(kwargs)
         full_file_path = self._build_file_full_path(dirpath, filename)
 
+        testdatas_index = self.load_testdatas_index(full_file_path, self._get_sheet_name_or_index(kwargs))
+        return [dict(line) for line in testdatas_index.get(test_method_name, [])]
+
+    def _parse_testdatas_index(self, full_file_path, sheet_name_or_index):
+        """解析整个数据文件，返回用例名称到测试数据列表的映射，同名用例只取第一个"""
+
+        # 延迟导入，编译缓存有效时无需加载excel解析库
+        from ..utils.excel_file_reader import TestCaseExcelFileReader as ExcelReader
+
+        testdatas_index = {}
         reader = ExcelReader(full_file_path, testcase_block_separators=self.BLOCK_FLAG,
-                             sheet_index_or_name=self._get_sheet_name_or_index(kwargs))
-        datas_blocks = reader.load_testcase_data()
-        for block in datas_blocks:
-            if block.name == test_method_name:
-                for row in block.datas:
-                    line = {}
-                    for cell in row:
-                        for title, value in cell.items():
-                            if title in line.keys():
-                                continue
-                            else:
-                                line[title] = value
-                    datasets.append(line)
-                break
-        return datasets
+                             sheet_index_or_name=sheet_name_or_index)
+        for block in reader.iter_testcase_data():
+            if block.name in testdatas_index:
+                continue
+            datasets = []
+            for row in block.datas:
+                line = {}
+                for cell in row:
+                    for title, value in cell.items():
+                        if title in line.keys():
+                            continue
+                        else:
+                            line[title] = value
+                datasets.append(line)
+            testdatas_index[block.name] = datasets
+        return testdatas_index
+
+    def _get_data_cache_file_path(self, full_file_path, sheet_name_or_index):
+        """返回数据文件对应的编译缓存文件路径，配置了SEVEN_DATA_PROVIDER_DATA_CACHE_DIR则存放在该目录，否则存放在数据文件所在目录下的__stestcache__目录"""
+
+        cache_dir = getattr(settings, "SEVEN_DATA_PROVIDER_DATA_CACHE_DIR", None)
+        if not cache_dir:
+            cache_dir = os.path.join(os.path.dirname(full_file_path), self.DATA_CACHE_DIR_NAME)
+        key = repr((full_file_path, sheet_name_or_index, self.BLOCK_FLAG)).encode("utf-8")
+        digest = hashlib.sha1(key).hexdigest()[:16]
+        filename = "{}.{}{}".format(os.path.basename(full_file_path), digest, self.DATA_CACHE_FILE_EXT)
+        return os.path.join(cache_dir, filename)
+
+    def _load_data_cache(self, cache_file_path, stat):
+        """读取编译缓存，缓存不存在、已损坏或数据文件已修改则返回None"""
+
+        try:
+            with open(cache_file_path, "rb") as f:
+                cached = pickle.load(f)
+        except Exception:
+            return None
+        if not isinstance(cached, dict):
+            return None
+        if cached.get("version") != self.DATA_CACHE_FORMAT_VERSION:
+            return None
+        if cached.get("mtime") != stat.st_mtime_ns or cached.get("size") != stat.st_size:
+            return None
+        return cached.get("testdatas_index", None)
+
+    def _dump_data_cache(self, cache_file_path, stat, testdatas_index):
+        """写入编译缓存，先写临时文件再替换，写入失败（例如目录只读）不影响测试数据的读取"""
+
+        cached = dict(version=self.DATA_CACHE_FORMAT_VERSION, mtime=stat.st_mtime_ns, size=stat.st_size, testdatas_index=testdatas_index)
+        cache_dir = os.path.dirname(cache_file_path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".tmp", suffix=self.DATA_CACHE_FILE_EXT, dir=cache_dir)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_file_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError:
+            pass
+
+    def _compile_testdatas_index(self, full_file_path, sheet_name_or_index, stat):
+        """获取数据文件的测试数据索引，启用了编译缓存(SEVEN_DATA_PROVIDER_DATA_CACHE)时优先读取缓存文件，缓存无效才解析数据文件并重写缓存"""
+
+        if not getattr(settings, "SEVEN_DATA_PROVIDER_DATA_CACHE", False):
+            return self._parse_testdatas_index(full_file_path, sheet_name_or_index)
+        cache_file_path = self._get_data_cache_file_path(full_file_path, sheet_name_or_index)
+        if not self.rebuild_data_cache:
+            testdatas_index = self._load_data_cache(cache_file_path, stat)
+            if testdatas_index is not None:
+                return testdatas_index
+        testdatas_index = self._parse_testdatas_index(full_file_path, sheet_name_or_index)
+        self._dump_data_cache(cache_file_path, stat, testdatas_index)
+        return testdatas_index
+
+    def load_testdatas_index(self, full_file_path, sheet_name_or_index=0):
+        """获取数据文件中用例名称到测试数据列表的映射，优先从进程内缓存中获取，其次从编译缓存文件中获取，文件修改后重新解析
+
+        Args:
+            full_file_path: 数据文件完整路径
+            sheet_name_or_index: 工作表索引(从0开始)或名称
+        """
+
+        path = os.path.abspath(full_file_path)
+        stat = os.stat(path)
+        mtime = stat.st_mtime_ns
+        key = (path, sheet_name_or_index, self.BLOCK_FLAG)
+        with self._workbook_cache_lock:
+            cached = self._workbook_cache.get(key, None)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        testdatas_index = self._compile_testdatas_index(path, sheet_name_or_index, stat)
+        with self._workbook_cache_lock:
+            self._workbook_cache[key] = (mtime, testdatas_index)
+        return testdatas_index
+
+    @classmethod
+    def clear_cache(cls):
+        """清空进程内的工作簿解析缓存"""
+
+        with cls._workbook_cache_lock:
+            cls._workbook_cache.clear()
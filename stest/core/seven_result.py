@@ -13,17 +13,65 @@ from unittest.runner import TextTestResult
 from ..fixed_field import FixedField
 from ..conf import settings
 from .test_wrapper import Test
+from .phase_timing import TestPhase
+from .phase_timing import get_phase_timings
+from ..utils.sutils import strclass
 from ..utils.screenshot_capturer import ScreenshotCapturer
+from ..utils.screenshot_store import ScreenshotAssetStore
+from ..utils.screenshot_encoder import ScreenshotEncoder
+from ..utils.screenshot_queue import ScreenshotQueue
 from ..hook import host
 from ..hook import RunStage
 
 
 class SevenTestResult(TextTestResult):
+
+    # 记录用例结果的列表属性名
+    OUTCOME_KINDS = ('errors', 'skipped', 'failures', 'successes', 'expectedFailures', 'unexpectedSuccesses')
+
+    # 合并结果时在控制台输出的状态信息: (verbosity > 1 时的输出, verbosity == 1 时的输出)
+    OUTCOME_STATUS = {
+        'errors': ('ERROR', 'E'),
+        'skipped': ('skipped', 's'),
+        'failures': ('FAIL', 'F'),
+        'successes': ('ok', '.'),
+        'expectedFailures': ('expected failure', 'x'),
+        'unexpectedSuccesses': ('unexpected success', 'u'),
+    }
+
     def __init__(self, stream, descriptions, verbosity, depend_manager=None):
         super().__init__(stream, descriptions, verbosity)
         self.successes = []
-        self.screenshots = {}  # 存放测试失败截图的base64数据
+        self.screenshots = {}  # 存放测试失败截图的base64数据或截图资源名称
+        self.screenshot_queue = ScreenshotQueue()  # 截图后台处理队列
         self.depend_manager = depend_manager
+        self.outcome_index = {}  # 用例id -> {结果类型: 结果信息}，用于按用例id快速查找用例结果
+        self.class_phase_timings = {}  # 测试类名 -> {阶段名称: 耗时(秒)}，记录setUpClass、tearDownClass的耗时
+        self.profiler = None  # 用例性能分析器（see :py:class:`TestProfiler`），启用性能分析时由运行器设置
+
+    def record_class_phase(self, testclass, phase, seconds):
+        """累加测试类某个阶段（setUpClass、tearDownClass）的耗时
+
+        Args:
+            testclass: 测试类
+            phase: 阶段名称，see :py:class:`TestPhase`
+            seconds: 耗时(秒)
+        """
+
+        timings = self.class_phase_timings.setdefault(strclass(testclass), {})
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+    def get_phase_timings(self, test):
+        """返回用例各阶段的耗时字典，阶段名称 -> 耗时(秒)，按执行顺序排列，包含用例所在测试类的setUpClass、tearDownClass耗时，see :py:class:`TestPhase`"""
+
+        timings = dict(self.class_phase_timings.get(strclass(test.__class__), {}))
+        timings.update(get_phase_timings(test))
+        return {phase: timings[phase] for phase in TestPhase.phases() if phase in timings}
+
+    def _index_outcome(self, test, kind, message=''):
+        """记录用例结果到索引中，同一用例同一结果类型只记录第一次的结果信息"""
+
+        self.outcome_index.setdefault(test.id(), {}).setdefault(kind, message)
 
     def _screenshot(self, test):
 
@@ -40,17 +88,32 @@ class SevenTestResult(TextTestResult):
             settings, Test.ATTACH_SCREENSHOT_TO_REPORT.upper(), False))
         capturerclass = ScreenshotCapturer
         if screenshot:
-            message = ''
+            info = {Test.SCREENSHOT: screenshot, Test.ATTACH_SCREENSHOT_TO_REPORT: attach,
+                    'result': False, 'base64data': '', 'asset': '', 'message': ''}
+            self.screenshots[test] = info
             try:
-                data = capturerclass().screenshot_as_base64(driver)
+                grabbed = capturerclass.grab(driver)
             except Exception:
-                success = False
-                message = traceback.format_exc()
-                data = ''
+                info['message'] = traceback.format_exc()
+                return
+            as_asset = attach and ScreenshotAssetStore.is_enabled(settings)
+            if getattr(settings, 'SCREENSHOT_ASYNC', True):
+                # 截图立即完成，编码和保存交给后台线程，stopTestRun时等待全部完成
+                self.screenshot_queue.submit(self._process_screenshot, info, grabbed, as_asset)
             else:
-                success = True
-            self.screenshots[test] = {Test.SCREENSHOT: screenshot, Test.ATTACH_SCREENSHOT_TO_REPORT: attach,
-                                      'result': success, 'base64data': data, 'message': message}
+                self._process_screenshot(info, grabbed, as_asset)
+
+    def _process_screenshot(self, info, grabbed, as_asset):
+        """按配置编码截图（see :py:class:`ScreenshotEncoder`）并把结果写入截图信息字典，as_asset为真则截图保存为文件（see :py:class:`ScreenshotAssetStore`）"""
+
+        try:
+            # 截图保存为文件时内存中只保留资源名称，生成报告时再复制到报告资源目录
+            store = ScreenshotAssetStore.from_settings(settings) if as_asset else None
+            info.update(ScreenshotEncoder.from_settings(settings).to_report_info(grabbed, store))
+        except Exception:
+            info['message'] = traceback.format_exc()
+        else:
+            info['result'] = True
 
     @host(RunStage.startTestRun)
     def startTestRun(self) -> None:
@@ -62,11 +125,16 @@ class SevenTestResult(TextTestResult):
         scounter = time.perf_counter()
         setattr(test, FixedField.STEST_START_PERF_COUNTER, scounter)
         setattr(test, FixedField.STEST_TESTCASE_START_TIME, starttime)
-        return super().startTest(test)
+        rv = super().startTest(test)
+        if self.profiler is not None:
+            self.profiler.start(test)
+        return rv
 
     @host(RunStage.stopTest)
     def stopTest(self, test):
 
+        if self.profiler is not None:
+            self.profiler.stop(test)
         rv = super().stopTest(test)
         fcounter = time.perf_counter()
         setattr(test, FixedField.STEST_FINISH_PERF_COUNTER, fcounter)
@@ -74,38 +142,47 @@ class SevenTestResult(TextTestResult):
 
     @host(RunStage.stopTestRun)
     def stopTestRun(self) -> None:
+        self.screenshot_queue.drain()
         return super().stopTestRun()
 
     @host(RunStage.addSuccess)
     def addSuccess(self, test):
         return_value = super().addSuccess(test)
         self.successes.append((test, self._get_output_message()))
+        self._index_outcome(test, 'successes', self.successes[-1][1])
         self._mirrorOutput = True
         return return_value
 
     @host(RunStage.addError)
     def addError(self, test, err):
         rv = super().addError(test, err)
+        self._index_outcome(test, 'errors', self.errors[-1][1])
         self._screenshot(test)
         return rv
 
     @host(RunStage.addFailure)
     def addFailure(self, test, err):
         rv = super().addFailure(test, err)
+        self._index_outcome(test, 'failures', self.failures[-1][1])
         self._screenshot(test)
         return rv
 
     @host(RunStage.addSkip)
     def addSkip(self, test, reason):
-        return super().addSkip(test, reason)
+        rv = super().addSkip(test, reason)
+        self._index_outcome(test, 'skipped', reason)
+        return rv
 
     @host(RunStage.addExpectedFailure)
     def addExpectedFailure(self, test, err):
-        return super().addExpectedFailure(test, err)
+        rv = super().addExpectedFailure(test, err)
+        self._index_outcome(test, 'expectedFailures', self.expectedFailures[-1][1])
+        return rv
 
     @host(RunStage.addUnexpectedSuccess)
     def addUnexpectedSuccess(self, test):
         rv = super().addUnexpectedSuccess(test)
+        self._index_outcome(test, 'unexpectedSuccesses')
         self._screenshot(test)
         return rv
 
@@ -117,6 +194,35 @@ class SevenTestResult(TextTestResult):
         else:
             return str(test)
 
+    def merge_outcome(self, test, kind, message=''):
+        """合并在其它地方（如子进程）执行的用例结果，不会触发钩子
+
+        Parameters
+        ----------
+        test : 测试用例
+        kind : 结果类型，见OUTCOME_KINDS
+        message : 结果信息（已格式化的字符串）
+        """
+
+        if kind not in self.OUTCOME_KINDS:
+            raise ValueError('The value range of kind is: {}'.format(' | '.join(self.OUTCOME_KINDS)))
+        if kind == 'unexpectedSuccesses':
+            self.unexpectedSuccesses.append(test)
+        else:
+            getattr(self, kind).append((test, message))
+        self._index_outcome(test, kind, message)
+        if kind in ('errors', 'failures', 'unexpectedSuccesses') and self.failfast:
+            self.stop()
+        word, char = self.OUTCOME_STATUS[kind]
+        if self.showAll:
+            if kind == 'skipped':
+                word = '{} {!r}'.format(word, message)
+            self.stream.writeln('{} ... {}'.format(self.getDescription(test), word))
+            self.stream.flush()
+        elif self.dots:
+            self.stream.write(char)
+            self.stream.flush()
+
     def mark_test_failure(self, testcase, err):
         """用例所依赖的其它用例没有成功，则标记该用例
 
@@ -4,26 +4,32 @@
 @Author: 思文伟
 @Date: 2021/09/17
 '''
-from unittest.suite import TestSuite
 from unittest.runner import TextTestRunner
 from ..fixed_field import FixedField
 from .depends import DependsManager
 from .seven_result import SevenTestResult
+from .seven_suite import SevenTestSuite
+from .parallel_runner import ParallelSuite
 
 
 class SevenTestRunner(TextTestRunner):
 
     resultclass = SevenTestResult
 
-    def __init__(self, stream=None, descriptions=True, verbosity=1, failfast=False, buffer=False, resultclass=None, warnings=None, *, tb_locals=False, depend_manager=None):
+    def __init__(self, stream=None, descriptions=True, verbosity=1, failfast=False, buffer=False, resultclass=None, warnings=None, *, tb_locals=False, depend_manager=None, workers=1, profiler=None, durations=None):
         super().__init__(stream=stream, descriptions=descriptions, verbosity=verbosity, failfast=failfast,
                          buffer=buffer, resultclass=resultclass, warnings=warnings, tb_locals=tb_locals)
         self.depend_manager = DependsManager() if depend_manager is None else depend_manager
+        self.workers = workers if isinstance(workers, int) and workers > 0 else 1
+        self.profiler = profiler
+        # 用例的历史耗时（用例id -> 耗时(秒)），并行执行时按耗时从长到短调度
+        self.durations = durations
 
     def _makeResult(self):
         results = super()._makeResult()
         self.depend_manager.results = results
         results.depend_manager = self.depend_manager
+        results.profiler = self.profiler
         return results
 
     def run(self, test):
@@ -55,6 +61,14 @@ class SevenTestRunner(TextTestRunner):
 
         testlist = all_in_one(test)
         self.depend_manager.tests = testlist
-        suite = self.depend_manager.sorted_tests(suiteclass=TestSuite)
+        suite = self.depend_manager.sorted_tests(suiteclass=SevenTestSuite)
         set_exec_number_to_testcase(suite)
-        return super().run(suite)
+        if self.workers > 1:
+            options = dict(verbosity=self.verbosity, failfast=self.failfast, buffer=self.buffer, tb_locals=self.tb_locals,
+                           profile=self.profiler.options() if self.profiler is not None else None)
+            suite = ParallelSuite(suite, self.depend_manager, self.workers, options, durations=self.durations)
+        try:
+            return super().run(suite)
+        finally:
+            if self.profiler is not None:
+                self.profiler.close()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+import time
+from unittest.suite import TestSuite
+from .phase_timing import TestPhase
+
+
+class SevenTestSuite(TestSuite):
+    """测试套件，记录测试类setUpClass和tearDownClass的耗时到测试结果（see :py:meth:`SevenTestResult.record_class_phase`）"""
+
+    def _record_class_phase(self, result, testclass, phase, seconds):
+
+        record = getattr(result, 'record_class_phase', None)
+        if record is not None:
+            record(testclass, phase, seconds)
+
+    def _handleClassSetUp(self, test, result):
+
+        previous_class = getattr(result, '_previousTestClass', None)
+        start = time.perf_counter()
+        try:
+            return super()._handleClassSetUp(test, result)
+        finally:
+            # 与上一个用例属于同一个测试类时不会执行setUpClass
+            if test.__class__ != previous_class:
+                self._record_class_phase(result, test.__class__, TestPhase.SET_UP_CLASS, time.perf_counter() - start)
+
+    def _tearDownPreviousClass(self, test, result):
+
+        previous_class = getattr(result, '_previousTestClass', None)
+        start = time.perf_counter()
+        try:
+            return super()._tearDownPreviousClass(test, result)
+        finally:
+            if previous_class is not None and test.__class__ != previous_class:
+                self._record_class_phase(result, previous_class, TestPhase.TEAR_DOWN_CLASS, time.perf_counter() - start)
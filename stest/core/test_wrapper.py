@@ -12,6 +12,7 @@ import collections.abc as collections
 
 from stest.core.errors import StestDeprecationWarning
 from ..conf import settings as SETTINGS
+from .lazy_datasets import LazyDatasets
 from .abstract_data_provider import AbsractDataProvider
 from .seven_data_provider import SevenDataProvider
 
@@ -237,7 +238,7 @@ class Test(object):
         Args:
             testclass: 被装饰的测试方法所在的测试类
             testmethod: 被装饰的测试方法
-        Returns: 返回测试数据集，一个列表，每一个元素是该测试方法每次运行的测试数据
+        Returns: 返回测试数据集，一个列表（数据提供者返回迭代器或生成器时为惰性数据集LazyDatasets），每一个元素是该测试方法每次运行的测试数据
         """
 
         self.settings[self.TEST_CLASS] = testclass
@@ -285,10 +286,13 @@ class Test(object):
             raise TypeError('无效data_provider: {}'.format(data_provider))
 
         if not self._validate_datesets(datasets):
-            # 返回的数据集必须是列表或者元祖类型, 实际返回的类型是
-            raise TypeError('{}The returned data set must be a list or tuple type. The actual returned type is: {}'.format(
+            # 返回的数据集必须是列表、元祖、迭代器（生成器）或者LazyDatasets类型, 实际返回的类型是
+            raise TypeError('{}The returned data set must be a list, tuple, iterator or LazyDatasets type. The actual returned type is: {}'.format(
                 data_provider, type(datasets)))
 
+        # 迭代器（生成器）包装为惰性数据集，用例执行时才逐条读取测试数据
+        if isinstance(datasets, collections.Iterator):
+            datasets = LazyDatasets(datasets)
         self.settings[self.TEST_DATASETS] = datasets
         return datasets
 
@@ -298,7 +302,7 @@ class Test(object):
 
     def _validate_datesets(self, datasets):
 
-        return isinstance(datasets, (list, tuple))
+        return isinstance(datasets, (list, tuple, LazyDatasets, collections.Iterator))
 
     # def test_datasets_filedir_path(self, module='__main__'):
 
@@ -437,11 +441,13 @@ class Test(object):
         msg = ""
         if test_method_instance:
             sn = test_method_instance._serial_number
-            for i, v in enumerate(test_datasets):
-                if (i + 1) == sn:
-                    runtime_datas = v
+            # 按序号直接取数据，惰性数据集(LazyDatasets)只会读取到该序号为止的数据
+            if sn >= 1:
+                try:
+                    runtime_datas = test_datasets[sn - 1]
                     found = True
-                    break
+                except IndexError:
+                    pass
             if not found:
                 msg = 'The parameterized test data for this method({}) was not found'.format(
                     test_method_instance.id())
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+import copy
+import base64
+import asyncio
+from typing import List
+from typing import Optional
+from stest import settings
+from stest.core.errors import NoOpendPageError
+from stest.core.errors import NoOpendContextError
+from stest.core.errors import NoOpendBrowserError
+from playwright.async_api import Page
+from playwright.async_api import Browser
+from playwright.async_api import Playwright
+from playwright.async_api import BrowserContext
+from playwright.async_api import async_playwright
+from .playwright_driver import PlaywrightDriver
+from .playwright_driver import SupportBrowserType
+
+
+class AsyncPlaywrightDriver(object):
+    """基于 playwright.async_api 的异步驱动
+
+    与 :py:class:`PlaywrightDriver` 用法一样，但所有打开、关闭浏览器和页面的方法都是协程，需要在异步用例（async def）中await调用。
+    一个驱动（一个浏览器）中可以同时打开多个页面并发操作（see :py:meth:`new_pages`），适用于同一个用例需要访问大量页面的场景。
+
+    异步的playwright实例只能在创建它的事件循环中使用，因此按事件循环保存在全局配置中，同一事件循环（同一线程）的所有异步驱动共用，
+    测试运行结束时（stopTestRun阶段）自动停止。
+    异步驱动不放入驱动管理器（DRIVER_MANAGER）中，由页面或者用例自行持有并负责退出（see :py:meth:`quit`）。
+    """
+
+    PLAYWRIGHT = "async_playwright"
+    DEFAULT_BROWSER_LAUNCH_ARGS = PlaywrightDriver.DEFAULT_BROWSER_LAUNCH_ARGS
+    DEFAULT_BROWSER_CONTEXT_ARGS = PlaywrightDriver.DEFAULT_BROWSER_CONTEXT_ARGS
+
+    def __init__(self, playwright: Optional[Playwright] = None):
+        """
+        Args:
+            playwright: 异步的playwright实例，省略则在启动时（see :py:meth:`start`）使用全局配置中的实例，没有则自动创建
+        """
+
+        self.playwright = playwright
+        self.browser_launch_args = copy.deepcopy(self.DEFAULT_BROWSER_LAUNCH_ARGS)
+        self.browser_context_args = copy.deepcopy(self.DEFAULT_BROWSER_CONTEXT_ARGS)
+
+        self.__page: Optional[Page] = None
+        self.__context: Optional[BrowserContext] = None
+        self.__browser: Optional[Browser] = None
+        self.__browsers: List[Browser] = []
+
+    @classmethod
+    def playwrights(cls, gsettings=settings):
+        """返回全局配置中保存的异步playwright实例，事件循环 -> playwright实例"""
+
+        pws = getattr(gsettings, cls.PLAYWRIGHT, None)
+        if not isinstance(pws, dict):
+            pws = {}
+            setattr(gsettings, cls.PLAYWRIGHT, pws)
+        return pws
+
+    async def start(self):
+        """启动（或者获取全局配置中当前事件循环的）异步playwright实例，返回驱动本身"""
+
+        if self.playwright is None:
+            pws = self.playwrights()
+            loop = asyncio.get_running_loop()
+            pw = pws.get(loop, None)
+            if pw is None:
+                pw = await async_playwright().start()
+                pws[loop] = pw
+            self.playwright = pw
+        return self
+
+    @classmethod
+    def stop_playwrights(cls, gsettings=settings):
+        """停止全局配置中所有的异步playwright实例，需要在事件循环之外调用，正在运行或者已关闭的事件循环中的实例跳过"""
+
+        pws = cls.playwrights(gsettings)
+        items = list(pws.items())
+        pws.clear()
+        for loop, pw in items:
+            if loop.is_closed() or loop.is_running():
+                continue
+            try:
+                loop.run_until_complete(pw.stop())
+            except Exception:
+                pass
+
+    @property
+    def browsers(self):
+
+        return self.__browsers
+
+    @property
+    def browser(self):
+        """current browser"""
+
+        if self.__browser is None:
+            raise NoOpendBrowserError("No any opened browser")
+        return self.__browser
+
+    @browser.setter
+    def browser(self, v: Browser):
+
+        self.__browser = v
+        if v is not None and v not in self.__browsers:
+            self.__browsers.append(v)
+
+    @property
+    def context(self):
+        """current browser context"""
+
+        if self.__context is None:
+            raise NoOpendContextError("No any opened context of browser")
+        return self.__context
+
+    @context.setter
+    def context(self, v: BrowserContext):
+
+        self.__context = v
+        if v is not None:
+            self.browser = v.browser
+
+    @property
+    def page(self):
+        """current page"""
+
+        if self.__page is None:
+            raise NoOpendPageError("No any opened page")
+        return self.__page
+
+    @page.setter
+    def page(self, v: Page):
+
+        self.__page = v
+        if v is not None:
+            self.context = v.context
+
+    def has_opened_page(self):
+        return self.__page is not None
+
+    def has_opened_context(self):
+        return self.__context is not None
+
+    def has_opened_browser(self):
+
+        return self.__browser is not None and self.__browser.is_connected()
+
+    def set_browser_launch_args(self, headless=False, channel=None, slow_mo=0, **kwargs):
+        """set default browser launch args, refer to the `PlaywrightDriver.set_browser_launch_args`"""
+
+        self.browser_launch_args.update(dict(headless=headless, channel=channel, slow_mo=slow_mo))
+        self.browser_launch_args.update(kwargs)
+        return self
+
+    def set_browser_context_args(self, device=None, **kwargs):
+        """set default browser context args, refer to the `PlaywrightDriver.set_browser_context_args`"""
+
+        self.browser_context_args.update(kwargs)
+        if device:
+            self.browser_context_args.update(self.playwright.devices[device])
+        return self
+
+    async def launch_browser(self, browser_type=SupportBrowserType.CHROMIUM, browser_launch_args={}):
+        """only open browser, itself context and page is not opened
+
+        Parameters
+        ----------
+        browser_type : playwright support browser type, `chromium` | `firefox` | `webkit`, Defaults to `chromium`
+        browser_launch_args : refer to the `BrowserType.launch`
+        """
+
+        await self.start()
+        final_browser_kwargs = copy.deepcopy(self.browser_launch_args)
+        final_browser_kwargs.update(browser_launch_args)
+        self.browser = await getattr(self.playwright, browser_type).launch(**final_browser_kwargs)
+        return self
+
+    async def open_context(self, **browser_context_args):
+        """refer to the `Browser.new_context`"""
+
+        final_context_kwargs = copy.deepcopy(self.browser_context_args)
+        final_context_kwargs.update(browser_context_args)
+        self.context = await self.browser.new_context(**final_context_kwargs)
+        return self
+
+    async def open_page(self, **browser_context_args):
+        """打开新页面并设置为当前页面，browser_context_args传参，则会创建新的上下文，并在此打开新页面
+
+        Parameters
+        ----------
+        browser_context_args: refer to the `Browser.new_context`
+        """
+
+        if browser_context_args or not self.has_opened_context():
+            await self.open_context(**browser_context_args)
+        self.page = await self.context.new_page()
+        return self
+
+    async def open_browser(self, browser_type=SupportBrowserType.CHROMIUM, browser_launch_args={}, browser_context_args={}):
+        """ open a new browser，then open its new context and new page. default open chromium browser.
+
+        Args
+        -------
+        browser_type : str  default value is `chromium`
+            chromium | firefox | webkit
+        browser_launch_args : dict
+            refer to the `BrowserType.launch`
+        browser_context_args : dict
+            refer to the `Browser.new_context`
+        """
+
+        if not self.has_opened_browser():
+            await self.launch_browser(browser_type=browser_type, browser_launch_args=browser_launch_args)
+            await self.open_page(**browser_context_args)
+        return self
+
+    async def new_page(self) -> Page:
+        """在当前上下文中打开新页面并返回该页面，不改变当前页面，没有打开的上下文则先创建上下文
+
+        多个协程同时调用时各自得到独立的页面，可以并发操作
+        """
+
+        if not self.has_opened_context():
+            await self.open_context()
+        return await self.context.new_page()
+
+    async def new_pages(self, count) -> List[Page]:
+        """在当前上下文中并发打开count个新页面并返回页面列表，不改变当前页面"""
+
+        if not self.has_opened_context():
+            await self.open_context()
+        return list(await asyncio.gather(*(self.context.new_page() for _ in range(count))))
+
+    async def get(self, url, **kwargs):
+
+        if not self.has_opened_page():
+            await self.open_page()
+        return await self.page.goto(url, **kwargs)
+
+    async def screenshot(self, **kwargs):
+        """refer to the Page.screenshot"""
+
+        return await self.page.screenshot(**kwargs)
+
+    async def get_screenshot_as_base64(self):
+
+        raw_data = await self.screenshot()
+        return base64.b64encode(raw_data).decode()
+
+    async def close(self):
+        """关闭当前页面"""
+
+        page = self.__page
+        self.__page = None
+        if page is not None:
+            await page.close()
+
+    async def quit(self):
+        """关闭驱动打开的所有浏览器"""
+
+        browsers = list(self.__browsers)
+        self.__browsers.clear()
+        self.__page = None
+        self.__context = None
+        self.__browser = None
+        for one in browsers:
+            await one.close()
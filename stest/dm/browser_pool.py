@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+
+import atexit
+import threading
+import collections
+import concurrent.futures
+
+
+class BrowserSessionPool(object):
+    """浏览器会话池
+
+    每种浏览器预先启动若干个会话，需要浏览器时从池中取出（see :py:meth:`acquire`），用完后清理会话（cookie、本地存储、多余的窗口）
+    并放回池中（see :py:meth:`release`），而不是退出浏览器，省去每次启动浏览器的耗时。
+
+    会话按浏览器名称和启动参数区分，只有浏览器和启动参数都相同时才复用池中的会话，池中的会话在程序退出时统一退出（see :py:meth:`close`）。
+    """
+
+    THREAD_NAME_PREFIX = "stest-browser-pool"
+    BLANK_URL = "about:blank"
+
+    def __init__(self, launcher, size=1):
+        """
+        Args:
+            launcher: 启动浏览器会话的函数，接收 (浏览器名称, *位置参数, **关键字参数) 返回驱动实例
+            size: 每种浏览器（浏览器名称和启动参数都相同）预先启动的会话个数，放回时空闲会话超过该个数的会话直接退出
+        """
+
+        self.launcher = launcher
+        self.size = max(1, size)
+        self._lock = threading.Lock()
+        self._idle = collections.defaultdict(collections.deque)
+        self._launching = collections.defaultdict(collections.deque)
+        self._launch_args = {}
+        self._browsers = {}
+        self._executor = None
+        atexit.register(self.close)
+
+    @classmethod
+    def launch_key(cls, browser, args, kwargs):
+        """返回区分池中会话的键：浏览器名称和启动参数，选项对象（例如selenium的Options）按其capabilities比较"""
+
+        def normalize(value):
+            if hasattr(value, 'to_capabilities'):
+                try:
+                    return (type(value).__name__, normalize(value.to_capabilities()))
+                except Exception:
+                    pass
+            if isinstance(value, dict):
+                return repr(sorted((str(k), normalize(v)) for k, v in value.items()))
+            if isinstance(value, (list, tuple)):
+                return repr([normalize(v) for v in value])
+            return repr(value)
+
+        return (browser, normalize(args), normalize(kwargs))
+
+    def _submit_launch(self, key):
+
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.size, thread_name_prefix=self.THREAD_NAME_PREFIX)
+        browser, args, kwargs = self._launch_args[key]
+        self._launching[key].append(self._executor.submit(self.launcher, browser, *args, **kwargs))
+
+    def warm_up(self, browser, *args, **kwargs):
+        """在后台预先启动浏览器会话，使该浏览器（相同启动参数）的空闲和启动中的会话达到池的大小，参数同 :py:meth:`acquire`"""
+
+        key = self.launch_key(browser, args, kwargs)
+        with self._lock:
+            self._launch_args.setdefault(key, (browser, args, kwargs))
+            missing = self.size - len(self._idle[key]) - len(self._launching[key])
+            for _ in range(missing):
+                self._submit_launch(key)
+
+    def acquire(self, browser, *args, **kwargs):
+        """取出一个浏览器和启动参数都相同的会话，没有空闲会话时等待预先启动的会话，都没有则立即启动一个新会话
+
+        第一次以某种浏览器和启动参数取出会话时，会在后台同时启动池大小个会话
+
+        Args:
+            browser: 浏览器名称
+            args: 启动浏览器的位置参数
+            kwargs: 启动浏览器的关键字参数
+        """
+
+        key = self.launch_key(browser, args, kwargs)
+        with self._lock:
+            if key not in self._launch_args:
+                self._launch_args[key] = (browser, args, kwargs)
+                for _ in range(self.size - len(self._idle[key]) - len(self._launching[key])):
+                    self._submit_launch(key)
+            if self._idle[key]:
+                driver = self._idle[key].popleft()
+                self._browsers[driver] = key
+                return driver
+            future = self._launching[key].popleft() if self._launching[key] else None
+        # 池中的会话都已取出时，直接启动一个新会话，放回时超出池大小的会话会被退出
+        driver = self.launcher(browser, *args, **kwargs) if future is None else future.result()
+        with self._lock:
+            self._browsers[driver] = key
+        return driver
+
+    def release(self, driver):
+        """清理浏览器会话并放回池中，清理失败（例如浏览器已崩溃）或者空闲会话已满时退出该会话"""
+
+        with self._lock:
+            if driver not in self._browsers:
+                # 不是从池中取出的会话或者已经放回
+                return
+            key = self._browsers.pop(driver)
+        try:
+            self.reset(driver)
+        except Exception:
+            key = None
+        with self._lock:
+            if key is not None and len(self._idle[key]) < self.size:
+                self._idle[key].append(driver)
+                return
+        self._quit(driver)
+
+    def reset(self, driver):
+        """清理浏览器会话：关闭除第一个窗口外的所有窗口，清除cookie和本地存储，并打开空白页"""
+
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        # 本地存储按源隔离，需要在离开当前页面之前清除
+        try:
+            driver.execute_script("window.localStorage.clear();window.sessionStorage.clear();")
+        except Exception:
+            pass
+        cleared = False
+        if hasattr(driver, "execute_cdp_cmd"):
+            # chromium内核的浏览器可以一次清除所有域名下的cookie
+            try:
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                cleared = True
+            except Exception:
+                pass
+        if not cleared:
+            driver.delete_all_cookies()
+        driver.get(self.BLANK_URL)
+
+    def _quit(self, driver):
+
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @property
+    def idle_count(self):
+        """空闲会话个数"""
+
+        with self._lock:
+            return sum(len(drivers) for drivers in self._idle.values())
+
+    def close(self):
+        """退出池中所有空闲的会话和正在启动的会话，已取出的会话由使用者负责放回或者退出"""
+
+        with self._lock:
+            drivers = [driver for idle in self._idle.values() for driver in idle]
+            futures = [future for launching in self._launching.values() for future in launching]
+            executor = self._executor
+            self._idle.clear()
+            self._launching.clear()
+            self._launch_args.clear()
+            self._executor = None
+        for future in futures:
+            try:
+                drivers.append(future.result())
+            except Exception:
+                pass
+        for driver in drivers:
+            self._quit(driver)
+        if executor is not None:
+            executor.shutdown(wait=True)
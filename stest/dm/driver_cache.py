@@ -5,6 +5,8 @@
 @Date: 2022/03/18
 '''
 
+import types
+import threading
 from ..utils import sutils
 from ..core.errors import NoOpenDriver
 
@@ -19,7 +21,9 @@ class DriverCache(object):
 
         self._all_drivers = []
         self._current_driver = None
-        self._closed_drivers = set()
+        self._current_index = None
+        # 已关闭驱动的位置索引，同一个驱动（例如浏览器会话池中的会话）关闭后再次注册时使用新的索引
+        self._closed_indexes = set()
         self._alias_index_maps = sutils.StringKeyDict()
         self._default_quit_method = 'quit'
         self._quit_methods = sutils.StringKeyDict()
@@ -65,9 +69,7 @@ class DriverCache(object):
 
         if not self:
             return None
-        for index, driver in enumerate(self._all_drivers):
-            if driver is self._current_driver:
-                return index + 1
+        return self._current_index
 
     def register_driver(self, driver, alias=None, quit_method=None):
         """注册driver，并返回注册成功后，它在缓存中的位置索引(索引号从1开始)
@@ -77,22 +79,26 @@ class DriverCache(object):
 
             alias: 驱动别名，忽略大小写和空格
 
-            quit_method: 退出驱动的方法名，调用关闭方法时将调用驱动实例的该方法退出，忽略则调用默认退出方法，如果驱动实例没有该方法则抛异常
+            quit_method: 退出驱动的方法名，调用关闭方法时将调用驱动实例的该方法退出，忽略则调用默认退出方法，如果驱动实例没有该方法则抛异常，
+                         也可以是接收驱动实例的函数，调用关闭方法时以驱动实例调用该函数（例如把驱动放回浏览器会话池）
         """
         if driver is None:
             raise ValueError('invalid driver: {}'.format(driver))
         self._current_driver = driver
         self._all_drivers.append(driver)
         index = len(self._all_drivers)
+        self._current_index = index
         if sutils.is_string(alias):
             self._alias_index_maps[alias] = index
-        if sutils.is_string(quit_method):
+        if sutils.is_string(quit_method) or callable(quit_method):
             self._quit_methods[str(index)] = quit_method
         return index
 
     def switch_driver(self, alias_or_index):
         """通过别名或索引切换到对应的driver"""
         self._current_driver = self._get_driver(alias_or_index)
+        if alias_or_index is not None:
+            self._current_index = self._resolve_alias_or_index(alias_or_index)
         return self._current_driver
 
     def _get_driver(self, alias_or_index=None):
@@ -120,31 +126,41 @@ class DriverCache(object):
     def active_drivers(self):
 
         open_drivers = []
-        for driver in self._all_drivers:
-            if driver not in self._closed_drivers:
+        for index, driver in enumerate(self._all_drivers):
+            if index + 1 not in self._closed_indexes:
                 open_drivers.append(driver)
         return open_drivers
 
     def _call_method(self, driver, method_name):
 
+        if callable(method_name):
+            return method_name(driver)
         return getattr(driver, method_name)()
 
     def close_driver(self):
 
         if self._current_driver:
-            driver = self._current_driver
-            method = self._quit_methods.get(str(self.current_index), self.default_quit_method)
+            index = self._current_index
+            method = self._quit_methods.get(str(index), self.default_quit_method)
             self._call_method(self._current_driver, method)
             self._current_driver = None
-            if driver not in self._closed_drivers:
-                self._closed_drivers.add(driver)
+            self._current_index = None
+            self._mark_closed(index)
+
+    def _mark_closed(self, index):
+        """标记索引对应的驱动已关闭，并删除指向该索引的别名，避免驱动（例如放回池中的浏览器会话）再次注册后通过旧别名访问"""
+
+        self._closed_indexes.add(index)
+        for alias in [alias for alias, value in self._alias_index_maps.items() if value == index]:
+            del self._alias_index_maps[alias]
 
     def close_all_drivers(self):
 
         for index, driver in enumerate(self._all_drivers):
-            if driver not in self._closed_drivers:
+            if index + 1 not in self._closed_indexes:
                 self._call_method(driver, self._quit_methods.get(
                     str(index + 1), self.default_quit_method))
+                self._mark_closed(index + 1)
         self.clear_empty_cache()
         return self._current_driver
 
@@ -158,11 +174,7 @@ class DriverCache(object):
             index = self._resolve_alias_or_index(alias_or_index)
         except ValueError:
             return None
-        try:
-            driver = self._get_driver(alias_or_index)
-        except RuntimeError:
-            return None
-        return None if driver in self._closed_drivers else index
+        return None if index in self._closed_indexes else index
 
     def _resolve_alias_or_index(self, alias_or_index):
         try:
@@ -194,3 +206,60 @@ class DriverCache(object):
     def __bool__(self):
 
         return self._current_driver is not None
+
+
+class ThreadLocalDriverCache(DriverCache):
+    """线程本地驱动缓存
+
+    每个线程有各自独立的驱动列表、当前驱动、别名映射和退出方法，线程第一次访问时自动创建一份空缓存，
+    多个线程可以通过同一个驱动管理器（及AbstractPage等页面对象）同时操作各自的浏览器而互不干扰，无需加锁。
+    """
+
+    # 每个线程独立保存的缓存字段
+    LOCAL_FIELDS = frozenset(('_all_drivers', '_current_driver', '_current_index', '_closed_indexes',
+                              '_alias_index_maps', '_default_quit_method', '_quit_methods'))
+
+    def __init__(self, error_msg="No current driver"):
+
+        object.__setattr__(self, '_local', threading.local())
+        object.__setattr__(self, '_states_lock', threading.Lock())
+        object.__setattr__(self, '_states', [])
+        super().__init__(error_msg)
+
+    def _state(self):
+        """返回当前线程的缓存状态，第一次访问时创建"""
+
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            state = types.SimpleNamespace()
+            self._local.state = state
+            with self._states_lock:
+                self._states.append(state)
+            self._init_items()
+        return state
+
+    def __getattr__(self, name):
+
+        if name in self.LOCAL_FIELDS:
+            return getattr(self._state(), name)
+        raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__.__name__, name))
+
+    def __setattr__(self, name, value):
+
+        if name in self.LOCAL_FIELDS:
+            setattr(self._state(), name, value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def close_all_threads_drivers(self):
+        """退出所有线程缓存中未关闭的驱动，一般在所有工作线程结束后调用"""
+
+        with self._states_lock:
+            states = list(self._states)
+            self._states.clear()
+        for state in states:
+            for index, driver in enumerate(state._all_drivers):
+                if index + 1 not in state._closed_indexes:
+                    self._call_method(driver, state._quit_methods.get(str(index + 1), state._default_quit_method))
+        # 各线程下次访问时重新创建空缓存
+        object.__setattr__(self, '_local', threading.local())
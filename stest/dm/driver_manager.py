@@ -4,7 +4,7 @@
 @Author: 思文伟
 @Date: 2022/03/18 13:51:38
 '''
-# import warnings
+import warnings
 
 from ..utils import sutils
 from ..utils import pre_map
@@ -13,6 +13,8 @@ from ..utils.attrs_marker import Var
 from ..utils.attrs_marker import Const
 from ..utils import attrs_manager
 from .driver_cache import DriverCache
+from .driver_cache import ThreadLocalDriverCache
+from .browser_pool import BrowserSessionPool
 from ..pylibs.lazy_libs import LazyLibs
 from .wechat_minium_proxy import WechatMiniumProxy
 
@@ -68,6 +70,7 @@ class DriverManager(attrs_manager.AttributeManager):
         self.implicit_wait_timeout = implicit_wait_timeout
         self.__save_to_global_settings()
         self.__cache = DriverCache()
+        self.__browser_pool = None
 
     def __save_to_global_settings(self):
 
@@ -77,18 +80,70 @@ class DriverManager(attrs_manager.AttributeManager):
 
     @property
     def cache(self):
+
+        cache = self.__cache
+        if not isinstance(cache, ThreadLocalDriverCache) and getattr(settings, "DRIVER_CACHE_THREAD_LOCAL", False) and not cache.active_drivers:
+            self.enable_thread_local_cache()
         return self.__cache
 
+    def enable_thread_local_cache(self):
+        """开启线程本地驱动缓存模式（see :py:class:`ThreadLocalDriverCache`）
+
+        开启后每个线程有各自的当前驱动和别名映射，多个线程可以通过同一个驱动管理器同时操作各自的浏览器，
+        需要在打开任何驱动之前开启，工作线程结束后可调用 `cache.close_all_threads_drivers()` 退出所有线程中未关闭的驱动
+        """
+
+        if isinstance(self.__cache, ThreadLocalDriverCache):
+            return self.__cache
+        if self.__cache.active_drivers:
+            raise RuntimeError('thread local driver cache must be enabled before any driver is opened')
+        self.__cache = ThreadLocalDriverCache(self.__cache.error_msg)
+        return self.__cache
+
+    @property
+    def browser_pool(self):
+        """浏览器会话池，未开启池化模式（see :py:meth:`enable_browser_pool`）且配置 BROWSER_POOL_SIZE 不大于0时返回None"""
+
+        if self.__browser_pool is None:
+            size = getattr(settings, "BROWSER_POOL_SIZE", 0)
+            if size and size > 0:
+                self.enable_browser_pool(size)
+        return self.__browser_pool
+
+    def enable_browser_pool(self, size=1):
+        """开启浏览器会话池化模式
+
+        开启后create_webdriver（open_browser、chrome等）从会话池中取出预先启动的浏览器会话，关闭驱动（close_driver、close_all_drivers）时
+        清理会话（cookie、本地存储、多余的窗口）并放回池中，而不是退出浏览器。一般在测试类的setUpClass中打开浏览器，tearDownClass中关闭驱动，
+        即每个测试类取出一个会话。池中的会话在程序退出时统一退出。
+
+        Args:
+            size: 每种浏览器预先启动的会话个数
+        """
+
+        if self.__browser_pool is None:
+            self.__browser_pool = BrowserSessionPool(self.launch_webdriver, size)
+        else:
+            self.__browser_pool.size = max(1, size)
+        return self.__browser_pool
+
+    def close_browser_pool(self):
+        """退出会话池中所有空闲的浏览器会话并关闭池化模式"""
+
+        if self.__browser_pool is not None:
+            self.__browser_pool.close()
+            self.__browser_pool = None
+
     @property
     def index(self):
         """返回当前驱动实例索引"""
-        return self.__cache.current_index
+        return self.cache.current_index
 
     @property
     def driver(self):
         """返回当前驱动实例"""
 
-        return self.__cache.current_driver
+        return self.cache.current_driver
 
     def open_url(self, url):
         """Loads a web page in the current browser session."""
@@ -97,20 +152,20 @@ class DriverManager(attrs_manager.AttributeManager):
 
     def register_driver(self, driver, alias=None, quit_method=None):
 
-        return self.__cache.register_driver(driver, alias, quit_method)
+        return self.cache.register_driver(driver, alias, quit_method)
 
     def switch_driver(self, index_or_alias):
 
-        return self.__cache.switch_driver(index_or_alias)
+        return self.cache.switch_driver(index_or_alias)
 
     def close_driver(self):
         """关闭当前驱动"""
 
-        return self.__cache.close_driver()
+        return self.cache.close_driver()
 
     def close_all_drivers(self):
 
-        return self.__cache.close_all_drivers()
+        return self.cache.close_all_drivers()
 
     def set_script_timeout(self, time_to_wait):
         return self.driver.set_script_timeout(time_to_wait)
@@ -132,7 +187,7 @@ class DriverManager(attrs_manager.AttributeManager):
             appium.webdriver
         """
 
-        index = self.__cache.get_index(alias)
+        index = self.cache.get_index(alias)
         if index:
             self.switch_driver(alias)
             return index
@@ -191,7 +246,7 @@ class DriverManager(attrs_manager.AttributeManager):
         ----------
         browser: 根据传入的映射名称调用对应的浏览器驱动
         alias: 缓存中存放驱动实例的别名
-        quit_method: 退出驱动的方法名称，不传则默认为quit
+        quit_method: 退出驱动的方法名称，不传则默认为quit。开启浏览器会话池时忽略该参数（并发出警告），关闭驱动时总是清理会话并放回池中
         script_timeout: 用于execute_async_script()执行的异步js超时时间
         implicit_wait_timeout: 智能等待超时时间
         webdriver_args:位置参数，没有则不需要传,具体根据browser值确定，如browser为chrome，则为`selenium.webdirver.Chrome`的参数
@@ -207,23 +262,42 @@ class DriverManager(attrs_manager.AttributeManager):
             - `selenium.webdriver.Remote`
         """
 
-        index = self.__cache.get_index(alias)
+        index = self.cache.get_index(alias)
         if index:
             self.switch_driver(alias)
             return index
         clazz = self.__class__
         if browser is None:
             browser = clazz.SELENIUM_WEBDRIVER_REMOTE
+        pool = self.browser_pool
+        if pool is not None:
+            if quit_method is not None:
+                warnings.warn("quit_method {!r} is ignored: drivers from the browser session pool are always "
+                              "released back to the pool".format(quit_method), UserWarning, stacklevel=2)
+            driver = pool.acquire(browser, *webdriver_args, **webdriver_kwargs)
+            quit_method = pool.release
+        else:
+            driver = self.launch_webdriver(browser, *webdriver_args, **webdriver_kwargs)
+        driver.set_script_timeout(self.script_timeout if script_timeout is None else script_timeout)
+        driver.implicitly_wait(
+            self.implicit_wait_timeout if implicit_wait_timeout is None else implicit_wait_timeout)
+        return self.register_driver(driver, alias, quit_method)
+
+    def launch_webdriver(self, browser, *webdriver_args, **webdriver_kwargs):
+        """启动一个新的浏览器会话，返回驱动实例，不放入缓存
+
+        Args:
+            browser: 根据传入的映射名称调用对应的浏览器驱动
+            webdriver_args: 浏览器驱动的位置参数
+            webdriver_kwargs: 浏览器驱动的关键字参数
+        """
+
         classmap = self.SELENIUM_WEBDRIVER_MAP.get(browser, default=None)
         if classmap is None:
             raise ValueError(
                 '未找到映射名为{} 的驱动映射，请先用add_selenium_webdriver方法添加selenium驱动映射'.format(browser))
         driverclass = classmap.get_object_from_module()
-        driver = driverclass(*webdriver_args, **webdriver_kwargs)
-        driver.set_script_timeout(self.script_timeout if script_timeout is None else script_timeout)
-        driver.implicitly_wait(
-            self.implicit_wait_timeout if implicit_wait_timeout is None else implicit_wait_timeout)
-        return self.register_driver(driver, alias, quit_method)
+        return driverclass(*webdriver_args, **webdriver_kwargs)
 
     def open_browser(self, name, url=None, alias=None, *args, **kwargs):
 
@@ -359,6 +433,9 @@ class DriverManager(attrs_manager.AttributeManager):
     def create_playwright_driver(self, browser_type="chromium", alias=None, *, playwright=None, browser_launch_args={}, browser_context_args={}):
         """创建playwright驱动
 
+        配置 PLAYWRIGHT_CONTEXT_POOL 为True时，驱动使用浏览器上下文池（see :py:class:`PlaywrightContextPool`）中共用的浏览器，只创建新的上下文，
+        browser_context_args中的storage_state可以是上下文池保存的登录状态快照名称
+
         Args
         -------
         browser_type : str  default value is `chromium`
@@ -378,7 +455,11 @@ class DriverManager(attrs_manager.AttributeManager):
         if index:
             self.switch_driver(alias)
             return index
-        driver = PlaywrightDriver(playwright)
+        context_pool = None
+        if getattr(settings, "PLAYWRIGHT_CONTEXT_POOL", False):
+            from .playwright_context_pool import PlaywrightContextPool
+            context_pool = PlaywrightContextPool.default()
+        driver = PlaywrightDriver(playwright, context_pool=context_pool)
         driver.open_browser(browser_type=browser_type, browser_launch_args=browser_launch_args,
                             browser_context_args=browser_context_args)
         return self.register_driver(driver, alias, quit_method)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+import os
+import re
+import copy
+import time
+import tempfile
+from typing import Dict
+from typing import Optional
+from stest import settings
+from playwright.sync_api import Browser
+from playwright.sync_api import Playwright
+from playwright.sync_api import BrowserContext
+from playwright.sync_api import sync_playwright
+from stest.utils.sutils import mkdirs
+
+
+class PlaywrightContextPool(object):
+    """Playwright浏览器上下文池
+
+    每种浏览器（按浏览器类型和启动参数区分）在整个测试运行期间只启动一次，每个驱动（页面）从共用的浏览器中创建全新的上下文（BrowserContext），
+    创建上下文只需几毫秒，而启动浏览器需要数秒。上下文可以用保存的登录状态（storage_state）初始化，从而跳过登录步骤（see :py:meth:`login_once`）。
+
+    测试运行结束时（stopTestRun阶段）关闭所有浏览器。
+    """
+
+    KEY_IN_SETTINGS = "playwright_context_pool"
+    DEFAULT_STORAGE_STATE_DIR_NAME = "stest_storage_states"
+
+    def __init__(self, playwright: Optional[Playwright] = None, storage_state_dir=None):
+        """
+        Args:
+            playwright: playwright实例，省略则使用全局配置中的playwright实例，没有则自动创建
+            storage_state_dir: 登录状态快照文件存放目录，省略则使用系统临时目录下的 stest_storage_states 目录
+        """
+
+        self._playwright = playwright
+        self.storage_state_dir = os.path.abspath(
+            storage_state_dir or os.path.join(tempfile.gettempdir(), self.DEFAULT_STORAGE_STATE_DIR_NAME))
+        self._browsers: Dict[tuple, Browser] = {}
+        self._snapshots: Dict[str, str] = {}
+
+    @classmethod
+    def default(cls):
+        """返回全局共用的上下文池，第一次调用时使用配置 PLAYWRIGHT_STORAGE_STATE_DIR 创建并保存到全局配置中"""
+
+        pool = getattr(settings, cls.KEY_IN_SETTINGS, None)
+        if not isinstance(pool, cls):
+            pool = cls(storage_state_dir=getattr(settings, "PLAYWRIGHT_STORAGE_STATE_DIR", None))
+            setattr(settings, cls.KEY_IN_SETTINGS, pool)
+        return pool
+
+    @property
+    def playwright(self) -> Playwright:
+
+        if self._playwright is None:
+            from .playwright_driver import PlaywrightDriver
+            pw = getattr(settings, PlaywrightDriver.PLAYWRIGHT, None)
+            if not pw:
+                pw = sync_playwright().start()
+                setattr(settings, PlaywrightDriver.PLAYWRIGHT, pw)
+                setattr(settings, PlaywrightDriver.AUTO_STOP_PLAYWRIGHT, True)
+            self._playwright = pw
+        return self._playwright
+
+    def browser(self, browser_type="chromium", **browser_launch_args) -> Browser:
+        """返回共用的浏览器，同一浏览器类型和启动参数的浏览器只启动一次，已断开连接（例如崩溃）则重新启动
+
+        Args:
+            browser_type: chromium | firefox | webkit
+            browser_launch_args: refer to the `BrowserType.launch`
+        """
+
+        key = (browser_type, repr(sorted(browser_launch_args.items())))
+        browser = self._browsers.get(key, None)
+        if browser is None or not browser.is_connected():
+            browser = getattr(self.playwright, browser_type).launch(**browser_launch_args)
+            self._browsers[key] = browser
+        return browser
+
+    def owns(self, browser: Browser):
+        """浏览器是否由上下文池管理，池中的浏览器只能由池关闭"""
+
+        return any(browser is one for one in self._browsers.values())
+
+    def storage_state_path(self, name):
+        """返回登录状态快照的文件路径"""
+
+        return os.path.join(self.storage_state_dir, re.sub(r'[^\w.-]+', '_', name) + '.json')
+
+    def resolve_storage_state(self, storage_state):
+        """把本次运行保存的登录状态快照名称（see :py:meth:`save_storage_state`）转换为快照文件路径，其它值原样返回"""
+
+        if isinstance(storage_state, str) and storage_state in self._snapshots:
+            return self._snapshots[storage_state]
+        return storage_state
+
+    def new_context(self, browser_type="chromium", browser_launch_args={}, storage_state=None, **browser_context_args) -> BrowserContext:
+        """在共用的浏览器中创建全新的上下文，启动参数和上下文参数与PlaywrightDriver一样以其默认参数为基础，因此与驱动共用同一个浏览器
+
+        Args:
+            browser_type: chromium | firefox | webkit
+            browser_launch_args: refer to the `BrowserType.launch`
+            storage_state: 登录状态快照名称或者 `Browser.new_context` 支持的storage_state（文件路径或字典），省略则为空白的上下文
+            browser_context_args: refer to the `Browser.new_context`
+        """
+
+        from .playwright_driver import PlaywrightDriver
+        final_launch_args = copy.deepcopy(PlaywrightDriver.DEFAULT_BROWSER_LAUNCH_ARGS)
+        final_launch_args.update(browser_launch_args)
+        final_context_args = copy.deepcopy(PlaywrightDriver.DEFAULT_BROWSER_CONTEXT_ARGS)
+        final_context_args.update(browser_context_args)
+        if storage_state is not None:
+            final_context_args['storage_state'] = self.resolve_storage_state(storage_state)
+        return self.browser(browser_type, **final_launch_args).new_context(**final_context_args)
+
+    def save_storage_state(self, context: BrowserContext, name):
+        """保存上下文的登录状态（cookie、本地存储）快照，之后创建上下文时可以通过快照名称使用该登录状态，返回快照文件路径"""
+
+        path = self.storage_state_path(name)
+        mkdirs(self.storage_state_dir)
+        context.storage_state(path=path)
+        self._snapshots[name] = path
+        return path
+
+    def login_once(self, name, login, browser_type="chromium", browser_launch_args={}, max_age=None, **browser_context_args):
+        """只登录一次并保存登录状态快照，返回快照文件路径
+
+        本次运行已保存过该名称的快照则直接返回；否则创建上下文，调用login(page)登录后保存快照。
+
+        Usage
+        -----
+        ```
+        def login(page):
+            page.goto("https://example.com/login")
+            page.fill("#username", "admin")
+            page.fill("#password", "123456")
+            page.click("#submit")
+            page.wait_for_url("**/home")
+
+        PlaywrightContextPool.default().login_once("admin", login)
+        page = HomePage().chromium(browser_context_args=dict(storage_state="admin"))
+        ```
+
+        Args:
+            name: 快照名称
+            login: 登录函数，接收playwright的Page对象
+            browser_type: chromium | firefox | webkit
+            browser_launch_args: refer to the `BrowserType.launch`
+            max_age: 快照文件的有效期（秒），之前运行保存的快照文件在有效期内则直接使用，省略则每次运行都重新登录
+            browser_context_args: 登录时创建上下文的参数，refer to the `Browser.new_context`
+        """
+
+        path = self._snapshots.get(name, None)
+        if path and os.path.exists(path):
+            return path
+        path = self.storage_state_path(name)
+        if max_age is not None and os.path.exists(path) and time.time() - os.path.getmtime(path) < max_age:
+            self._snapshots[name] = path
+            return path
+        context = self.new_context(browser_type, browser_launch_args, **browser_context_args)
+        try:
+            login(context.new_page())
+            return self.save_storage_state(context, name)
+        finally:
+            context.close()
+
+    def close(self):
+        """关闭池中所有的浏览器"""
+
+        browsers = list(self._browsers.values())
+        self._browsers.clear()
+        for browser in browsers:
+            try:
+                browser.close()
+            except Exception:
+                pass
@@ -27,8 +27,16 @@ class PlaywrightDriver(object):
     PLAYWRIGHT = "playwright"
     AUTO_STOP_PLAYWRIGHT = "AUTO_STOP_PLAYWRIGHT_AFTER_ALL_TESTS_ARE_EXECUTED"
     already_set_auto_stop_playwright = False
+    DEFAULT_BROWSER_LAUNCH_ARGS = dict(args=['--start-maximized'], headless=False)
+    DEFAULT_BROWSER_CONTEXT_ARGS = dict(no_viewport=True)
 
-    def __init__(self, playwright: Optional[Playwright] = None):
+    def __init__(self, playwright: Optional[Playwright] = None, context_pool=None):
+        """
+        Args:
+            playwright: playwright实例，省略则使用全局配置中的playwright实例，没有则自动创建
+            context_pool: 浏览器上下文池（see :py:class:`PlaywrightContextPool`），提供则使用池中共用的浏览器，
+                          驱动只创建和关闭自己的上下文，不会启动和关闭浏览器
+        """
 
         if not isinstance(playwright, Playwright):
             pw = getattr(settings, self.PLAYWRIGHT, None)
@@ -45,13 +53,15 @@ class PlaywrightDriver(object):
             setattr(settings, self.AUTO_STOP_PLAYWRIGHT, True)
             self.already_set_auto_stop_playwright = True
 
-        self.browser_launch_args = dict(args=['--start-maximized'], headless=False)
-        self.browser_context_args = dict(no_viewport=True)
+        self.browser_launch_args = copy.deepcopy(self.DEFAULT_BROWSER_LAUNCH_ARGS)
+        self.browser_context_args = copy.deepcopy(self.DEFAULT_BROWSER_CONTEXT_ARGS)
 
         self.__page: Optional[Page] = None
         self.__context: Optional[BrowserContext] = None
         self.__browser: Optional[Browser] = None
         self.__browsers: List[Browser] = []
+        self.__contexts: List[BrowserContext] = []
+        self.context_pool = context_pool
 
         self.warning_if_error_when_close = True
 
@@ -192,8 +202,11 @@ class PlaywrightDriver(object):
 
         final_browser_kwargs = copy.deepcopy(self.browser_launch_args)
         final_browser_kwargs.update(browser_launch_args)
-        self.browser = self.__get_browser_type(
-            type_name=browser_type).launch(**final_browser_kwargs)
+        if self.context_pool is not None:
+            self.browser = self.context_pool.browser(browser_type, **final_browser_kwargs)
+        else:
+            self.browser = self.__get_browser_type(
+                type_name=browser_type).launch(**final_browser_kwargs)
         return self
 
     def open_context(self, **browser_context_args):
@@ -201,7 +214,10 @@ class PlaywrightDriver(object):
 
         final_context_kwargs = copy.deepcopy(self.browser_context_args)
         final_context_kwargs.update(browser_context_args)
+        if self.context_pool is not None and "storage_state" in final_context_kwargs:
+            final_context_kwargs["storage_state"] = self.context_pool.resolve_storage_state(final_context_kwargs["storage_state"])
         self.context = self.browser.new_context(**final_context_kwargs)
+        self.__contexts.append(self.context)
         return self
 
     def open_page(self, **browser_context_args):
@@ -323,7 +339,13 @@ class PlaywrightDriver(object):
         for one in to_be_close:
             if one in self.browsers:
                 self.browsers.remove(one)
-            one.close()
+            if self.context_pool is not None and self.context_pool.owns(one):
+                # 上下文池中的浏览器由所有驱动共用，只关闭本驱动创建的上下文
+                for context in [c for c in self.__contexts if c.browser == one]:
+                    self.__contexts.remove(context)
+                    context.close()
+            else:
+                one.close()
 
     def close(self):
 
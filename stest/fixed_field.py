@@ -22,3 +22,6 @@ class FixedField(AttributeManager):
 
     STEST_TESTCASE_EXEC_NUMBER = Const(
         'stest_testcase_exec_number', 'testcase 实例中记录用例执行顺序编号的属性名')
+
+    STEST_PHASE_TIMINGS = Const(
+        'stest_phase_timings', 'testcase 实例中记录用例各执行阶段耗时(秒)字典的属性名，see :py:class:`TestPhase`')
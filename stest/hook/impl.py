@@ -144,10 +144,18 @@ class Hook(object):
 
 
 class HookManager(object):
+    """钩子管理器
+
+    按 (运行阶段, 运行策略) 预先编译好按默认优先级排序的钩子分派表，钩子与宿主函数的参数检查结果也会缓存，
+    宿主函数每次运行时直接按分派表调用钩子，不再每次遍历、过滤、排序全部钩子。
+    添加钩子时分派表自动失效，直接修改hooks列表或钩子的runstage、runpolicy、priority属性后需要调用 :py:meth:`invalidate` 使分派表失效。
+    """
 
     def __init__(self):
 
         self.__hooks = []
+        self.__dispatch_tables = {}
+        self.__checked = set()
 
     @property
     def hooks(self):
@@ -158,8 +166,37 @@ class HookManager(object):
 
         if hook not in self.__hooks:
             self.__hooks.append(hook)
+            self.invalidate()
         return self.__hooks.index(hook)
 
+    def invalidate(self):
+        """使已编译的钩子分派表和参数检查结果失效，下次运行时重新编译"""
+
+        self.__dispatch_tables.clear()
+        self.__checked.clear()
+        return self
+
+    def dispatch_table(self, runstage, runpolicy):
+        """返回指定运行阶段和运行策略的钩子分派表 - 按默认优先级排好序的钩子元祖，首次获取时编译并缓存"""
+
+        key = (runstage, runpolicy)
+        table = self.__dispatch_tables.get(key, None)
+        if table is None:
+            hooklist = [hook for hook in self.hooks if hook.runstage == runstage and hook.runpolicy == runpolicy]
+            hooklist.sort(key=self.__default_sort_func)
+            if getattr(settings, "WARN_IF_SAME_PRIORITY_OF_HOOK", False):
+                self.warn_if_same_priority(hooklist)
+            table = self.__dispatch_tables[key] = tuple(hooklist)
+        return table
+
+    def check(self, hook, host_func):
+        """检查钩子函数是否能完全接收宿主函数的参数（see :py:meth:`Hook.check`），检查通过的结果会缓存，同一钩子和宿主函数只检查一次"""
+
+        key = (hook, host_func)
+        if key not in self.__checked:
+            hook.check(host_func)
+            self.__checked.add(key)
+
     def record_host_func(self, host_func, runstage, *host_args, **host_kwargs):
 
         for hook in self.__hooks:
@@ -214,22 +251,23 @@ class HookManager(object):
         """
 
         reslist = {}
-        hooklist = []
         if isinstance(args, list):
             args = tuple(args)
-        for hook in self.hooks:
-            if hook.runstage == runstage and hook.runpolicy == runpolicy:
-                hooklist.append(hook)
-        hooklist = list(filter(filter_func, hooklist))
-        if sort_key is None:
-            sort_key = self.__default_sort_func
-        hooklist.sort(key=sort_key, reverse=sort_reverse)
-        if getattr(settings, "WARN_IF_SAME_PRIORITY_OF_HOOK", False):
-            self.warn_if_same_priority(hooklist)
+        hooklist = self.dispatch_table(runstage, runpolicy)
+        if not hooklist:
+            return reslist
+        if filter_func is not None or sort_key is not None or sort_reverse:
+            # 自定义了过滤或排序，基于分派表重新过滤和排序
+            hooklist = list(filter(filter_func, hooklist))
+            if sort_key is None:
+                sort_key = self.__default_sort_func
+            hooklist.sort(key=sort_key, reverse=sort_reverse)
+            if getattr(settings, "WARN_IF_SAME_PRIORITY_OF_HOOK", False):
+                self.warn_if_same_priority(hooklist)
         for hook in hooklist:
             throw_exception = False
             try:
-                hook.check(host_func)
+                self.check(hook, host_func)
                 reslist[hook] = hook(*args, *kwargs)
             except Exception as e:
                 throw_exception = True
@@ -294,15 +332,18 @@ def host(runstage, **options):
                 `sort_reverse` - 同内置方法sorted 的reverse参数，True -> 降序，False -> 升序 <br>
                 `filter_func` - 过滤函数，同内置方法filter的function参数 <br>
     """
+    before_opts = {k: v for k, v in options.get("before", {}).items() if k != "runpolicy"}
+    after_opts = {k: v for k, v in options.get("after", {}).items() if k != "runpolicy"}
+
     def decorator(host_func):
         @functools.wraps(host_func)
         def inner(*args, **kwargs):
-            hook_args = [settings]
-            hook_args.extend([o for o in args])
-            hook_kwargs = kwargs
             hm = HOOK_MANAGER
-            before_opts = {k: v for k, v in options.get("before", {}).items() if k != "runpolicy"}
-            after_opts = {k: v for k, v in options.get("after", {}).items() if k != "runpolicy"}
+            # 没有挂载任何钩子时直接运行宿主函数
+            if not hm.dispatch_table(runstage, RunPolicy.BEFORE) and not hm.dispatch_table(runstage, RunPolicy.AFTER):
+                return host_func(*args, **kwargs)
+            hook_args = (settings,) + args
+            hook_kwargs = kwargs
             hm.run(host_func, hook_args, hook_kwargs,
                    runstage, runpolicy=RunPolicy.BEFORE, **before_opts)
             res = host_func(*args, **kwargs)
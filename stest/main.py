@@ -8,12 +8,16 @@ import os
 import sys
 import datetime
 import unittest
+import warnings
 from unittest.signals import installHandler
 
 from .conf import settings
 from .core.seven_runner import SevenTestRunner
 from .core.seven_loader import SevenTestLoader
+from .core.seven_data_provider import SevenDataProvider
 from .core.report_builder import ReportBuilder
+from .core.profiling import TestProfiler
+from .core.duration_history import DurationHistory
 
 
 class SevenTestProgram(unittest.TestProgram):
@@ -49,6 +53,12 @@ class SevenTestProgram(unittest.TestProgram):
         self.testLoader.args_namespace = self
         return super().parseArgs(argv)
 
+    def createTests(self, *args, **kwargs):
+
+        if getattr(self, 'rebuild_data_cache', False):
+            SevenDataProvider.rebuild_data_cache = True
+        return super().createTests(*args, **kwargs)
+
     def _initArgParsers(self):
 
         super()._initArgParsers()
@@ -96,6 +106,44 @@ class SevenTestProgram(unittest.TestProgram):
             dest='jenkins_junit_xml',
             help="xml report full path,junit xml format report that jenkins supports"
         )
+        self._main_parser.add_argument(
+            '-workers',
+            '--workers',
+            dest='workers',
+            type=int,
+            default=1,
+            help="number of worker processes used to run tests in parallel, default 1 (run serially)"
+        )
+        self._main_parser.add_argument(
+            '--rebuild-data-cache',
+            dest='rebuild_data_cache',
+            action='store_true',
+            help="ignore the compiled test data cache of SevenDataProvider and rebuild it from the data files"
+        )
+        self._main_parser.add_argument(
+            '--profile',
+            dest='profile',
+            action='store_true',
+            help="profile each test (see --profile-mode), save per-test results and add a hot spot summary to the html report"
+        )
+        self._main_parser.add_argument(
+            '--profile-mode',
+            dest='profile_mode',
+            default=TestProfiler.CPU,
+            choices=[TestProfiler.CPU, TestProfiler.MEMORY],
+            help="what --profile measures: cpu (cProfile, the default) or memory (tracemalloc)"
+        )
+        self._main_parser.add_argument(
+            '--profile-dir',
+            dest='profile_dir',
+            help="dir path of per-test profile results, default ./stest_profile"
+        )
+        self._main_parser.add_argument(
+            '--longest-first',
+            dest='longest_first',
+            action='store_true',
+            help="when running in parallel, start the tests with the longest historical duration first (needs the duration history in the report dir)"
+        )
 
         self._discovery_parser.add_argument(
             '-g',
@@ -141,8 +189,58 @@ class SevenTestProgram(unittest.TestProgram):
             dest='jenkins_junit_xml',
             help="xml report full path,junit xml format report that jenkins supports"
         )
+        self._discovery_parser.add_argument(
+            '-workers',
+            '--workers',
+            dest='workers',
+            type=int,
+            default=1,
+            help="number of worker processes used to run tests in parallel, default 1 (run serially)"
+        )
+        self._discovery_parser.add_argument(
+            '--rebuild-data-cache',
+            dest='rebuild_data_cache',
+            action='store_true',
+            help="ignore the compiled test data cache of SevenDataProvider and rebuild it from the data files"
+        )
+        self._discovery_parser.add_argument(
+            '--profile',
+            dest='profile',
+            action='store_true',
+            help="profile each test (see --profile-mode), save per-test results and add a hot spot summary to the html report"
+        )
+        self._discovery_parser.add_argument(
+            '--profile-mode',
+            dest='profile_mode',
+            default=TestProfiler.CPU,
+            choices=[TestProfiler.CPU, TestProfiler.MEMORY],
+            help="what --profile measures: cpu (cProfile, the default) or memory (tracemalloc)"
+        )
+        self._discovery_parser.add_argument(
+            '--profile-dir',
+            dest='profile_dir',
+            help="dir path of per-test profile results, default ./stest_profile"
+        )
+        self._discovery_parser.add_argument(
+            '--longest-first',
+            dest='longest_first',
+            action='store_true',
+            help="when running in parallel, start the tests with the longest historical duration first (needs the duration history in the report dir)"
+        )
 
-    def __build_html_report(self, result, start_time, finish_time):
+    def __report_dir(self):
+        """返回报告目录：html报告文件（see :py:meth:`__html_report_path`）所在目录，不生成html报告时是配置的报告存放目录，都没有则返回None"""
+
+        fname, _ = self.__html_report_path(datetime.datetime.now())
+        if fname:
+            return os.path.dirname(fname)
+        return getattr(settings, "TEST_REPORT_DIR", None)
+
+    def __html_report_path(self, start_time):
+        """返回 (html报告文件路径, 是否需要打印报告路径)，不生成html报告时文件路径为None
+
+        优先取命令行参数指定的路径，其次是配置的报告存放目录，都没有时报告保存在测试模块所在目录
+        """
 
         fname = self.html
         ext = '.html'
@@ -169,12 +267,18 @@ class SevenTestProgram(unittest.TestProgram):
                 if self.module is None:
                     # warning_message = '没有传入报告文件名，不会生成测试报告文件'
                     # print(warning_message)
-                    return None
+                    return None, False
                 else:
                     filepath = os.path.abspath(self.module.__file__)
                     fname = os.path.splitext(filepath)[0] + ext
                     notice = True
-        fname = os.path.abspath(fname)
+        return os.path.abspath(fname), notice
+
+    def __build_html_report(self, report_builder, start_time, finish_time):
+
+        fname, notice = self.__html_report_path(start_time)
+        if fname is None:
+            return None
         title_key = 'title'
         title = self.title
         summary_info = {}
@@ -194,14 +298,13 @@ class SevenTestProgram(unittest.TestProgram):
         summary_info[
             'task_number'] = self.task if self.task else start_time.strftime(
                 "%Y%m%d%H%M%S%f")
-        ReportBuilder(result,
-                      settings).build_html_report(fname, **summary_info)
+        report_builder.build_html_report(fname, **summary_info)
         if notice:
             print('html report file: {}'.format(fname))
         return fname
 
     def __build_jenkins_junit_xml_report(self,
-                                         result,
+                                         report_builder,
                                          start_time,
                                          finish_time,
                                          disable_if_no_file_name=False):
@@ -259,8 +362,7 @@ class SevenTestProgram(unittest.TestProgram):
         summary_info[
             'task_number'] = self.task if self.task else start_time.strftime(
                 "%Y%m%d%H%M%S%f")
-        ReportBuilder(result, settings).build_jenkins_junit_xml_report(
-            fname, **summary_info)
+        report_builder.build_jenkins_junit_xml_report(fname, **summary_info)
         if notice:
             print('jenkins junit xml report file: {}'.format(fname))
         return fname
@@ -291,6 +393,22 @@ class SevenTestProgram(unittest.TestProgram):
         else:
             # it is assumed to be a TestRunner instance
             testRunner = self.testRunner
+        workers = getattr(self, 'workers', 1)
+        if workers and workers > 1 and isinstance(testRunner, SevenTestRunner):
+            testRunner.workers = workers
+        if getattr(self, 'profile', False) and isinstance(testRunner, SevenTestRunner):
+            mode = getattr(self, 'profile_mode', None) or TestProfiler.CPU
+            testRunner.profiler = TestProfiler(mode, getattr(self, 'profile_dir', None),
+                                               top=getattr(settings, 'PROFILE_TOP_N', TestProfiler.DEFAULT_TOP))
+        longest_first = getattr(self, 'longest_first', False)
+        # --longest-first 需要耗时历史，未配置 DURATION_HISTORY 时在本次执行中启用
+        duration_history = DurationHistory.from_settings(settings, self.__report_dir(), enabled=True if longest_first else None)
+        if longest_first and isinstance(testRunner, SevenTestRunner):
+            if duration_history is None:
+                warnings.warn("--longest-first is ignored: no duration history store, set DURATION_HISTORY_FILE "
+                              "or TEST_REPORT_DIR, or pass -html", UserWarning)
+            else:
+                testRunner.durations = duration_history.medians()
         start_time = datetime.datetime.now()
         try:
             self.result = testRunner.run(self.test)
@@ -299,9 +417,15 @@ class SevenTestProgram(unittest.TestProgram):
             raise
         finally:
             finish_time = datetime.datetime.now()
-            self.__build_html_report(self.result, start_time, finish_time)
-            self.__build_jenkins_junit_xml_report(self.result, start_time,
+            # 所有格式的报告共用同一个ReportBuilder，测试结果只格式化一次
+            report_builder = ReportBuilder(self.result, settings, duration_history=duration_history)
+            self.__build_html_report(report_builder, start_time, finish_time)
+            self.__build_jenkins_junit_xml_report(report_builder, start_time,
                                                   finish_time)
+            report_builder.record_durations()
+            profiler = getattr(self.result, 'profiler', None)
+            if profiler is not None:
+                print('profile results dir: {}'.format(profiler.output_dir))
         if self.exit:
             sys.exit(not self.result.wasSuccessful())
 
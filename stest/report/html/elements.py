@@ -180,16 +180,39 @@ class HtmlElement(object):
         el_html = "<{tag} {attrs} />".format(tag=self._tag, attrs=attrs)
         return el_html
 
-    def to_html(self):
+    def _iter_start_tag(self):
+        """逐段返回元素的开始标签和文本"""
+
+        attrs = self._attributes_to_text()
+        yield "<{tag} {attrs}>".format(tag=self._tag, attrs=attrs)
+        yield str(self._text)
+
+    def _iter_end_tag(self):
+
+        yield "</{tag}>".format(tag=self._tag)
+
+    def _iter_child_elements_html(self):
 
-        preceding_siblings = self._element_to_html_text_list(self._preceding_sibling_elements)
-        following_siblings = self._element_to_html_text_list(self._following_sibling_elements)
+        for el in self._child_elements:
+            yield from el.iter_html()
 
+    def iter_html(self):
+        """逐段返回元素（包括前后兄弟元素）的html文本，用于边渲染边写入文件，拼接后与to_html()的结果相同"""
+
+        for el in self._preceding_sibling_elements:
+            yield from el.iter_html()
         if not self.is_empty_element:
-            itself = self._build_normal_element()
+            yield from self._iter_start_tag()
+            yield from self._iter_child_elements_html()
+            yield from self._iter_end_tag()
         else:
-            itself = self._build_empty_element()
-        return "".join(preceding_siblings) + itself + "".join(following_siblings)
+            yield self._build_empty_element()
+        for el in self._following_sibling_elements:
+            yield from el.iter_html()
+
+    def to_html(self):
+
+        return "".join(self.iter_html())
 
 
 class HtmlNormalElement(HtmlElement):
@@ -393,11 +416,11 @@ class Table(HtmlNormalElement):
 
         pass
 
-    def to_html(self):
+    def iter_html(self):
 
         self._build_header()
         self._build_body()
-        return HtmlNormalElement.to_html(self)
+        return HtmlNormalElement.iter_html(self)
 
 
 class Thead(HtmlNormalElement):
@@ -7,7 +7,6 @@ Created on 2019年12月5日
 
 import os
 import sys
-import copy
 
 from .html import elements
 from .widgets import tables
@@ -26,20 +25,28 @@ class HtmlReportTemplate(object):
     JS_FILE_NAME = "main.js"
     JQUERY_FILE_NAME = "jquery-1.11.0.min.js"
 
-    def __init__(self, testpoints, settings=None, title="", task_number="", start_time="", finish_time="", executor="", project_name="", task_description=""):
+    def __init__(self, testpoints, settings=None, title="", task_number="", start_time="", finish_time="", executor="", project_name="", task_description="", assets_url="", profile_summary=None, duration_summary=None):
+        """
+        Args:
+            assets_url: 报告资源目录相对报告文件的路径，报告中以独立文件形式保存的截图从该目录引用
+            profile_summary: 性能分析热点汇总（see :py:meth:`TestProfiler.summary`），省略则报告中不显示
+            duration_summary: 最慢用例汇总（see :py:meth:`DurationHistory.slowest_summary`），省略则报告中不显示
+        """
 
         self.html = elements.HTML()
         self.title = title
         self.summary_table = tables.SummaryTable(
             title, task_number, start_time, finish_time, executor, project_name, task_description, self.pie_chart_info(testpoints))
-        self.report_table = tables.ReportTable(settings=settings)
+        self.report_table = tables.ReportTable(settings=settings, assets_url=assets_url)
         self.testpoints = testpoints
+        self.profile_table = tables.ProfileTable(**profile_summary) if profile_summary else None
+        self.slowest_table = tables.SlowestTestsTable(**duration_summary) if duration_summary else None
         self.layer = elements.Div().add_css_class("layer")
         self.html.body.append_child(self.layer)
 
     def pie_chart_info(self, testpoints):
 
-        points = copy.deepcopy(testpoints)
+        points = testpoints
         fail_count = 0
         block_count = 0
         error_count = 0
@@ -102,7 +109,18 @@ class HtmlReportTemplate(object):
         self.report_table.set_testpoints(*tuple(testpoints))
         self.layer.append_child(self.report_table)
 
-    def to_html(self):
+    def _fill_profile_table(self):
+
+        if self.profile_table is not None:
+            self.layer.append_child(self.profile_table)
+
+    def _fill_slowest_table(self):
+
+        if self.slowest_table is not None:
+            self.layer.append_child(self.slowest_table)
+
+    def iter_html(self):
+        """逐段返回报告的html文本，报告表格按测试点逐个渲染，see :py:meth:`ReportTable.iter_html`"""
 
         self._write_metas()
         self.set_report_title()
@@ -111,9 +129,16 @@ class HtmlReportTemplate(object):
         self._write_inline_script()
         self._fill_summary_table()
         self._fill_report_table()
-        return self.html.to_html()
+        self._fill_slowest_table()
+        self._fill_profile_table()
+        return self.html.iter_html()
+
+    def to_html(self):
+
+        return "".join(self.iter_html())
 
     def save_as_file(self, full_file_path):
+        """边渲染边写入报告文件，内存中不会保留完整的报告html文本"""
 
         with open(full_file_path, "w", encoding="utf-8") as f:
-            f.write(self.to_html())
+            f.writelines(self.iter_html())
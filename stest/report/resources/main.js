@@ -426,7 +426,8 @@ function toggleTestStepsDetails(teststep_details_row_id) {
 function show_image_on_new_window(el_img) {
 	var w = window.open();
 	var img = w.document.createElement('img');
-	img.src = el_img.src;
+	// 缩略图点击后加载原图
+	img.src = el_img.getAttribute('data-full-src') || el_img.src;
 	w.document.body.innerHTML = img.outerHTML;
 	w.document.body.ondblclick = function () {
 		w.close()
@@ -459,6 +460,12 @@ $(document).ready(function () {
 	fs_extra_info.init(function () {
 		return ($(this).children(fs_args.itemSelector).children(fs_args.titleSelector).children('.seven-testcase-extra-info').length > 0);
 	});
+	fs_phase_timings = new seven.fieldset({
+		icon: "seven-icon-tips"
+	});
+	fs_phase_timings.init(function () {
+		return ($(this).children(fs_args.itemSelector).children(fs_args.titleSelector).children('.seven-testcase-phase-timings').length > 0);
+	});
 	fs_screenshot = new seven.fieldset({
 		icon: "seven-icon-step"
 	});
@@ -9,7 +9,9 @@ import html
 import json
 import warnings
 import traceback
+import urllib.parse
 from stest.core.errors import StestWarning
+from stest.core.phase_timing import TestPhase
 from ..html import elements
 from .piechart import PieChart
 
@@ -216,13 +218,15 @@ class ReportTable(elements.Table):
     TESTSTEP_TABLE_CONTAINER_CSS_CLASS = "seven-table-container"
 
     SCREENSHOT_OF_TEST_FAILURE = "screenshot-of-test-failure"
+    SCREENSHOT_THUMBNAIL = "screenshot-thumbnail"
     TESTCASE_SHOW_INFO_LAYER = 'testcase-show-info-layer'
 
-    def __init__(self, testpoints=[], settings=None):
+    def __init__(self, testpoints=[], settings=None, assets_url=""):
         super().__init__()
         self._header_titles = []
         self._testpoints = testpoints
         self.settings = settings
+        self.assets_url = assets_url
         self._header_titles.extend(self.FIXED_HEADER_TITLES)
         self.append_child(elements.Thead(), elements.Tbody())
         self.add_css_class(*self.DEFAULT_CSS_CLASSES)
@@ -389,6 +393,20 @@ class ReportTable(elements.Table):
             el_content.append_child(el_dl)
         return el_fs
 
+    def __build_phase_timings_area(self, phase_timings, label="阶段耗时"):
+
+        el_fs, el_item, el_title, el_content = self.__build_fieldset()
+        el_title_name = elements.Span(html.escape(label, False))
+        el_title.append_child(el_title_name)
+        el_item.add_css_class("seven-fieldset-item-hidden")
+        el_title_name.add_css_class("seven-testcase-phase-timings")
+
+        for phase, seconds in phase_timings.items():
+            el_dl = elements.Fieldset(html.escape(TestPhase.label(phase))).add_css_class("fieldset-normal")
+            el_dl.append_child(elements.Pre('{:f} 秒'.format(seconds)).add_css_class("fieldset-normal-content"))
+            el_content.append_child(el_dl)
+        return el_fs
+
     def __build_fieldset(self):
 
         el_fs = elements.Div()
@@ -447,14 +465,46 @@ class ReportTable(elements.Table):
         attach_screenshot_to_report = screenshot_info.get('attach_screenshot_to_report', False)
         if screenshot and attach_screenshot_to_report:
             if screenshot_info.get("result", False):
-                src = "data:image/png;base64,{}".format(screenshot_info.get("base64data", ""))
-                showview = elements.Img().set_attr("onclick", 'show_image_on_new_window(this)').set_attr("src", src)
+                showview = self.__build_screenshot_img(screenshot_info)
                 showview.add_css_class(self.SCREENSHOT_OF_TEST_FAILURE)
             else:
                 showview = elements.Pre(html.escape(screenshot_info.get("message", ""), False))
             el_content.append_child(showview)
         return el_fs
 
+    def __asset_src(self, asset):
+        """返回报告资源目录中截图文件的相对路径"""
+
+        if self.assets_url:
+            return html.escape(urllib.parse.quote("/".join([self.assets_url.rstrip("/"), asset])))
+        return html.escape(urllib.parse.quote(asset))
+
+    def __image_src(self, base64data="", asset="", filepath="", mime="image/png"):
+
+        if base64data:
+            return "data:{};base64,{}".format(mime, base64data)
+        if asset:
+            return self.__asset_src(asset)
+        return html.escape(filepath)
+
+    def __build_screenshot_img(self, screenshot_info):
+        """创建截图的img元素，有缩略图则显示缩略图，点击后在新窗口中加载原图"""
+
+        mime = screenshot_info.get("mime", "image/png")
+        src = self.__image_src(screenshot_info.get("base64data", ""), screenshot_info.get(
+            "asset", ""), screenshot_info.get("filepath", ""), mime)
+        thumbnail_src = self.__image_src(screenshot_info.get("thumbnail_base64data", ""),
+                                         screenshot_info.get("thumbnail_asset", ""), mime=mime)
+        showview = elements.Img().set_attr("onclick", 'show_image_on_new_window(this)')
+        if thumbnail_src:
+            showview.set_attr("src", thumbnail_src).set_attr("data-full-src", src)
+            showview.add_css_class(self.SCREENSHOT_THUMBNAIL)
+        else:
+            showview.set_attr("src", src)
+        if not screenshot_info.get("base64data", ""):
+            showview.set_attr("loading", "lazy")
+        return showview
+
     def __build_user_screenshot_area(self, user_screenshots, label="用户截图"):
 
         el_fs, el_item, el_title, el_content = self.__build_fieldset()
@@ -465,15 +515,9 @@ class ReportTable(elements.Table):
         el_title_name.add_css_class("seven-testcase-screenshots")
 
         for count, user_screenshot in enumerate(user_screenshots):
-            base64data = user_screenshot["base64data"]
-            filepath = user_screenshot["filepath"]
             name = user_screenshot["name"]
-            if base64data:
-                src = "data:image/png;base64,{}".format(base64data)
-            else:
-                src = html.escape(filepath)
             img_area = elements.Div()
-            showview = elements.Img().set_attr("onclick", 'show_image_on_new_window(this)').set_attr("src", src)
+            showview = self.__build_screenshot_img(user_screenshot)
             img_area.append_child(elements.P().append_child(
                 elements.Span(f"{count+1}")).append_child(elements.Span(name)))
             img_area.append_child(showview)
@@ -556,6 +600,8 @@ class ReportTable(elements.Table):
                 name=testcase["name"], method_name=testcase["method_name"]))
             show_div.append_child(self.__build_message_area(tc_message))
         show_div.append_child(self.__build_extra_info_area(testcase["extra_info"], label="基本信息"))
+        if testcase.get("phase_timings"):
+            show_div.append_child(self.__build_phase_timings_area(testcase["phase_timings"], label="阶段耗时"))
         if attach_screenshot_to_report:
             show_div.append_child(self.__build_screenshot_area(screenshot_info, label="失败自动截图"))
         if user_screenshots:
@@ -601,38 +647,115 @@ class ReportTable(elements.Table):
 
         rows = []
         for index, tp in enumerate(self._testpoints):
-            tp_html_id = "%(prefix)s%(sn)s" % dict(prefix=self.TESTPOINT_ID_PREFIX, sn=(index + 1))
-            row = elements.TR().set_attr("id", tp_html_id).add_css_class(self.TESTPOINT_ROW_CSS_CLASS)
-            row.set_attr("onclick", "toggleTestCaseOfTestPoint('%s','%s','%s',%s)" %
-                         (tp_html_id, self.TESTCASE_ID_PREFIX, self.ID_SEP, len(tp["testcases"])))
-            point_name = tp["name"]
-            cls_name = point_name[0]
-            chinese_name = point_name[1]
-            short_name = chinese_name if chinese_name else cls_name.split(".")[-1]
-            nc1 = elements.Span(str(index + 1)).add_css_class("tp-sn")
-            nc2 = elements.Span(html.escape(short_name, False)).add_css_class("tp-name")
-            name_cell = elements.TD().add_css_class(self.TESTPOINT_NAME_CSS_CLASS)
-            name_cell.append_child(nc1, nc2)
-            name_cell.set_attr("title", html.escape(" ".join(point_name)))
-            row.append_child(name_cell)
-            row.append_child(elements.TD(tp["count"]).add_css_class(self.TESTPOINT_COUNT_CSS_CLASS))
-            row.append_child(elements.TD(tp["pass_count"]).add_css_class(
-                self.TESTPOINT_PASS_CSS_CLASS))
-            row.append_child(elements.TD(tp["fail_count"]).add_css_class(
-                self.TESTPOINT_FAIL_CSS_CLASS))
-            row.append_child(elements.TD(tp["block_count"]).add_css_class(
-                self.TESTPOINT_BLOCK_CSS_CLASS))
-            row.append_child(elements.TD(tp["error_count"]).add_css_class(
-                self.TESTPOINT_ERROR_CSS_CLASS))
-            row.append_child(elements.TD(tp["skip_count"]).add_css_class(
-                self.TESTPOINT_SKIP_CSS_CLASS))
-            row.append_child(elements.TD(tp["xfail_count"]).add_css_class(
-                self.TESTPOINT_XFAIL_CSS_CLASS))
-            row.append_child(elements.TD(tp["xpass_count"]).add_css_class(
-                self.TESTPOINT_XPASS_CSS_CLASS))
-            row.after(*tuple(self._build_testcases_rows(tp_html_id, tp["testcases"])))
-            rows.append(row)
+            rows.append(self.build_testpoint_row(index, tp))
         return rows
 
+    def build_testpoint_row(self, index, tp):
+        """构建测试点行，测试点下的用例行及其控制台区域行作为该行的后续兄弟元素
+
+        Args:
+            index: 测试点索引(从0开始)
+            tp: 测试点数据
+        """
+
+        tp_html_id = "%(prefix)s%(sn)s" % dict(prefix=self.TESTPOINT_ID_PREFIX, sn=(index + 1))
+        row = elements.TR().set_attr("id", tp_html_id).add_css_class(self.TESTPOINT_ROW_CSS_CLASS)
+        row.set_attr("onclick", "toggleTestCaseOfTestPoint('%s','%s','%s',%s)" %
+                     (tp_html_id, self.TESTCASE_ID_PREFIX, self.ID_SEP, len(tp["testcases"])))
+        point_name = tp["name"]
+        cls_name = point_name[0]
+        chinese_name = point_name[1]
+        short_name = chinese_name if chinese_name else cls_name.split(".")[-1]
+        nc1 = elements.Span(str(index + 1)).add_css_class("tp-sn")
+        nc2 = elements.Span(html.escape(short_name, False)).add_css_class("tp-name")
+        name_cell = elements.TD().add_css_class(self.TESTPOINT_NAME_CSS_CLASS)
+        name_cell.append_child(nc1, nc2)
+        name_cell.set_attr("title", html.escape(" ".join(point_name)))
+        row.append_child(name_cell)
+        row.append_child(elements.TD(tp["count"]).add_css_class(self.TESTPOINT_COUNT_CSS_CLASS))
+        row.append_child(elements.TD(tp["pass_count"]).add_css_class(
+            self.TESTPOINT_PASS_CSS_CLASS))
+        row.append_child(elements.TD(tp["fail_count"]).add_css_class(
+            self.TESTPOINT_FAIL_CSS_CLASS))
+        row.append_child(elements.TD(tp["block_count"]).add_css_class(
+            self.TESTPOINT_BLOCK_CSS_CLASS))
+        row.append_child(elements.TD(tp["error_count"]).add_css_class(
+            self.TESTPOINT_ERROR_CSS_CLASS))
+        row.append_child(elements.TD(tp["skip_count"]).add_css_class(
+            self.TESTPOINT_SKIP_CSS_CLASS))
+        row.append_child(elements.TD(tp["xfail_count"]).add_css_class(
+            self.TESTPOINT_XFAIL_CSS_CLASS))
+        row.append_child(elements.TD(tp["xpass_count"]).add_css_class(
+            self.TESTPOINT_XPASS_CSS_CLASS))
+        row.after(*tuple(self._build_testcases_rows(tp_html_id, tp["testcases"])))
+        return row
+
     def _build_body(self):
         self.tbody.append_child(*self.build_testpoints_rows())
+
+    def iter_html(self):
+        """逐个测试点渲染并返回html文本，每个测试点的元素渲染后即被丢弃，不会在内存中构建整个报告表格"""
+
+        self._build_header()
+        for el in self._preceding_sibling_elements:
+            yield from el.iter_html()
+        yield from self._iter_start_tag()
+        tbody = self.tbody
+        for child in self.child_elements:
+            if child is not tbody:
+                yield from child.iter_html()
+                continue
+            for el in tbody._preceding_sibling_elements:
+                yield from el.iter_html()
+            yield from tbody._iter_start_tag()
+            yield from tbody._iter_child_elements_html()
+            for index, tp in enumerate(self._testpoints):
+                yield from self.build_testpoint_row(index, tp).iter_html()
+            yield from tbody._iter_end_tag()
+            for el in tbody._following_sibling_elements:
+                yield from el.iter_html()
+        yield from self._iter_end_tag()
+        for el in self._following_sibling_elements:
+            yield from el.iter_html()
+
+
+class ProfileTable(elements.Table):
+    """性能分析热点汇总表格"""
+
+    DEFAULT_CSS_CLASSES = ["seven-table", "profile"]
+    TITLE_ROW_CSS_CLASS = "profile-title"
+    LOCATION_COL_CSS_CLASS = "profile-location"
+
+    def __init__(self, title="", columns=(), rows=()):
+        super().__init__()
+        self.title = title
+        self.columns = list(columns)
+        self.data_rows = list(rows)
+        self.append_child(elements.Thead(), elements.Tbody())
+        self.add_css_class(*self.DEFAULT_CSS_CLASSES)
+
+    def _build_header(self):
+
+        title_row = elements.TR().add_css_class(self.TITLE_ROW_CSS_CLASS)
+        title_row.append_child(elements.TD(html.escape(self.title, False)).set_attr("colspan", len(self.columns)))
+        columns_row = elements.TR()
+        for column in self.columns:
+            columns_row.append_child(elements.TD(html.escape(column, False)))
+        self.thead.append_child(title_row).append_child(columns_row)
+
+    def _build_body(self):
+
+        for values in self.data_rows:
+            row = elements.TR()
+            for index, value in enumerate(values):
+                cell = elements.TD(html.escape(str(value), False))
+                if index == 0:
+                    cell.add_css_class(self.LOCATION_COL_CSS_CLASS)
+                row.append_child(cell)
+            self.tbody.append_child(row)
+
+
+class SlowestTestsTable(ProfileTable):
+    """最慢用例汇总表格，与性能分析热点汇总表格使用相同的样式"""
+
+    DEFAULT_CSS_CLASSES = ["seven-table", "profile", "slowest"]
@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+import typing
+import base64
+import asyncio
+from stest import hook
+from ..conf import image_show
+from ..utils import attrs_manager
+from ..dm.playwright_driver import SupportBrowserType
+from ..dm.async_playwright_driver import AsyncPlaywrightDriver
+from .abstract_playwright_page import AbstractPlaywrightPage
+
+from playwright.async_api import Page
+from playwright.async_api import Locator
+
+
+AsyncPageClass = typing.TypeVar("AsyncPageClass", bound="AbstractAsyncPlaywrightPage")
+
+
+@hook.wrapper(hook.RunStage.stopTestRun, priority=71, runpolicy=hook.RunPolicy.AFTER)
+def stopTestRun(gsettings, result):
+    # 停止各个事件循环中的异步playwright
+    AsyncPlaywrightDriver.stop_playwrights(gsettings)
+
+
+class AbstractAsyncPlaywrightPage(attrs_manager.AttributeManager):
+    """ 异步抽象页
+
+    :py:class:`AbstractPlaywrightPage` 的异步版本，基于 :py:class:`AsyncPlaywrightDriver`，页面操作方法都是协程，需要在异步用例（async def）中await调用。
+    每个页面实例绑定一个playwright页面（Page），同一驱动可以创建多个页面实例（see :py:meth:`new_pages`），在一个事件循环中并发操作。
+
+    **Usage**
+
+    ```python
+    import asyncio
+    import stest
+
+    class SmokeTest(stest.AbstractTestCase):
+
+        async def setUp(self):
+            self.home = await HomePage().chromium()
+
+        @stest.Test(name="50个页面冒烟")
+        async def smoke(self):
+            pages = await self.home.new_pages(len(URLS))
+            await asyncio.gather(*(page.goto(url) for page, url in zip(pages, URLS)))
+            titles = await asyncio.gather(*(page.title() for page in pages))
+
+        async def tearDown(self):
+            await self.home.quit()
+    ```
+    """
+
+    def __init__(self, driver: typing.Optional[AsyncPlaywrightDriver] = None, pwpage: typing.Optional[Page] = None):
+        """
+        Parameters
+        ----------
+        driver : 异步驱动实例，省略则在打开浏览器（see :py:meth:`open_browser`）时创建
+        pwpage : 页面实例绑定的playwright页面，省略则使用驱动的当前页面
+        """
+
+        self.driver = driver
+        self._pwpage = pwpage
+        self._build_elements()
+        self._build_actions()
+        self.init()
+
+    def init(self):
+
+        pass
+
+    def _build_elements(self):
+
+        self.elements = self.Elements(self)
+
+    def _build_actions(self):
+
+        self.actions = self.Actions(self)
+
+    @property
+    def pwpage(self) -> Page:
+        """playwright page instance of this page object"""
+
+        return self._pwpage if self._pwpage is not None else self.driver.page
+
+    async def open_browser(self, browser_type=SupportBrowserType.CHROMIUM, browser_launch_args={}, browser_context_args={}):
+        """创建异步驱动（已有则使用已有的驱动）并打开浏览器，页面实例绑定打开的页面
+
+        Args
+        -------
+        browser_type : str  default value is `chromium`
+            chromium | firefox | webkit
+        browser_launch_args : dict
+            refer to the `BrowserType.launch`
+        browser_context_args : dict
+            refer to the `Browser.new_context`
+        """
+
+        if self.driver is None:
+            self.driver = AsyncPlaywrightDriver()
+        await self.driver.open_browser(browser_type=browser_type, browser_launch_args=browser_launch_args,
+                                       browser_context_args=browser_context_args)
+        self._pwpage = self.driver.page
+        return self
+
+    async def chromium(self, browser_launch_args={}, browser_context_args={}):
+
+        return await self.open_browser(SupportBrowserType.CHROMIUM, browser_launch_args, browser_context_args)
+
+    async def chrome(self, browser_launch_args={}, browser_context_args={}):
+
+        browser_launch_args["channel"] = "chrome"
+        return await self.open_browser(SupportBrowserType.CHROMIUM, browser_launch_args, browser_context_args)
+
+    async def firfox(self, browser_launch_args={}, browser_context_args={}):
+
+        return await self.open_browser(SupportBrowserType.FIREFOX, browser_launch_args, browser_context_args)
+
+    async def msedge(self, browser_launch_args={}, browser_context_args={}):
+
+        browser_launch_args["channel"] = "msedge"
+        return await self.open_browser(SupportBrowserType.CHROMIUM, browser_launch_args, browser_context_args)
+
+    async def webkit(self, browser_launch_args={}, browser_context_args={}):
+
+        return await self.open_browser(SupportBrowserType.WEBKIT, browser_launch_args, browser_context_args)
+
+    safari = webkit
+
+    async def new_page(self: AsyncPageClass, page_class=None) -> AsyncPageClass:
+        """在驱动的当前上下文中打开新页面，返回绑定该页面的新页面实例，本页面实例不受影响
+
+        Parameters
+        ----------
+        page_class : 新页面实例的类，省略则与本页面实例的类相同
+        """
+
+        page_class = page_class or self.__class__
+        return page_class(self.driver, await self.driver.new_page())
+
+    async def new_pages(self: AsyncPageClass, count, page_class=None) -> typing.List[AsyncPageClass]:
+        """在驱动的当前上下文中并发打开count个新页面，返回绑定这些页面的新页面实例列表
+
+        Parameters
+        ----------
+        count : 页面个数
+        page_class : 新页面实例的类，省略则与本页面实例的类相同
+        """
+
+        page_class = page_class or self.__class__
+        return [page_class(self.driver, pwpage) for pwpage in await self.driver.new_pages(count)]
+
+    async def open_url(self, url, **kwargs):
+
+        await self.goto(url, **kwargs)
+        return self
+
+    async def goto(self, url: str, **kwargs):
+        """refer to the `Page.goto`"""
+
+        return await self.pwpage.goto(url, **kwargs)
+
+    async def reload(self, **kwargs):
+        """refer to the `Page.reload`"""
+
+        return await self.pwpage.reload(**kwargs)
+
+    async def close(self, **kwargs):
+        """refer to the `Page.close`"""
+
+        await self.pwpage.close(**kwargs)
+
+    async def quit(self):
+        """退出驱动，关闭驱动打开的浏览器及其所有页面"""
+
+        if self.driver is not None:
+            await self.driver.quit()
+
+    async def sleep(self, seconds):
+        """seconds the length of time to sleep in seconds，等待期间不阻塞事件循环中的其它页面"""
+
+        await asyncio.sleep(seconds)
+        return self
+
+    async def title(self):
+        """Returns the title of the page."""
+
+        return await self.pwpage.title()
+
+    async def content(self):
+        """refer to the `Page.content`"""
+
+        return await self.pwpage.content()
+
+    async def execute_script(self, script: str, args: typing.Optional[typing.Any] = None):
+        """refer to the `Page.evaluate`"""
+
+        return await self.pwpage.evaluate(script, args)
+
+    async def screenshot(self, path=None, full_page=None, clip=None, **others):
+        """refer to the `Page.screenshot`, refer to the `AbstractPlaywrightPage.screenshot`"""
+
+        return await self.pwpage.screenshot(path=path, full_page=full_page, clip=clip, **others)
+
+    async def show2html(self, testcase, name="", path=None, **screenshot_kwargs):
+        """截图并显示到html测试报告中，refer to the `AbstractPlaywrightPage.show2html`
+
+        Parameters
+        ----------
+        testcase : 测试用例实例，显示在html测试报告中的哪个测试用例下
+        name : 在html报告中显示的名称
+        path : 截图保存路径
+        screenshot_kwargs : Page.screenshot的其它参数
+        """
+
+        raw_data = await self.pwpage.screenshot(path=path, **screenshot_kwargs)
+        if path:
+            base64data = ""
+        else:
+            base64data = base64.b64encode(raw_data).decode()
+        image_show.show2html(testcase, base64data=base64data, filepath=path, name=name)
+        return self
+
+    def locator(self, selector, **kwargs) -> Locator:
+        """refer to the `Page.locator`"""
+
+        return self.pwpage.locator(selector, **kwargs)
+
+    def get_by_xpath(self, selector: str):
+
+        return self.locator(self.join_xpaths(selector, prefix="xpath="))
+
+    def get_by_id(self, value: str):
+
+        return self.get_by_xpath('//*[@id="{}"]'.format(value))
+
+    def get_by_text(self, text: typing.Union[str, typing.Pattern[str]], *, exact: typing.Optional[bool] = None):
+        """refer to the `Page.get_by_text`"""
+
+        return self.pwpage.get_by_text(text, exact=exact)
+
+    def get_by_title(self, text: typing.Union[str, typing.Pattern[str]], *, exact: typing.Optional[bool] = None):
+        """refer to the `Page.get_by_title`"""
+
+        return self.pwpage.get_by_title(text, exact=exact)
+
+    def get_by_placeholder(self, text: typing.Union[str, typing.Pattern[str]], *, exact: typing.Optional[bool] = None):
+        """refer to the `Page.get_by_placeholder`"""
+
+        return self.pwpage.get_by_placeholder(text, exact=exact)
+
+    def frame_locator(self, selector: str):
+        """refer to the `Page.frame_locator`"""
+
+        return self.pwpage.frame_locator(selector)
+
+    join_xpaths = AbstractPlaywrightPage.__dict__['join_xpaths']
+
+    class Elements(object):
+        def __init__(self, page):
+            self.page = typing.cast(AsyncPageClass, page)
+            self.init()
+
+        def init(self):
+            pass
+
+    class Actions(object):
+        def __init__(self, page):
+
+            self.page = typing.cast(AsyncPageClass, page)
+            self.init()
+
+        def init(self):
+            pass
+
+        async def sleep(self, seconds):
+            """延时"""
+
+            await self.page.sleep(seconds)
+            return self
+
+        async def show2html(self, testcase, name="", path=None, **screenshot_kwargs):
+            """截图并显示到html测试报告中
+
+            refer to the `AbstractAsyncPlaywrightPage.show2html`
+            """
+
+            await self.page.show2html(testcase, name=name, path=path, **screenshot_kwargs)
+            return self
@@ -11,6 +11,7 @@ from ..dm import DRIVER_MANAGER
 from ..dm.driver_manager import DriverManager
 from ..dm.playwright_driver import PlaywrightDriver
 from ..dm.playwright_driver import SupportBrowserType
+from ..dm.playwright_context_pool import PlaywrightContextPool
 
 from playwright.sync_api import Page
 from playwright.sync_api import Locator
@@ -22,6 +23,11 @@ PageClass = typing.TypeVar("PageClass", bound="AbstractPlaywrightPage")
 
 @hook.wrapper(hook.RunStage.stopTestRun, priority=70, runpolicy=hook.RunPolicy.AFTER)
 def stopTestRun(gsettings, result):
+    # 先关闭上下文池中共用的浏览器，再停止playwright
+    context_pool = getattr(gsettings, PlaywrightContextPool.KEY_IN_SETTINGS, None)
+    if isinstance(context_pool, PlaywrightContextPool):
+        context_pool.close()
+        setattr(gsettings, PlaywrightContextPool.KEY_IN_SETTINGS, None)
     auto_stop_playwright = getattr(gsettings, PlaywrightDriver.AUTO_STOP_PLAYWRIGHT, False)
     if auto_stop_playwright:
         pw = getattr(gsettings, PlaywrightDriver.PLAYWRIGHT, None)
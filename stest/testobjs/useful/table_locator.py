@@ -1662,6 +1662,73 @@ class Table(object):
 
         return return_cells
 
+    def extract_rows(self, rows: Optional[Locator] = None, title_as_key: bool = True,
+                     offset: int = 0, limit: Optional[int] = None) -> List[Dict[Union[str, int], Optional[str]]]:
+        """批量提取多行中各单元格的文本（仅返回初始化时定义的列），整个表格或者一页数据只需一次 ``evaluate_all`` 调用。
+
+        与逐行调用 ``cells()`` 的返回结果一致，但 ``cells()`` 每行需要 1 + 列数 次 IPC，
+        遍历 N 行 M 列的表格共 N*(M+1) 次；本方法把各列单元格的相对 XPath 传入浏览器，
+        在页面中对每一行求值并一次性返回所有文本，与 ``detect_header_titles`` 提取表头的方式相同。
+
+        被标记为非数据列（通过 `mark_non_data_columns_*` 方法）的单元格不会返回。
+
+        **Usage**
+
+        ```python
+        table = Table(page, '专资编码', '影城名称', '院线', '影投', auto_set_position=False)
+        # 返回: [{'专资编码': '80002048', '影城名称': '影院名称-80002048', '院线': '中影院线', '影投': '无'}, ...]
+        table.extract_rows()
+
+        # 只提取按条件筛选出的行中的第 21-40 行，以列号作为字典键
+        table.extract_rows(table.row({'院线': '中影院线'}, el_type='row'), title_as_key=False, offset=20, limit=20)
+        ```
+
+        Parameters
+        ----------
+        rows : Locator, optional
+            行元素定位器（一般为 ``row()`` 返回的定位器），为 None 时提取表格所有行（``all_rows``）。
+            若定位到的不是行元素（tr），则以其所在的行提取。
+        title_as_key : bool, default=True
+            若为True，以列标题作为字典键；若为False，以列号（从1开始）作为字典键。
+        offset : int, default=0
+            从第几行（从0开始）开始提取。
+        limit : int, optional
+            最多提取的行数，为 None 时提取到最后一行。
+
+        Returns
+        -------
+        List[Dict[str | int, str | None]]
+            每行一个字典，值为单元格的文本内容（``textContent``），行中不存在的单元格为 None。
+        """
+        columns = [c for c in self.body_columns if c not in self.non_data_columns]
+        for column in columns:
+            if not self.allow_missing_position and column.position is None:
+                raise ValueError(f"列 '{column.title}' 未设置列索引，无法生成精确的单元格定位 XPath")
+
+        keys = [column.title if title_as_key else column.position for column in columns]
+        xpaths = [self.join_xpaths("./", column.xpath) for column in columns]
+        if rows is None:
+            rows = self.all_rows
+
+        # 在浏览器中按各列的相对 XPath 对每一行求值，所有行只需 1 次 IPC
+        values = rows.evaluate_all("""(rows, [rowName, xpaths, offset, limit]) => {
+            const end = limit === null ? rows.length : Math.min(rows.length, offset + limit);
+            const result = [];
+            for (let i = offset; i < end; i++) {
+                let row = rows[i];
+                if (row.tagName.toLowerCase() !== rowName) {
+                    row = row.closest(rowName) || row;
+                }
+                result.push(xpaths.map((xpath) => {
+                    const cell = document.evaluate(
+                        xpath, row, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+                    return cell === null ? null : cell.textContent;
+                }));
+            }
+            return result;
+        }""", [self.row_element_name.lower(), xpaths, max(0, offset), limit])
+        return [dict(zip(keys, row_values)) for row_values in values]
+
     def cell(self, row: Locator, title_or_position: typing.Union[str, int], by: typing.Literal["title", "position"] = "title") -> Locator:
         """获取指定行中的某个单元格。
 
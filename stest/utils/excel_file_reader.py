@@ -45,6 +45,7 @@ class TestCaseBlock(AttributeManager):
 
         self._rows = []  # [(row index in excel file, row), ...]
         self._flag_column_index = flag_column_index
+        self._data_titles = None
 
     @property
     def rows(self):
@@ -63,6 +64,7 @@ class TestCaseBlock(AttributeManager):
 
         for block_row in block_rows:
             self._rows.append(block_row)
+        self._data_titles = None
 
     def get_name_row(self):
 
@@ -118,7 +120,10 @@ class TestCaseBlock(AttributeManager):
         return objs
 
     def get_data_titles(self):
+        """获取数据标题列表 [(单元格列索引, 标题), ...]，只在第一次调用时解析标题行"""
 
+        if self._data_titles is not None:
+            return self._data_titles
         titles = []
 
         for index, cell in enumerate((self.rows[self.TITLE_ROW_INDEX][1])):
@@ -132,16 +137,18 @@ class TestCaseBlock(AttributeManager):
                 self._do_nothing(val)
                 # raise Warning("用例名称单元格类型必须是文本类型, 单元格类型(%s)=%s" % (cell.ctype, val))
                 break
+        self._data_titles = titles
         return titles
 
     def get_testdata(self):
 
         all_row_data = []
+        titles = self.get_data_titles() if len(self.rows) >= self.MIN_NUMBER_OF_ROWS else []
         for row_index, item in enumerate(self.rows):
             index_in_excel_file, row = item
             if row_index + 1 >= self.MIN_NUMBER_OF_ROWS:
                 one_row_data = []
-                for title_cell_index, title in self.get_data_titles():
+                for title_cell_index, title in titles:
                     value_cell = row[title_cell_index]
                     if value_cell.ctype == self.XL_CELL_TEXT:
                         value = value_cell.value
@@ -273,50 +280,52 @@ class TestCaseExcelFileReader(AttributeManager):
 
         return max(self.get_row_indexes())
 
-    def get_testcase_blocks(self):
-        """解析并获取用例文件中的用例块区域"""
+    def is_block_start_row(self, row):
+        """是否是用例块的起始行（分隔标记列的值为用例分割标记）"""
+
+        column_index = self.testcase_block_separators_column_index
+        if len(row) <= column_index:
+            return False
+        first_cell = row[column_index]
+        return first_cell.ctype == self.XL_CELL_TEXT and first_cell.value == self.testcase_block_separators
+
+    def iter_testcase_blocks(self):
+        """逐行扫描工作表（只扫描一遍），每解析完一个用例块就返回该块
 
-        zero = 0
-        block_start_row_index_list = []
-        testcase_block_list = []
+        用例块从用例分割标记行开始，到下一个用例分割标记行之前（或工作表末尾）结束，块内的空行被忽略，第一个用例分割标记行之前的行被忽略
+        """
+
+        testcase_block = None
         for row_index in self.get_row_indexes():
-            if (self.row_len(row_index) == zero):
+            one_row = self._sheet.row(row_index)
+            if not one_row:
                 continue
-            first_cell = self._sheet.cell(row_index, self.testcase_block_separators_column_index)
-            if first_cell.ctype == self.XL_CELL_TEXT and first_cell.value == self.testcase_block_separators:
-                block_start_row_index_list.append(row_index)
-
-        count = len(block_start_row_index_list)
-        for i in range(count):
-            testcase_block = TestCaseBlock(self.testcase_block_separators_column_index)
-            start_row_index = block_start_row_index_list[i]
-
-            next = i + 1  # 下一个元素索引
-            if next >= count:
-                end_row_index = self.get_last_row_index()
-            else:
-                block_other_row_indexs = []
-                for r_index in self.get_row_indexes():
-                    if r_index >= start_row_index and r_index < block_start_row_index_list[next]:
-                        block_other_row_indexs.append(r_index)
-                end_row_index = max(block_other_row_indexs)
-
-            for this_row_index in self.get_row_indexes():
-                if this_row_index >= start_row_index and this_row_index <= end_row_index:
-                    one_row = self._sheet.row(this_row_index)
-                    if not self.is_blank_row(one_row):
-                        testcase_block.add_block_rows((this_row_index, one_row))
-            testcase_block_list.append(testcase_block)
-        return testcase_block_list
+            if self.is_block_start_row(one_row):
+                if testcase_block is not None:
+                    yield testcase_block
+                testcase_block = TestCaseBlock(self.testcase_block_separators_column_index)
+                testcase_block.add_block_rows((row_index, one_row))
+            elif testcase_block is not None and not self.is_blank_row(one_row):
+                testcase_block.add_block_rows((row_index, one_row))
+        if testcase_block is not None:
+            yield testcase_block
 
-    def load_testcase_data(self):
+    def get_testcase_blocks(self):
+        """解析并获取用例文件中的用例块区域"""
+
+        return list(self.iter_testcase_blocks())
+
+    def iter_testcase_data(self):
+        """逐个解析并返回用例数据（TestCaseData），用例名称为空的用例块被忽略"""
 
-        testcases = []
-        for testcase_block in self.get_testcase_blocks():
+        for testcase_block in self.iter_testcase_blocks():
 
             testcase = TestCaseData(testcase_block.testcase_name, testcase_block.testcase_alias)
             testcase.datas = testcase_block.get_testdata()
 
             if testcase.name.strip() != self.EMPTY_STRING:
-                testcases.append(testcase)
-        return testcases
+                yield testcase
+
+    def load_testcase_data(self):
+
+        return list(self.iter_testcase_data())
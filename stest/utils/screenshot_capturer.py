@@ -83,7 +83,50 @@ class ScreenshotCapturer(AttributeManager):
                 return driver.get_screenshot_as_base64()
         except Exception:
             pass
-        img = cls.screenshot_with_pil()
+        return base64.b64encode(cls.screenshot_as_png_with_pil()).decode()
+
+    @classmethod
+    def screenshot_as_png(cls, driver=None):
+        """浏览器截图失败则启用屏幕截图，返回png格式的截图二进制数据
+
+        Args:
+         - driver: 驱动实例，省略则使用PIL截图
+        """
+
+        return cls.encode_png(cls.grab(driver))
+
+    @classmethod
+    def grab(cls, driver=None):
+        """只截图不编码，浏览器截图失败则启用屏幕截图，返回浏览器截图的png二进制数据或屏幕截图的PIL.Image对象，
+        使用 :py:meth:`encode_png` 编码为png二进制数据
+
+        Args:
+         - driver: 驱动实例，省略则使用PIL截图
+        """
+
+        try:
+            if driver:
+                return driver.get_screenshot_as_png()
+        except Exception:
+            pass
+        return cls.screenshot_with_pil()
+
+    @classmethod
+    def encode_png(cls, grabbed):
+        """把 :py:meth:`grab` 的截图编码为png二进制数据"""
+
+        if isinstance(grabbed, bytes):
+            return grabbed
+        return cls._image_to_png(grabbed)
+
+    @classmethod
+    def screenshot_as_png_with_pil(cls):
+
+        return cls._image_to_png(cls.screenshot_with_pil())
+
+    @classmethod
+    def _image_to_png(cls, img):
+
         temp = io.BytesIO()
         try:
             img.save(temp, "png")
@@ -95,7 +138,7 @@ class ScreenshotCapturer(AttributeManager):
             del img
         img_datas = temp.getvalue()
         del temp
-        return base64.b64encode(img_datas).decode()
+        return img_datas
 
     @classmethod
     def screenshot_file_to_base64(cls, file_full_path):
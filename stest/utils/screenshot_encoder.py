@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+
+import io
+import base64
+import warnings
+from ..core.errors import StestWarning
+from .screenshot_capturer import ScreenshotCapturer
+
+
+class ScreenshotEncoder(object):
+    """截图编码器
+
+    按配置把截图编码为指定格式（png/jpeg/webp）并生成缩略图，编码和缩略图依赖Pillow，没有安装Pillow时原样使用png截图且不生成缩略图。
+    """
+
+    # 格式名称 -> (Pillow格式名称, 文件扩展名, mime类型)
+    FORMATS = {
+        'png': ('PNG', '.png', 'image/png'),
+        'jpeg': ('JPEG', '.jpg', 'image/jpeg'),
+        'jpg': ('JPEG', '.jpg', 'image/jpeg'),
+        'webp': ('WEBP', '.webp', 'image/webp'),
+    }
+    DEFAULT_FORMAT = 'png'
+    DEFAULT_QUALITY = 80
+
+    def __init__(self, image_format=None, quality=DEFAULT_QUALITY, thumbnail_size=None):
+        """
+        Args:
+            image_format: 截图格式，png、jpeg或webp，省略则使用原始png截图不重新编码，png格式会启用压缩优化
+            quality: jpeg和webp格式的图片质量（1-100）
+            thumbnail_size: 缩略图最大宽高 (宽, 高)，按比例缩放，省略则不生成缩略图
+        """
+
+        if image_format is not None and image_format.lower() not in self.FORMATS:
+            raise ValueError('unsupported screenshot format: {}, expected one of {}'.format(
+                image_format, ', '.join(self.FORMATS)))
+        self.image_format = image_format.lower() if image_format else None
+        self.quality = quality
+        self.thumbnail_size = tuple(thumbnail_size) if thumbnail_size else None
+
+    @classmethod
+    def from_settings(cls, gsettings):
+        """使用配置中的截图编码设置（SCREENSHOT_FORMAT、SCREENSHOT_QUALITY、SCREENSHOT_THUMBNAIL_SIZE）创建编码器"""
+
+        return cls(getattr(gsettings, "SCREENSHOT_FORMAT", None),
+                   getattr(gsettings, "SCREENSHOT_QUALITY", cls.DEFAULT_QUALITY),
+                   getattr(gsettings, "SCREENSHOT_THUMBNAIL_SIZE", None))
+
+    @property
+    def need_pillow(self):
+        """是否需要Pillow重新编码截图"""
+
+        return self.image_format is not None or self.thumbnail_size is not None
+
+    def _save(self, img, pil_format):
+
+        if pil_format == 'JPEG' and img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        options = dict(optimize=True) if pil_format in ('PNG', 'JPEG') else {}
+        if pil_format in ('JPEG', 'WEBP'):
+            options['quality'] = self.quality
+        temp = io.BytesIO()
+        img.save(temp, pil_format, **options)
+        return temp.getvalue()
+
+    def encode(self, grabbed):
+        """编码截图
+
+        Args:
+            grabbed: :py:meth:`ScreenshotCapturer.grab` 的截图，png二进制数据或PIL.Image对象
+        Returns: 返回 (截图二进制数据, 缩略图二进制数据或None, 文件扩展名, mime类型)
+        """
+
+        pil_format, ext, mime = self.FORMATS[self.image_format or self.DEFAULT_FORMAT]
+        if not self.need_pillow:
+            return (ScreenshotCapturer.encode_png(grabbed), None, ext, mime)
+        try:
+            from PIL import Image
+        except ImportError:
+            warnings.warn('Pillow is not installed, screenshots are kept as original png without thumbnails',
+                          category=StestWarning, stacklevel=2)
+            _, ext, mime = self.FORMATS[self.DEFAULT_FORMAT]
+            return (ScreenshotCapturer.encode_png(grabbed), None, ext, mime)
+
+        img = Image.open(io.BytesIO(grabbed)) if isinstance(grabbed, bytes) else grabbed
+        if self.image_format is None:
+            data = ScreenshotCapturer.encode_png(grabbed)
+        else:
+            data = self._save(img, pil_format)
+        thumbnail = None
+        if self.thumbnail_size is not None:
+            small = img.copy()
+            small.thumbnail(self.thumbnail_size)
+            thumbnail = self._save(small, pil_format)
+        return (data, thumbnail, ext, mime)
+
+    def to_report_info(self, grabbed, store=None):
+        """编码截图并返回报告需要的截图信息字典
+
+        Args:
+            grabbed: :py:meth:`ScreenshotCapturer.grab` 的截图
+            store: 截图资源仓库（ScreenshotAssetStore），提供则截图保存为文件，只返回资源名称，否则返回base64数据
+        Returns: 返回字典，包含 base64data、asset、thumbnail_base64data、thumbnail_asset、mime
+        """
+
+        data, thumbnail, ext, mime = self.encode(grabbed)
+        info = dict(base64data='', asset='', thumbnail_base64data='', thumbnail_asset='', mime=mime)
+        if store is not None:
+            info['asset'] = store.save(data, ext)
+            if thumbnail is not None:
+                info['thumbnail_asset'] = store.save(thumbnail, ext)
+        else:
+            info['base64data'] = base64.b64encode(data).decode()
+            if thumbnail is not None:
+                info['thumbnail_base64data'] = base64.b64encode(thumbnail).decode()
+        return info
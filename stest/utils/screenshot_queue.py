@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+
+import threading
+import concurrent.futures
+
+
+class ScreenshotQueue(object):
+    """后台截图处理队列
+
+    截图本身必须在用例结束时立即完成（之后界面就会被下一个用例改变），而截图的编码、压缩和保存比较耗时，
+    提交到队列后由后台线程处理，不阻塞用例的执行。生成报告前需要调用 :py:meth:`drain` 等待所有截图处理完成。
+    """
+
+    THREAD_NAME_PREFIX = "stest-screenshot"
+
+    def __init__(self, workers=1):
+        """
+        Args:
+            workers: 后台处理线程数
+        """
+
+        self.workers = workers
+        self._executor = None
+        self._futures = []
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs):
+        """提交截图处理任务，任务在后台线程中执行，func需要自行处理异常"""
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix=self.THREAD_NAME_PREFIX)
+            future = self._executor.submit(func, *args, **kwargs)
+            self._futures.append(future)
+        return future
+
+    @property
+    def pending(self):
+        """未完成的任务个数"""
+
+        with self._lock:
+            return sum(1 for future in self._futures if not future.done())
+
+    def drain(self):
+        """等待已提交的任务全部完成并关闭后台线程，之后再提交任务会重新创建后台线程"""
+
+        with self._lock:
+            executor, futures = self._executor, self._futures
+            self._executor, self._futures = None, []
+        if executor is not None:
+            concurrent.futures.wait(futures)
+            executor.shutdown(wait=True)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+'''
+@Author: 思文伟
+@Date: 2026/10/18
+'''
+
+import os
+import base64
+import shutil
+import hashlib
+import tempfile
+
+
+class ScreenshotAssetStore(object):
+    """截图资源仓库
+
+    截图以内容的sha1摘要命名保存为文件，内容相同的截图只保存一份，内存中只保留资源名称（文件名）。
+    生成html报告时通过 :py:meth:`export_to` 把报告用到的截图复制到报告资源目录，报告以相对路径引用这些文件。
+    """
+
+    DEFAULT_DIR_NAME = "stest_screenshots"
+    DEFAULT_EXT = ".png"
+
+    def __init__(self, root_dir=None):
+        """
+        Args:
+            root_dir: 截图文件存放目录，省略则使用系统临时目录下的 stest_screenshots 目录
+        """
+
+        if not root_dir:
+            root_dir = os.path.join(tempfile.gettempdir(), self.DEFAULT_DIR_NAME)
+        self.root_dir = os.path.abspath(root_dir)
+
+    @classmethod
+    def from_settings(cls, gsettings):
+        """使用配置中的截图存放目录（SCREENSHOT_SAVE_DIR）创建仓库"""
+
+        return cls(getattr(gsettings, "SCREENSHOT_SAVE_DIR", None))
+
+    @staticmethod
+    def is_enabled(gsettings):
+        """配置是否启用了截图以独立文件附加到报告（SCREENSHOT_REPORT_ASSETS）"""
+
+        return bool(getattr(gsettings, "SCREENSHOT_REPORT_ASSETS", False))
+
+    def path_of(self, name):
+        """返回资源的完整文件路径"""
+
+        return os.path.join(self.root_dir, name)
+
+    def save(self, data, ext=DEFAULT_EXT):
+        """保存截图二进制数据，返回资源名称，内容已存在则直接返回
+
+        Args:
+            data: 截图文件的二进制数据
+            ext: 文件扩展名
+        """
+
+        name = hashlib.sha1(data).hexdigest() + ext
+        full_path = self.path_of(name)
+        if not os.path.exists(full_path):
+            os.makedirs(self.root_dir, exist_ok=True)
+            # 先写临时文件再改名，避免并行执行时其它进程读到写了一半的文件
+            fd, temp_path = tempfile.mkstemp(suffix=ext, dir=self.root_dir)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, full_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+        return name
+
+    def save_base64(self, base64data, ext=DEFAULT_EXT):
+        """保存base64编码的截图数据，返回资源名称"""
+
+        return self.save(base64.b64decode(base64data), ext)
+
+    def export_to(self, target_dir, names):
+        """把资源复制到目标目录（报告资源目录），目标目录中已存在的资源不会重复复制，返回复制的文件个数
+
+        Args:
+            target_dir: 目标目录
+            names: 资源名称列表
+        """
+
+        count = 0
+        for name in set(names):
+            target = os.path.join(target_dir, name)
+            if os.path.exists(target):
+                continue
+            source = self.path_of(name)
+            if not os.path.exists(source):
+                continue
+            os.makedirs(target_dir, exist_ok=True)
+            shutil.copyfile(source, target)
+            count += 1
+        return count